@@ -0,0 +1,174 @@
+# adb.py - Persistent ADB shell session for SMS/calls
+
+import os
+import queue
+import shlex
+import subprocess
+import threading
+import time
+
+
+class AdbError(Exception):
+    """Raised when the adb shell session fails or times out"""
+
+
+class AdbSession:
+    """One long-lived `adb shell` process that runs commands on demand.
+
+    Every command is followed by an `echo` of a unique marker, so we know
+    exactly when the device finished it instead of sleeping a fixed time.
+    Set ADB_PATH (or pass `argv`) to point the session at another binary,
+    e.g. `["sh"]` to exercise it locally without a phone.
+    """
+
+    MARKER = "__SYRA_DONE__"
+    FOCUS_COMMAND = "dumpsys window | grep -E 'mCurrentFocus|mFocusedApp'"
+
+    def __init__(self, adb_path=None, serial=None, argv=None):
+        if argv is None:
+            argv = [adb_path or os.getenv("ADB_PATH", "adb")]
+            if serial:
+                argv += ["-s", serial]
+            argv.append("shell")
+        self.argv = argv
+        self.proc = None
+        self.lines = None
+        self.lock = threading.Lock()
+        self.counter = 0
+
+    # ---------- process management ----------
+    def _reader(self, stream, lines):
+        for line in iter(stream.readline, ""):
+            lines.put(line.rstrip("\r\n"))
+        lines.put(None)  # EOF
+
+    def open(self):
+        """Start the shell process if it isn't running"""
+        if self.proc and self.proc.poll() is None:
+            return
+        self.proc = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        self.lines = queue.Queue()
+        threading.Thread(target=self._reader, args=(self.proc.stdout, self.lines), daemon=True).start()
+
+    def close(self):
+        """Terminate the shell process"""
+        if self.proc and self.proc.poll() is None:
+            try:
+                self.proc.stdin.write("exit\n")
+                self.proc.stdin.flush()
+                self.proc.wait(timeout=2)
+            except Exception:
+                self.proc.kill()
+        self.proc = None
+
+    def kill(self):
+        """Stop the shell right away (it is stuck in a command, so `exit` would wait for it)"""
+        if self.proc and self.proc.poll() is None:
+            self.proc.kill()
+        self.proc = None
+
+    # ---------- commands ----------
+    def run(self, command, timeout=10):
+        """Run a shell command on the device and return its output"""
+        with self.lock:
+            for attempt in range(2):
+                self.open()
+                self.counter += 1
+                marker = f"{self.MARKER}{self.counter}"
+                try:
+                    self.proc.stdin.write(f"{command}; echo {marker}:$?\n")
+                    self.proc.stdin.flush()
+                except (BrokenPipeError, OSError):
+                    self.close()
+                    continue  # reconnect once
+                return self._collect(marker, timeout)
+            raise AdbError("adb shell is not available")
+
+    def _collect(self, marker, timeout):
+        deadline = time.monotonic() + timeout
+        output = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.kill()
+                raise AdbError(f"adb command timed out after {timeout}s")
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                self.close()
+                raise AdbError("adb shell exited: " + " ".join(output))
+            if line.startswith(marker + ":"):
+                return "\n".join(output)
+            output.append(line)
+
+    def batch(self, commands, timeout=15):
+        """Run several commands as one script in a single round-trip"""
+        return self.run("; ".join(commands), timeout=timeout)
+
+    def poll(self, condition, command, timeout=5, interval=0.1):
+        """Run `command` until condition(output) holds; False once `timeout` is used up
+
+        Each run only gets the time that is left, so a slow device cannot
+        stretch the wait past `timeout`.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                output = self.run(command, timeout=remaining)
+            except AdbError:
+                if time.monotonic() >= deadline:
+                    return False
+                raise
+            if condition(output):
+                return True
+            time.sleep(max(0.0, min(interval, deadline - time.monotonic())))
+
+    def focus(self, timeout=5):
+        """The focused window/app lines from dumpsys"""
+        return self.run(self.FOCUS_COMMAND, timeout=timeout)
+
+    def wait_for(self, text, command=FOCUS_COMMAND, timeout=5, interval=0.1):
+        """Poll `command` until its output contains `text`"""
+        return self.poll(lambda output: text in output, command, timeout, interval)
+
+    def wait_for_change(self, before, command=FOCUS_COMMAND, timeout=5, interval=0.1):
+        """Poll `command` until its output differs from `before` (e.g. a new screen opened)"""
+        return self.poll(lambda output: output != before, command, timeout, interval)
+
+    # ---------- input helpers ----------
+    @staticmethod
+    def key(code):
+        return f"input keyevent {int(code)}"
+
+    @staticmethod
+    def tap(x, y):
+        return f"input tap {int(x)} {int(y)}"
+
+    @staticmethod
+    def text(message):
+        return f"input text {shlex.quote(message)}"
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_adb_session():
+    """Shared session used by the features/helper functions"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = AdbSession()
+        return _session
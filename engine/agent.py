@@ -8,8 +8,6 @@ from langchain_core.messages import SystemMessage, HumanMessage, BaseMessage
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
 from typing_extensions import TypedDict, Annotated, Literal
-import psutil
-import platform
 
 
 from engine.config import (
@@ -19,6 +17,8 @@ from engine.config import (
 
 # ==================== IMPORT TOOLS ====================
 from engine.tools import all_tools
+from engine.executor import tool_executor
+from engine.deadline import Deadline, DeadlineExceeded, CircuitOpen, retry
 
 
 
@@ -27,6 +27,15 @@ class AgentState(TypedDict):
     input: str
     output: str
     tool_results: dict
+    deadline: Deadline
+
+
+# ==================== Latency Budget ====================
+ROUTE_MIN_BUDGET = 12.0     # skip tool-requirement analysis below this
+ROUTE_TIMEOUT = 3.0
+SUMMARY_MIN_BUDGET = 2.0    # skip LLM summarization below this
+SUMMARY_RESERVE = 2.5       # budget kept back from tools for summarizing
+TIMEOUT_REPLY = "Sorry, that's taking too long right now. Please try again in a moment."
 
 
 # ==================== Initialize LLM ====================
@@ -88,8 +97,23 @@ def extract_text_from_response(response):
     return str(response)
 
 
-def summarize_with_llm(tool_name: str, tool_result: str, user_query: str) -> str:
+def invoke_llm(model, prompt, deadline=None, timeout=None):
+    """LLM call bounded by the command deadline, with jittered retries and a circuit breaker"""
+    deadline = deadline or Deadline()
+
+    def attempt():
+        limit = deadline.cap(timeout)
+        if limit <= 0:
+            raise DeadlineExceeded("no time left for the LLM")
+        return tool_executor.threads.run(model.invoke, {"input": prompt}, limit)
+
+    return retry(attempt, service="gemini", deadline=deadline, attempts=2)
+
+
+def summarize_with_llm(tool_name: str, tool_result: str, user_query: str, deadline=None) -> str:
     """Pass tool results through LLM for concise, natural responses"""
+    if deadline and not deadline.allows(SUMMARY_MIN_BUDGET):
+        return tool_result  # Out of budget: answer with the raw result
     try:
         summary_prompt = f"""You are a helpful assistant. The user asked: "{user_query}"
         
@@ -98,7 +122,7 @@ Tool '{tool_name}' returned: {tool_result}
 Provide a SHORT, NATURAL response (1-2 sentences max) that directly answers the user's question.
 Be conversational and concise. Don't mention the tool name."""
 
-        response = llm.invoke(summary_prompt)
+        response = invoke_llm(llm, summary_prompt, deadline)
         return response.content if hasattr(response, 'content') else str(response)
     except Exception as e:
         return tool_result  # Fallback to original result
@@ -125,6 +149,7 @@ IMPORTANT INSTRUCTIONS:
 3. Extract parameters clearly:
    - Weather: Extract CITY name
    - Stock: Extract SYMBOL (convert to uppercase)
+   - Several stocks or "my watchlist": ONE get_stock_quotes(symbols="AAPL, TSLA") call
    - WhatsApp/SMS: Extract CONTACT NAME and MESSAGE
    - Tasks: Extract TASK ID (numbers) or TITLE (text)
 
@@ -142,12 +167,16 @@ IMPORTANT INSTRUCTIONS:
 
 8. SYSTEM MONITORING & CONTROL:
    - Control brightness: control_brightness("increase"/"decrease"/"set", value)
-   - Control volume: control_volume("increase"/"decrease"/"set"/"mute", value)
+   - Control volume: control_volume("increase"/"decrease"/"set"/"get"/"mute", value, app="optional app name")
    - Check battery: get_battery_status()
    - Check ram: get_ram_usage()
    - Check cpu usage: get_cpu_usage()
+   - What's using CPU/RAM: get_top_processes(sort_by="cpu"/"memory"/"io")
    - Check system stats: get_system_stats()
+   - Past usage ("RAM this afternoon", "when did battery drain fastest"): get_health_history(metric, period)
+   - What's taking up disk space: analyze_disk_usage(path="~")
    - Take screenshot: take_screenshot()
+   - Read what's on screen: look_at_screen(question, window="optional window title")
 
 
 9. Email:
@@ -176,9 +205,8 @@ IMPORTANT INSTRUCTIONS:
 12. SPECIAL WORKFLOW:
     Fetch my WhatsApp chats:
         1. open Whatsapp  
-        2. take a screenshot  
-        3. send screenshot location to LLM  
-        4. extract unread chats  
+        2. look_at_screen(question="list the unread chats", window="WhatsApp")  
+        3. summarize the unread chats  
 
 
 GENERAL RULES:
@@ -192,6 +220,12 @@ GENERAL RULES:
     def route_node(state: AgentState):
         """Route node - checks if a tool is required to answer the query"""
         user_input = state["input"]
+        deadline = state.get("deadline") or Deadline()
+        
+        # Routing is advisory only - skip it when the budget is tight
+        if not deadline.allows(ROUTE_MIN_BUDGET):
+            print(f"📍 Route Analysis skipped ({deadline})")
+            return state
         
         # Build tool list for prompt
         tool_list = []
@@ -220,7 +254,7 @@ Respond ONLY in JSON format:
 }}"""
 
         try:
-            detection_response = llm.invoke(tool_detection_prompt)
+            detection_response = invoke_llm(llm, tool_detection_prompt, deadline, timeout=ROUTE_TIMEOUT)
             response_text = detection_response.content if hasattr(detection_response, 'content') else str(detection_response)
             
             # Try to parse JSON from response
@@ -245,7 +279,8 @@ Respond ONLY in JSON format:
             return {
                 "input": user_input,
                 "output": state.get("output", ""),
-                "tool_results": state.get("tool_results", {})
+                "tool_results": state.get("tool_results", {}),
+                "deadline": deadline
             }
             
         except Exception as e:
@@ -257,6 +292,7 @@ Respond ONLY in JSON format:
     def chat_node(state: AgentState):
         """LLM node - processes user input, handles tool calls internally, and returns response"""
         user_input = state["input"]
+        deadline = state.get("deadline") or Deadline()
         messages = [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_input)
@@ -264,7 +300,7 @@ Respond ONLY in JSON format:
         
         try:
             # Get LLM response with tool bindings
-            response = llm_with_tools.invoke(messages)
+            response = invoke_llm(llm_with_tools, messages, deadline)
             
             output = response.content if hasattr(response, "content") else ""
             tool_results = {}
@@ -275,13 +311,20 @@ Respond ONLY in JSON format:
                     tool_name = tool_call.get("name")
                     tool_args = tool_call.get("args", {})
                     
+                    if deadline.expired():
+                        tool_results[tool_name] = "Skipped: out of time"
+                        print(f"⏱️ Skipping {tool_name}: {deadline}")
+                        continue
+                    
                     print(f"🔧 Calling tool: {tool_name} with args: {tool_args}")
                     
                     try:
                         # Find and execute tool
                         for tool in all_tools:
                             if tool.name == tool_name:
-                                result = tool.func(**tool_args)
+                                # Long tools (create_file, disk scans) answer "still working" at the limit
+                                result = tool_executor.run(tool, tool_args,
+                                                           timeout=max(1.0, deadline.remaining() - SUMMARY_RESERVE))
                                 
                                 # Clean JSON if needed
                                 if isinstance(result, (dict, list)):
@@ -292,7 +335,7 @@ Respond ONLY in JSON format:
                                 result_str = str(result)
                                 
                                 # Pass through LLM for natural response
-                                summarized_result = summarize_with_llm(tool_name, result_str, user_input)
+                                summarized_result = summarize_with_llm(tool_name, result_str, user_input, deadline)
                                 
                                 tool_results[tool_name] = summarized_result
                                 print(f"✓ Tool result (summarized): {summarized_result[:100]}")
@@ -316,7 +359,17 @@ Respond ONLY in JSON format:
             return {
                 "input": user_input,
                 "output": output,
-                "tool_results": tool_results
+                "tool_results": tool_results,
+                "deadline": deadline
+            }
+        
+        except (DeadlineExceeded, CircuitOpen, TimeoutError) as e:
+            print(f"Chat node degraded: {e!r} ({deadline})")
+            return {
+                "input": user_input,
+                "output": TIMEOUT_REPLY,
+                "tool_results": {},
+                "deadline": deadline
             }
             
         except Exception as e:
@@ -326,7 +379,8 @@ Respond ONLY in JSON format:
             return {
                 "input": user_input,
                 "output": f"Error: {str(e)}",
-                "tool_results": {}
+                "tool_results": {},
+                "deadline": deadline
             }
     
     
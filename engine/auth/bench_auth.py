@@ -0,0 +1,140 @@
+# bench_auth.py - Headless leave-one-out evaluation of face authentication
+#
+#   python -m engine.auth.bench_auth
+#   python -m engine.auth.bench_auth --thresholds 0.5,0.55,0.6 --pad 0.5
+#
+# Every image under datasets/<person>/ is read through an ImageFolderSource and
+# run through detect -> embed. Then each face is used as a probe twice:
+#   genuine  - its person stays enrolled, with a centroid built from the other images
+#   impostor - its person is removed from the gallery entirely
+# TAR = genuine probes accepted as the right person, FAR = impostor probes
+# accepted as anyone, wrong = genuine probes accepted as someone else.
+
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from engine.auth.detectors import create_detector
+from engine.auth.embedders import create_embedder
+from engine.auth.gallery import Gallery, normalize
+from engine.auth.sources import ImageFolderSource, iter_frames
+
+dataset_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datasets")
+
+
+def embed_dataset(root, detector, embedder, pad):
+    """-> (vectors, labels, timings {stage: [ms]}, frames seen)"""
+    vectors, labels = [], []
+    timings = {"detect": [], "embed": []}
+    frames = 0
+    for person in sorted(os.listdir(root)):
+        person_dir = os.path.join(root, person)
+        if not os.path.isdir(person_dir):
+            continue
+        for frame in iter_frames(ImageFolderSource(person_dir)):
+            frames += 1
+            if pad:
+                h, w = frame.shape[:2]
+                py, px = int(h * pad), int(w * pad)
+                frame = cv2.copyMakeBorder(frame, py, py, px, px, cv2.BORDER_CONSTANT, value=(128, 128, 128))
+            img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+            start = time.perf_counter()
+            faces = detector.detect(img_rgb)
+            timings["detect"].append((time.perf_counter() - start) * 1000)
+            if not faces:
+                continue
+            (x, y, w, h), _ = max(faces, key=lambda f: f[1])
+            face = cv2.resize(img_rgb[y:y+h, x:x+w], (160, 160))
+
+            start = time.perf_counter()
+            vector = embedder.embed([face])[0]
+            timings["embed"].append((time.perf_counter() - start) * 1000)
+            vectors.append(vector)
+            labels.append(person)
+    return normalize(vectors) if vectors else np.zeros((0, 512), np.float32), labels, timings, frames
+
+
+def leave_one_out(vectors, labels):
+    """-> (genuine scores (N, P), impostor scores (N, P), label ids (N,), names)"""
+    names = sorted(set(labels))
+    ids = np.array([names.index(label) for label in labels])
+    sums = np.zeros((len(names), vectors.shape[1]), np.float32)
+    np.add.at(sums, ids, vectors)
+    counts = np.bincount(ids, minlength=len(names))
+
+    rows = np.arange(len(ids))
+    base = vectors @ normalize(sums).T                         # probe vs every full centroid
+    own = (vectors * normalize(sums[ids] - vectors)).sum(axis=1)  # vs own centroid without the probe
+
+    genuine = base.copy()
+    genuine[rows, ids] = np.where(counts[ids] > 1, own, -np.inf)
+    impostor = base.copy()
+    impostor[rows, ids] = -np.inf
+    return genuine, impostor, ids, names
+
+
+def rates(genuine, impostor, ids, threshold):
+    """-> (TAR, FAR, wrong-person rate) at `threshold`"""
+    best, best_score = genuine.argmax(axis=1), genuine.max(axis=1)
+    accepted = best_score >= threshold
+    true_accepts = (accepted & (best == ids)).sum()
+    wrong_accepts = (accepted & (best != ids)).sum()
+    impostor_accepts = (impostor.max(axis=1) >= threshold).sum()
+    n = len(ids)
+    return true_accepts / n, impostor_accepts / n, wrong_accepts / n
+
+
+def stats(values):
+    if not values:
+        return "      -       -"
+    return f"{np.mean(values):7.2f} {np.percentile(values, 95):7.2f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leave-one-out face authentication benchmark")
+    parser.add_argument("--dataset", default=dataset_dir)
+    parser.add_argument("--detector", default=None, help="detector spec (default SYRA_FACE_DETECTOR)")
+    parser.add_argument("--embedder", default=None, help="embedder backend (default SYRA_FACE_EMBEDDER)")
+    parser.add_argument("--thresholds", default="0.40,0.45,0.50,0.55,0.60,0.65,0.70,0.75,0.80")
+    parser.add_argument("--pad", type=float, default=0.5, help="border around the (tightly cropped) images")
+    args = parser.parse_args(argv)
+
+    detector = create_detector(args.detector)
+    embedder = create_embedder(args.embedder)
+    started = time.perf_counter()
+    vectors, labels, timings, frames = embed_dataset(args.dataset, detector, embedder, args.pad)
+    elapsed = time.perf_counter() - started
+    if len(set(labels)) < 2:
+        print(f"[FAIL] need faces of at least two people under {args.dataset}")
+        return 1
+
+    genuine, impostor, ids, names = leave_one_out(vectors, labels)
+
+    # Matching cost at runtime: one probe against the enrolled centroids
+    gallery = Gallery(np.stack([vectors[ids == i].mean(axis=0) for i in range(len(names))]), names)
+    match_ms = []
+    for vector in vectors:
+        start = time.perf_counter()
+        gallery.match(vector)
+        match_ms.append((time.perf_counter() - start) * 1000)
+
+    print(f"[INFO] {frames} frames, {len(labels)} faces, {len(names)} people "
+          f"(detector {getattr(detector, 'name', '?')}, embedder {embedder.name})")
+    print(f"\n{'stage':<8} {'mean ms':>7} {'p95 ms':>7}")
+    for stage, values in (("detect", timings["detect"]), ("embed", timings["embed"]), ("match", match_ms)):
+        print(f"{stage:<8} {stats(values)}")
+    print(f"\n[INFO] {frames / elapsed:.1f} frames per second end to end")
+
+    print(f"\n{'threshold':>9} {'TAR':>7} {'FAR':>7} {'wrong':>7}")
+    for threshold in (float(t) for t in args.thresholds.split(",")):
+        tar, far, wrong = rates(genuine, impostor, ids, threshold)
+        print(f"{threshold:9.2f} {tar:7.1%} {far:7.1%} {wrong:7.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+# bench_detectors.py - Detection recall and per-frame latency of each face detector
+#
+#   python -m engine.auth.bench_detectors
+#   python -m engine.auth.bench_detectors --backends haar,yunet,mtcnn,haar+mtcnn --pad 0.5
+#
+# Every image under datasets/<person>/ holds exactly one face, so recall is the
+# share of images where at least one face was found. The bundled images are
+# tight crops; --pad surrounds them with a border so detectors see a face at
+# camera-frame scale instead of one that fills the whole image.
+
+import argparse
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+from engine.auth.detectors import create_detector
+
+dataset_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datasets")
+
+
+def load_images(root, pad, limit=None):
+    images = []
+    for path in sorted(glob.glob(os.path.join(root, "*", "*"))):
+        img = cv2.imread(path)
+        if img is None:
+            continue
+        if pad:
+            h, w = img.shape[:2]
+            py, px = int(h * pad), int(w * pad)
+            img = cv2.copyMakeBorder(img, py, py, px, px, cv2.BORDER_CONSTANT, value=(128, 128, 128))
+        images.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if limit and len(images) >= limit:
+            break
+    return images
+
+
+def run(detector, images):
+    """-> (recall, mean ms, p95 ms)"""
+    detector.detect(images[0])  # warm-up (graph building, lazy allocations)
+    found, times = 0, []
+    for img in images:
+        start = time.perf_counter()
+        faces = detector.detect(img)
+        times.append((time.perf_counter() - start) * 1000)
+        found += bool(faces)
+    return found / len(images), float(np.mean(times)), float(np.percentile(times, 95))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark face detector backends")
+    parser.add_argument("--dataset", default=dataset_dir)
+    parser.add_argument("--backends", default="haar,ssd,yunet,mtcnn,haar+mtcnn",
+                        help="comma separated; join cascade stages with '+'")
+    parser.add_argument("--pad", type=float, default=0.5, help="border around each image, as a fraction of its size")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    images = load_images(args.dataset, args.pad, args.limit)
+    if not images:
+        print(f"[FAIL] no images under {args.dataset}")
+        return 1
+    print(f"[INFO] {len(images)} images from {args.dataset}")
+    print(f"{'backend':<14} {'recall':>7} {'mean ms':>8} {'p95 ms':>8}")
+
+    for backend in args.backends.split(","):
+        try:
+            detector = create_detector(backend.replace("+", ","))
+        except (ImportError, AttributeError, FileNotFoundError, ValueError, cv2.error) as e:
+            print(f"{backend:<14} skipped: {e}")
+            continue
+        recall, mean_ms, p95_ms = run(detector, images)
+        print(f"{backend:<14} {recall:7.1%} {mean_ms:8.1f} {p95_ms:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
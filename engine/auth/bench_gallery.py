@@ -0,0 +1,69 @@
+# bench_gallery.py - Matching cost vs gallery size (per-identity loop vs one matmul)
+#
+#   python -m engine.auth.bench_gallery
+#   python -m engine.auth.bench_gallery --sizes 4,100,1000,10000 --faces 3
+
+import argparse
+import time
+
+import numpy as np
+
+from engine.auth.gallery import Gallery
+
+DIM = 512  # FaceNet embedding size
+
+
+def time_per_call(fn, repeat):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def loop_match(embeddings, probe):
+    """The old per-identity cosine_similarity loop from recoganize"""
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    best_match, best_score = "Unknown", -1
+    for name, stored in embeddings.items():
+        score = cosine_similarity([probe], [stored])[0][0]
+        if score > best_score:
+            best_score, best_match = score, name
+    return best_match, best_score
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark face gallery matching")
+    parser.add_argument("--sizes", default="4,100,1000,10000")
+    parser.add_argument("--faces", type=int, default=1, help="faces per frame (batched)")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--no-loop", action="store_true", help="skip the slow per-identity baseline")
+    args = parser.parse_args(argv)
+
+    try:
+        import sklearn  # noqa: F401  (only needed for the baseline)
+        have_sklearn = True
+    except ImportError:
+        have_sklearn = False
+        print("[INFO] scikit-learn not installed - skipping the per-identity baseline")
+
+    rng = np.random.default_rng(0)
+    probes = rng.standard_normal((args.faces, DIM)).astype(np.float32)
+
+    print(f"{'identities':>10}  {'matmul (us)':>12}  {'loop (us)':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        vectors = rng.standard_normal((size, DIM)).astype(np.float32)
+        gallery = Gallery(vectors, [f"person_{i}" for i in range(size)])
+        fast = time_per_call(lambda: gallery.match_batch(probes), args.repeat)
+
+        slow = "-"
+        if not args.no_loop and have_sklearn:
+            embeddings = dict(zip(gallery.labels, vectors))
+            repeat = max(1, min(args.repeat, 20000 // size))
+            slow = f"{time_per_call(lambda: [loop_match(embeddings, p) for p in probes], repeat) * 1e6:12.0f}"
+        print(f"{size:>10}  {fast * 1e6:12.1f}  {slow:>12}")
+
+
+if __name__ == "__main__":
+    main()
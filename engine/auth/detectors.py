@@ -0,0 +1,160 @@
+# detectors.py - Interchangeable face detectors (Haar, OpenCV DNN, MTCNN) and a cheap-first cascade
+#
+# Selected with SYRA_FACE_DETECTOR:
+#   "mtcnn"            one backend
+#   "haar,mtcnn"       cascade: Haar first, MTCNN only when Haar finds nothing confident
+#   "yunet,mtcnn"      (DNN models are read from engine/auth/models/)
+
+import os
+
+import cv2
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+DEFAULT_SPEC = os.getenv("SYRA_FACE_DETECTOR", "haar,mtcnn")
+MIN_CONFIDENCE = float(os.getenv("SYRA_FACE_DETECTOR_MIN_CONFIDENCE", "0.6"))
+
+# Download locations, for the error message when a model file is missing
+MODEL_URLS = {
+    "deploy.prototxt": "https://github.com/opencv/opencv/raw/master/samples/dnn/face_detector/deploy.prototxt",
+    "res10_300x300_ssd_iter_140000.caffemodel":
+        "https://github.com/opencv/opencv_3rdparty/raw/dnn_samples_face_detector_20170830/res10_300x300_ssd_iter_140000.caffemodel",
+    "face_detection_yunet_2023mar.onnx":
+        "https://github.com/opencv/opencv_zoo/raw/main/models/face_detection_yunet/face_detection_yunet_2023mar.onnx",
+}
+
+
+def model_path(name):
+    path = os.path.join(MODELS_DIR, name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"face detector model {name} not found in {MODELS_DIR} "
+                                f"(download: {MODEL_URLS.get(name, 'n/a')})")
+    return path
+
+
+class HaarDetector:
+    """OpenCV Haar cascade (as in capture.py) - fastest, least reliable"""
+
+    name = "haar"
+
+    def __init__(self, scale_factor=1.2, min_neighbors=5):
+        self.cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+
+    def detect(self, img_rgb):
+        gray = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2GRAY)
+        boxes, _, weights = self.cascade.detectMultiScale3(
+            gray, self.scale_factor, self.min_neighbors, outputRejectLevels=True)
+        # The level weight is an unbounded margin; ~5 is already a clear face
+        return [(tuple(int(v) for v in box), min(1.0, max(0.0, float(w) / 5.0)))
+                for box, w in zip(boxes, weights)]
+
+
+class SsdDetector:
+    """OpenCV DNN res10 300x300 SSD (Caffe)"""
+
+    name = "ssd"
+
+    def __init__(self, min_score=0.5):
+        self.net = cv2.dnn.readNetFromCaffe(model_path("deploy.prototxt"),
+                                            model_path("res10_300x300_ssd_iter_140000.caffemodel"))
+        self.min_score = min_score
+
+    def detect(self, img_rgb):
+        h, w = img_rgb.shape[:2]
+        blob = cv2.dnn.blobFromImage(cv2.resize(img_rgb, (300, 300)), 1.0, (300, 300),
+                                     (123.0, 177.0, 104.0), swapRB=True)
+        self.net.setInput(blob)
+        faces = []
+        for det in self.net.forward()[0, 0]:
+            score = float(det[2])
+            if score < self.min_score:
+                continue
+            x0, y0, x1, y1 = (det[3:7] * [w, h, w, h]).astype(int)
+            x0, y0 = max(0, x0), max(0, y0)
+            faces.append(((x0, y0, x1 - x0, y1 - y0), score))
+        return faces
+
+
+class YuNetDetector:
+    """OpenCV FaceDetectorYN (YuNet ONNX) - fast and accurate, needs OpenCV >= 4.8"""
+
+    name = "yunet"
+
+    def __init__(self, min_score=0.6):
+        self.model = cv2.FaceDetectorYN.create(model_path("face_detection_yunet_2023mar.onnx"), "",
+                                               (320, 320), min_score)
+        self.size = None
+
+    def detect(self, img_rgb):
+        h, w = img_rgb.shape[:2]
+        if self.size != (w, h):
+            self.model.setInputSize((w, h))
+            self.size = (w, h)
+        _, faces = self.model.detect(cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR))
+        if faces is None:
+            return []
+        return [((max(0, int(f[0])), max(0, int(f[1])), int(f[2]), int(f[3])), float(f[-1])) for f in faces]
+
+
+class MtcnnDetector:
+    """MTCNN (TensorFlow) - the original detector, slowest"""
+
+    name = "mtcnn"
+
+    def __init__(self):
+        from mtcnn import MTCNN
+        self.model = MTCNN()
+
+    def detect(self, img_rgb):
+        faces = []
+        for r in self.model.detect_faces(img_rgb):
+            x, y, w, h = r['box']
+            faces.append(((abs(x), abs(y), w, h), float(r['confidence'])))
+        return faces
+
+
+class CascadeDetector:
+    """Try detectors cheapest first; escalate while nothing is found with enough confidence"""
+
+    def __init__(self, detectors, min_confidence=MIN_CONFIDENCE):
+        self.detectors = detectors
+        self.min_confidence = min_confidence
+        self.name = ",".join(d.name for d in detectors)
+
+    def detect(self, img_rgb):
+        faces = []
+        for detector in self.detectors:
+            faces = detector.detect(img_rgb)
+            if faces and min(score for _, score in faces) >= self.min_confidence:
+                return faces
+        return faces   # whatever the most thorough detector found
+
+
+BACKENDS = {
+    "haar": HaarDetector,
+    "ssd": SsdDetector,
+    "res10": SsdDetector,
+    "yunet": YuNetDetector,
+    "mtcnn": MtcnnDetector,
+}
+
+
+def parse_spec(spec=None):
+    names = [n.strip().lower() for n in (spec or DEFAULT_SPEC).split(",") if n.strip()]
+    unknown = [n for n in names if n not in BACKENDS]
+    if not names or unknown:
+        raise ValueError(f"unknown face detector {unknown or spec!r}; choose from {sorted(BACKENDS)}")
+    return names
+
+
+def detector_id(spec=None):
+    """Normalized spec (plus the cascade's escalation threshold) - which faces get found depends on it"""
+    names = [BACKENDS[n].name for n in parse_spec(spec)]
+    return ",".join(names) if len(names) == 1 else f"{','.join(names)}@{MIN_CONFIDENCE:g}"
+
+
+def create_detector(spec=None):
+    """Detector from a spec like "mtcnn" or "haar,mtcnn" (defaults to SYRA_FACE_DETECTOR)"""
+    detectors = [BACKENDS[n]() for n in parse_spec(spec)]
+    return detectors[0] if len(detectors) == 1 else CascadeDetector(detectors)
@@ -0,0 +1,144 @@
+# embedders.py - FaceNet embedding backends: Keras (float, full TensorFlow) or a
+# quantized TFLite / ONNX export run by a lightweight interpreter
+#
+# Selected with SYRA_FACE_EMBEDDER = auto | keras | tflite | onnx. "auto" uses an
+# exported model from engine/auth/models/ once export_facenet.py has verified it.
+
+import importlib.util
+import json
+import os
+
+import numpy as np
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+TFLITE_PATH = os.path.join(MODELS_DIR, "facenet_int8.tflite")
+ONNX_PATH = os.path.join(MODELS_DIR, "facenet_int8.onnx")
+META_PATH = os.path.join(MODELS_DIR, "facenet_export.json")
+DEFAULT_BACKEND = os.getenv("SYRA_FACE_EMBEDDER", "auto")
+MAX_BATCH = 32
+
+
+def preprocess(faces, method):
+    """160x160 RGB uint8 faces -> float32 batch, prepared the way the exported model expects"""
+    x = np.asarray(faces, dtype=np.float32)
+    if method == "scale":
+        return (x - 127.5) / 127.5
+    if method == "prewhiten":       # per-image standardization (FaceNet's original prewhiten)
+        axes = (1, 2, 3)
+        mean = x.mean(axis=axes, keepdims=True)
+        std = np.maximum(x.std(axis=axes, keepdims=True), 1.0 / np.sqrt(x[0].size))
+        return ((x - mean) / std).astype(np.float32)
+    return x
+
+
+def export_meta():
+    try:
+        with open(META_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"preprocess": "prewhiten", "verified": []}
+
+
+def export_times(meta=None):
+    """{format: when it was exported}; a single timestamp from older exports names no format"""
+    exported = (meta if meta is not None else export_meta()).get("exported")
+    return dict(exported) if isinstance(exported, dict) else {}
+
+
+class KerasEmbedder:
+    """keras_facenet.FaceNet - the float reference model"""
+
+    name = "keras"
+
+    def __init__(self):
+        from keras_facenet import FaceNet
+        self.model = FaceNet()
+
+    def embed(self, faces):
+        return np.asarray(self.model.embeddings(list(faces)), dtype=np.float32)
+
+
+class TFLiteEmbedder:
+    """Quantized TFLite export (tflite_runtime if installed, else tf.lite)"""
+
+    name = "tflite"
+
+    def __init__(self, path=TFLITE_PATH):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+        self.interpreter = Interpreter(model_path=path, num_threads=os.cpu_count())
+        self.input = self.interpreter.get_input_details()[0]["index"]
+        self.output = self.interpreter.get_output_details()[0]["index"]
+        self.batch = None
+        self.preprocess = export_meta()["preprocess"]
+
+    def _run(self, batch):
+        if self.batch != len(batch):
+            self.interpreter.resize_tensor_input(self.input, batch.shape)
+            self.interpreter.allocate_tensors()
+            self.batch = len(batch)
+        self.interpreter.set_tensor(self.input, batch)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output).copy()
+
+    def embed(self, faces):
+        x = preprocess(faces, self.preprocess)
+        return np.concatenate([self._run(x[i:i + MAX_BATCH]) for i in range(0, len(x), MAX_BATCH)])
+
+
+class OnnxEmbedder:
+    """Quantized ONNX export run by onnxruntime"""
+
+    name = "onnx"
+
+    def __init__(self, path=ONNX_PATH):
+        import onnxruntime
+        self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.input = self.session.get_inputs()[0].name
+        self.preprocess = export_meta()["preprocess"]
+
+    def embed(self, faces):
+        x = preprocess(faces, self.preprocess)
+        return np.concatenate([self.session.run(None, {self.input: x[i:i + MAX_BATCH]})[0]
+                               for i in range(0, len(x), MAX_BATCH)])
+
+
+BACKENDS = {"keras": KerasEmbedder, "tflite": TFLiteEmbedder, "onnx": OnnxEmbedder}
+
+
+INTERPRETERS = {"tflite": ("tflite_runtime", "tensorflow"), "onnx": ("onnxruntime",)}
+
+
+def resolve_backend(backend=None):
+    """The concrete backend `backend` (default SYRA_FACE_EMBEDDER) stands for, without loading it;
+    "auto" prefers a verified export whose interpreter is installed"""
+    backend = (backend or DEFAULT_BACKEND).lower()
+    if backend == "auto":
+        verified = export_meta().get("verified", [])
+        for name, path in (("tflite", TFLITE_PATH), ("onnx", ONNX_PATH)):
+            if name in verified and os.path.exists(path) and \
+                    any(importlib.util.find_spec(m) for m in INTERPRETERS[name]):
+                return name
+        return "keras"
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown face embedder {backend!r}; choose from auto, {', '.join(BACKENDS)}")
+    return backend
+
+
+def embedder_id(backend=None):
+    """Identifies the vectors a backend produces: an export is identified by when it was made,
+    so re-exporting invalidates embeddings built with the previous one"""
+    backend = resolve_backend(backend)
+    if backend == "keras":
+        return "keras"
+    return f"{backend}:{export_times().get(backend, '?')}"
+
+
+def create_embedder(backend=None):
+    """Embedder for `backend` (defaults to SYRA_FACE_EMBEDDER); "auto" prefers an exported model"""
+    backend = resolve_backend(backend)
+    embedder = BACKENDS[backend]()
+    embedder.id = embedder_id(backend)
+    return embedder
@@ -0,0 +1,191 @@
+# embedding_store.py - Face embeddings as memory-mapped .npy files + a JSON sidecar
+#
+# Layout of engine/auth/embeddings/ (one "generation" per write):
+#   meta.json               version header, names, dtype and the current file names
+#   vectors.<gen>.npy       (N, D) L2-normalized embedding per image
+#   label_ids.<gen>.npy     (N,) int32 index into meta["names"]
+#   centroids.<gen>.npy     (P, D) normalized mean embedding per person
+#   images.<gen>.json       source image of every row (only read when updating)
+#
+# A write produces a new generation and then replaces meta.json, so readers
+# always see either the old or the new store, never a half-written one.
+
+import glob
+import json
+import os
+
+import numpy as np
+
+from engine.auth.gallery import Gallery, normalize
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "embeddings")
+FORMAT = "syra-face-embeddings"
+FORMAT_VERSION = 1
+DTYPES = ("float32", "float16")
+
+
+def centroids_of(vectors, label_ids, count):
+    """Normalized mean of the (normalized) vectors of every label"""
+    sums = np.zeros((count, vectors.shape[1]), dtype=np.float32)
+    np.add.at(sums, label_ids, vectors.astype(np.float32))
+    return normalize(sums)
+
+
+class EmbeddingStore:
+    """Read/write the on-disk embedding store (arrays are memory-mapped on load)"""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.meta = None
+        self.vectors = None
+        self.label_ids = None
+        self.centroids = None
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def exists(self):
+        return os.path.exists(self.path("meta.json"))
+
+    # -------------------- reading --------------------
+
+    def load(self):
+        """Read the header and memory-map the arrays (no copy, cost independent of size)"""
+        with open(self.path("meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != FORMAT or meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported embedding store {meta.get('format')} v{meta.get('version')}")
+
+        files = meta["files"]
+        self.vectors = np.load(self.path(files["vectors"]), mmap_mode="r")
+        self.label_ids = np.load(self.path(files["label_ids"]), mmap_mode="r")
+        self.centroids = np.load(self.path(files["centroids"]), mmap_mode="r")
+        if self.vectors.shape != (meta["count"], meta["dim"]):
+            raise ValueError("embedding store header does not match vectors.npy")
+        self.meta = meta
+        return self
+
+    @property
+    def names(self):
+        return self.meta["names"]
+
+    @property
+    def source(self):
+        return self.meta.get("source", {})
+
+    def labels(self):
+        """Person name of every row of `vectors`"""
+        return np.asarray(self.names)[self.label_ids]
+
+    def images(self):
+        """Source image of every row (read on demand - only needed for updates)"""
+        with open(self.path(self.meta["files"]["images"]), encoding="utf-8") as f:
+            return json.load(f)
+
+    def gallery(self, mode="centroids"):
+        """Gallery of one centroid per person, or of every image (nearest-neighbour matching)"""
+        if self.meta is None:
+            self.load()
+        if mode == "images":
+            return Gallery(self.vectors, self.label_ids, normalized=True, names=self.names)
+        return Gallery(self.centroids, self.names, normalized=True)
+
+    # -------------------- writing --------------------
+
+    def write(self, vectors, labels, images=None, dtype="float32", source=None):
+        """Atomically replace the store with per-image `vectors` labelled by person
+
+        `source` ({"embedder": ..., "detector": ...}) records what produced the
+        vectors; vectors from a different model must not be mixed in later.
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}")
+        vectors = normalize(vectors) if len(vectors) else np.zeros((0, 512), dtype=np.float32)
+        labels = list(labels)
+        images = list(images) if images is not None else [""] * len(labels)
+        if not (len(vectors) == len(labels) == len(images)):
+            raise ValueError("vectors, labels and images differ in length")
+
+        names = sorted(set(labels))
+        index = {name: i for i, name in enumerate(names)}
+        label_ids = np.array([index[label] for label in labels], dtype=np.int32)
+        centroids = centroids_of(vectors, label_ids, len(names))
+
+        os.makedirs(self.root, exist_ok=True)
+        previous = self._generation()
+        generation = previous + 1
+        files = {
+            "vectors": f"vectors.{generation}.npy",
+            "label_ids": f"label_ids.{generation}.npy",
+            "centroids": f"centroids.{generation}.npy",
+            "images": f"images.{generation}.json",
+        }
+        self._save_array(files["vectors"], vectors.astype(dtype))
+        self._save_array(files["label_ids"], label_ids)
+        self._save_array(files["centroids"], centroids.astype(dtype))
+        self._save_json(files["images"], images)
+
+        meta = {
+            "format": FORMAT,
+            "version": FORMAT_VERSION,
+            "generation": generation,
+            "dim": int(vectors.shape[1]),
+            "dtype": dtype,
+            "count": len(labels),
+            "names": names,
+            "source": source or {},
+            "files": files,
+        }
+        self._save_json("meta.json", meta)   # the commit point
+        self._remove_old(generation)
+        return self.load()
+
+    def _generation(self):
+        if not self.exists():
+            return 0
+        with open(self.path("meta.json"), encoding="utf-8") as f:
+            return json.load(f).get("generation", 0)
+
+    def _save_array(self, name, array):
+        tmp = self.path(name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path(name))
+
+    def _save_json(self, name, data):
+        tmp = self.path(name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path(name))
+
+    def _remove_old(self, generation):
+        """Delete files of earlier generations (still-open memmaps keep working on POSIX)"""
+        for path in glob.glob(self.path("*.*.npy")) + glob.glob(self.path("images.*.json")):
+            gen = os.path.basename(path).split(".")[1]
+            if gen.isdigit() and int(gen) != generation:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass  # mapped by another process on Windows; removed next time
+
+
+def import_legacy(pkl_path, root=STORE_DIR):
+    """Convert an old {name: mean embedding} embeddings.pkl into the store (one row per person)"""
+    import joblib
+
+    embeddings = joblib.load(pkl_path)
+    names = list(embeddings)
+    vectors = np.stack([np.asarray(embeddings[n], dtype=np.float32) for n in names])
+    return EmbeddingStore(root).write(vectors, names, images=[pkl_path] * len(names))
+
+
+if __name__ == "__main__":
+    import sys
+
+    legacy = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(STORE_DIR), "embeddings.pkl")
+    store = import_legacy(legacy)
+    print(f"[INFO] Imported {len(store.names)} people from {legacy} into {store.root}")
@@ -0,0 +1,164 @@
+# export_facenet.py - Export FaceNet to a quantized TFLite/ONNX model and check it
+# against the float model on the datasets/ gallery
+#
+#   python -m engine.auth.export_facenet                  # int8 TFLite + accuracy check
+#   python -m engine.auth.export_facenet --format onnx    # int8 ONNX (needs tf2onnx, onnxruntime)
+#   python -m engine.auth.export_facenet --check-only     # re-run the check on an existing export
+#
+# The check embeds every dataset face with both models, matches each one
+# against per-person centroids built with the same model, and fails if any
+# accept/reject decision or identity at --threshold differs. Only an export
+# that passes is marked verified and picked up by SYRA_FACE_EMBEDDER=auto.
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from engine.auth import embedders
+from engine.auth.gallery import Gallery, normalize
+
+dataset_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datasets")
+
+
+def load_faces(root):
+    """Detected 160x160 faces of every dataset image -> (faces, labels)"""
+    from engine.auth.generate_embeddings import load_face
+
+    faces, labels = [], []
+    for person in sorted(os.listdir(root)):
+        person_dir = os.path.join(root, person)
+        if not os.path.isdir(person_dir):
+            continue
+        for img_name in sorted(os.listdir(person_dir)):
+            face = load_face(os.path.join(person_dir, img_name))
+            if face is not None:
+                faces.append(face)
+                labels.append(person)
+    return faces, labels
+
+
+def find_preprocess(facenet, faces):
+    """Which input preparation makes model.predict() reproduce FaceNet.embeddings()"""
+    sample = faces[:4]
+    reference = normalize(facenet.embeddings(sample))
+    for method in ("none", "scale", "prewhiten"):
+        out = normalize(facenet.model.predict(embedders.preprocess(sample, method), verbose=0))
+        if (out * reference).sum(axis=1).min() > 0.999:
+            return method
+    raise RuntimeError("could not reproduce keras_facenet preprocessing; export aborted")
+
+
+def export_tflite(model, path):
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]   # int8 weights, float activations/IO
+    with open(path + ".tmp", "wb") as f:
+        f.write(converter.convert())
+    os.replace(path + ".tmp", path)
+
+
+def export_onnx(model, path):
+    import tensorflow as tf
+    import tf2onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    float_path = path + ".float.onnx"
+    spec = [tf.TensorSpec((None, 160, 160, 3), tf.float32, name="faces")]
+    tf2onnx.convert.from_keras(model, input_signature=spec, output_path=float_path)
+    quantize_dynamic(float_path, path, weight_type=QuantType.QInt8)
+    os.remove(float_path)
+
+
+def save_meta(meta):
+    with open(embedders.META_PATH + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(embedders.META_PATH + ".tmp", embedders.META_PATH)
+
+
+def record_export(fmt, method):
+    """Stamp a fresh export of `fmt` (unverified until checked); other formats keep their stamps"""
+    meta = embedders.export_meta()
+    meta["preprocess"] = method
+    meta["exported"] = {**embedders.export_times(meta), fmt: time.strftime("%Y-%m-%d %H:%M:%S")}
+    meta["verified"] = [f for f in meta.get("verified", []) if f != fmt]
+    save_meta(meta)
+
+
+def decisions(vectors, labels, threshold):
+    """Match every vector against per-person centroids -> [name or "Unknown"]"""
+    vectors = normalize(vectors)
+    names = sorted(set(labels))
+    label_arr = np.asarray(labels)
+    centroids = np.stack([vectors[label_arr == n].mean(axis=0) for n in names])
+    gallery = Gallery(centroids, names)
+    return [name if score >= threshold else "Unknown" for name, score in gallery.match_batch(vectors)]
+
+
+def check(float_vectors, faces, labels, backend, threshold):
+    """Compare the exported model with the float one; returns the number of changed decisions"""
+    start = time.perf_counter()
+    quant = embedders.create_embedder(backend)
+    load_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    quant_vectors = quant.embed(faces)
+    embed_ms = (time.perf_counter() - start) * 1000 / len(faces)
+
+    similarity = (normalize(float_vectors) * normalize(quant_vectors)).sum(axis=1)
+    before = decisions(float_vectors, labels, threshold)
+    after = decisions(quant_vectors, labels, threshold)
+    changed = [(i, b, a) for i, (b, a) in enumerate(zip(before, after)) if b != a]
+
+    print(f"[INFO] {backend}: loaded in {load_ms:.0f} ms, {embed_ms:.1f} ms/face")
+    print(f"[INFO] cosine(float, {backend}): mean {similarity.mean():.4f}, min {similarity.min():.4f}")
+    print(f"[INFO] decisions at threshold {threshold}: {len(before) - len(changed)}/{len(before)} unchanged")
+    for i, b, a in changed:
+        print(f"  face {i} ({labels[i]}): float -> {b}, {backend} -> {a}")
+    return len(changed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a quantized FaceNet and verify its decisions")
+    parser.add_argument("--format", choices=("tflite", "onnx"), default="tflite")
+    parser.add_argument("--dataset", default=dataset_dir)
+    parser.add_argument("--threshold", type=float, default=0.55)
+    parser.add_argument("--check-only", action="store_true")
+    args = parser.parse_args(argv)
+
+    from keras_facenet import FaceNet
+
+    facenet = FaceNet()
+    faces, labels = load_faces(args.dataset)
+    if not faces:
+        print(f"[FAIL] no faces found under {args.dataset}")
+        return 1
+
+    path = embedders.TFLITE_PATH if args.format == "tflite" else embedders.ONNX_PATH
+    if not args.check_only:
+        os.makedirs(embedders.MODELS_DIR, exist_ok=True)
+        method = find_preprocess(facenet, faces)
+        (export_tflite if args.format == "tflite" else export_onnx)(facenet.model, path)
+        record_export(args.format, method)
+        print(f"[INFO] Exported {path} ({os.path.getsize(path) / 1e6:.1f} MB, preprocess={method})")
+
+    float_vectors = np.concatenate([facenet.embeddings(faces[i:i + 32]) for i in range(0, len(faces), 32)])
+    changed = check(float_vectors, faces, labels, args.format, args.threshold)
+    meta = embedders.export_meta()
+    verified = set(meta.get("verified", [])) - {args.format}
+    if not changed:
+        verified.add(args.format)
+    meta["verified"] = sorted(verified)
+    save_meta(meta)
+
+    if changed:
+        print(f"[FAIL] {changed} match decisions changed - the float model stays in use")
+        return 1
+    print("[OK] quantized model makes the same decisions as the float model (now used by default)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+# gallery.py - Known faces as one normalized matrix, matched with a single matmul
+
+import numpy as np
+
+
+def normalize(vectors):
+    """L2-normalize rows (float32); zero rows stay zero"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class Gallery:
+    """Embeddings of known people: matrix (N, D) of unit rows + parallel labels (N,)
+
+    With `names`, labels are integer ids into it (as stored by EmbeddingStore).
+    A normalized float32 or float16 matrix is kept in its own dtype.
+    """
+
+    def __init__(self, matrix, labels, normalized=False, names=None):
+        if normalized and matrix.dtype in (np.float32, np.float16):
+            self.matrix = matrix      # e.g. a memory-mapped store: used without copying
+        elif normalized:
+            self.matrix = np.asarray(matrix, dtype=np.float32)
+        else:
+            self.matrix = np.ascontiguousarray(normalize(matrix))
+        self.labels = labels if isinstance(labels, np.ndarray) else np.asarray(labels)
+        self.names = names
+        if len(self.labels) != len(self.matrix):
+            raise ValueError("gallery matrix and labels differ in length")
+
+    def __len__(self):
+        return len(self.labels)
+
+    def scores(self, probes):
+        """Cosine similarity of each probe against every identity -> (P, N) float32
+
+        The probes are cast to the matrix dtype rather than the other way
+        round, so a float16 store is never copied to float32 per query.
+        """
+        probes = normalize(probes).astype(self.matrix.dtype, copy=False)
+        return (probes @ self.matrix.T).astype(np.float32, copy=False)
+
+    def match_batch(self, probes):
+        """Best identity for each probe -> [(label, score)]; ("Unknown", -1) on an empty gallery"""
+        probes = np.atleast_2d(probes)
+        if not len(self):
+            return [("Unknown", -1.0)] * len(probes)
+        scores = self.scores(probes)
+        best = scores.argmax(axis=1)
+        return [(self.label(i), float(scores[row, i])) for row, i in enumerate(best)]
+
+    def label(self, row):
+        label = self.labels[row]
+        return self.names[label] if self.names is not None else str(label)
+
+    def match(self, probe):
+        return self.match_batch(probe)[0]
@@ -1,45 +1,197 @@
+# Run from the project root: python -m engine.auth.generate_embeddings [--rebuild]
+#
+# Incremental: images are identified by content hash, and only new or changed
+# ones are decoded and detected (across a process pool) and embedded (in
+# FaceNet batches). Deleted images drop out of the store.
+
+import argparse
+import hashlib
+import json
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+
 import cv2
 import numpy as np
-import joblib
-from keras_facenet import FaceNet
-from mtcnn import MTCNN
 
-dataset_dir = "datasets"
-embed_path = "embeddings.pkl"
+from engine.auth.detectors import create_detector, detector_id
+from engine.auth.embedders import create_embedder, embedder_id
+from engine.auth.embedding_store import EmbeddingStore
+
+dataset_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datasets")
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+NO_FACE_FILE = "no_face.json"   # hashes of images the current detector finds no face in
+POOL_MIN_IMAGES = 16            # fewer new images than this are detected without a process pool
+
+detector = None
 
-embedder = FaceNet()
-detector = MTCNN()
 
 def extract_face(img):
-    results = detector.detect_faces(img)
+    global detector
+    if detector is None:
+        detector = create_detector()
+    results = detector.detect(img)
     if results:
-        x, y, w, h = results[0]['box']
-        x, y = abs(x), abs(y)
+        (x, y, w, h), _ = max(results, key=lambda r: r[1])   # most confident face
         face = img[y:y+h, x:x+w]
         face = cv2.resize(face, (160,160))
         return face
     return None
 
-embeddings = {}
-for person in os.listdir(dataset_dir):
-    person_dir = os.path.join(dataset_dir, person)
-    if not os.path.isdir(person_dir):
-        continue
-    person_embeds = []
-    for img_name in os.listdir(person_dir):
-        path = os.path.join(person_dir, img_name)
-        img = cv2.imread(path)
-        if img is None:
+
+def load_face(path):
+    """Decode + detect (runs in a pool worker) -> 160x160 RGB face or None"""
+    img = cv2.imread(path)
+    if img is None:
+        return None
+    return extract_face(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def scan(root, known):
+    """All dataset images -> [{path, person, size, mtime, sha1}]
+
+    The hash of a file whose size and mtime are unchanged is taken from `known`
+    instead of re-reading the file.
+    """
+    entries = []
+    for person in sorted(os.listdir(root)):
+        person_dir = os.path.join(root, person)
+        if not os.path.isdir(person_dir):
             continue
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        face = extract_face(img_rgb)
-        if face is not None:
-            embedding = embedder.embeddings([face])[0]
-            person_embeds.append(embedding)
-    if person_embeds:
-        embeddings[person] = np.mean(person_embeds, axis=0)
-        print(f"[INFO] Processed {person}: {len(person_embeds)} images")
-
-joblib.dump(embeddings, embed_path)
-print(f"[INFO] Saved embeddings to {embed_path}")
+        for img_name in sorted(os.listdir(person_dir)):
+            if not img_name.lower().endswith(IMAGE_EXTS):
+                continue
+            path = os.path.join(person_dir, img_name)
+            st = os.stat(path)
+            rel = os.path.relpath(path, root)
+            old = known.get(rel)
+            if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime:
+                sha1 = old["sha1"]
+            else:
+                sha1 = file_hash(path)
+            entries.append({"path": rel, "person": person, "size": st.st_size,
+                            "mtime": st.st_mtime, "sha1": sha1})
+    return entries
+
+
+def detect_all(paths, workers):
+    """Faces for `paths` (same order), decoded and detected across up to `workers` processes
+
+    Each spawned worker re-imports TensorFlow and builds its own detector,
+    which costs seconds, so small batches (a few new photos) run in-process
+    and the pool never has more workers than images.
+    """
+    workers = min(workers, len(paths))
+    if workers <= 1 or len(paths) < POOL_MIN_IMAGES:
+        return [load_face(p) for p in paths]
+    # spawn: TensorFlow does not survive fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return list(pool.map(load_face, paths, chunksize=4))
+
+
+def embed_all(faces, batch_size, embedder=None):
+    """FaceNet embeddings for a list of faces, `batch_size` faces per forward pass"""
+    if not faces:
+        return np.zeros((0, 512), dtype=np.float32)
+    if embedder is None:
+        embedder = create_embedder()   # same backend as recoganize, so scores are comparable
+    batches = [embedder.embed(faces[i:i + batch_size]) for i in range(0, len(faces), batch_size)]
+    return np.concatenate(batches).astype(np.float32)
+
+
+def load_no_face(store, detector_name):
+    """{sha1: path} of images without a face - empty if they were scanned by another detector"""
+    try:
+        with open(store.path(NO_FACE_FILE), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("detector") != detector_name:   # also files from before the detector was recorded
+        return {}
+    return data.get("images", {})
+
+
+def current_source(embedder=None):
+    """What the vectors about to be written come from (stored in the store meta)"""
+    return {"embedder": getattr(embedder, "id", None) or embedder_id(), "detector": detector_id()}
+
+
+def update(root=dataset_dir, store=None, workers=None, batch_size=32, rebuild=False, embedder=None):
+    """Bring the store in line with `root`; returns (embedded, reused, removed)"""
+    store = store or EmbeddingStore()
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    source = current_source(embedder)
+    if store.exists() and not rebuild:
+        store.load()
+        if store.source != source:
+            # vectors from another embedder are not comparable, and another detector
+            # crops differently - mixing them in would skew every match
+            print(f"[INFO] store was built with {store.source or 'unknown models'}, now {source}; rebuilding")
+            rebuild = True
+
+    known, rows = {}, {}
+    if store.exists() and store.meta:
+        labels = store.labels()
+        for row, image in enumerate(store.images()):
+            if isinstance(image, dict):        # stores written before hashing have bare paths
+                known[image["path"]] = image   # hashes stay valid across a rebuild
+                if not rebuild:
+                    rows[(image["sha1"], str(labels[row]))] = row
+    no_face = {} if rebuild else load_no_face(store, source["detector"])
+
+    entries = scan(root, known)
+    keep = [e for e in entries if (e["sha1"], e["person"]) in rows]
+    todo = [e for e in entries if (e["sha1"], e["person"]) not in rows and e["sha1"] not in no_face]
+    removed = len(rows) - len({(e["sha1"], e["person"]) for e in keep})
+
+    if not todo and not removed and store.exists() and not rebuild:
+        return 0, len(keep), 0
+
+    faces = detect_all([os.path.join(root, e["path"]) for e in todo], workers)
+    found = [e for e, face in zip(todo, faces) if face is not None]
+    for e, face in zip(todo, faces):
+        if face is None:
+            no_face[e["sha1"]] = e["path"]
+            print(f"[WARN] No face found in {e['path']}")
+    new_vectors = embed_all([f for f in faces if f is not None], batch_size, embedder)
+
+    old_vectors = store.vectors[[rows[(e["sha1"], e["person"])] for e in keep]] if keep \
+        else np.zeros((0, new_vectors.shape[1]), dtype=np.float32)
+    vectors = np.concatenate([np.asarray(old_vectors, dtype=np.float32), new_vectors])
+    images = keep + found
+
+    store.write(vectors, [e["person"] for e in images], images, source=source)
+    with open(store.path(NO_FACE_FILE), "w", encoding="utf-8") as f:
+        json.dump({"detector": source["detector"], "images": no_face}, f)
+    return len(found), len(keep), removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the face embedding store from datasets/")
+    parser.add_argument("--dataset", default=dataset_dir)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--rebuild", action="store_true", help="ignore the existing store")
+    args = parser.parse_args(argv)
+
+    embedded, reused, removed = update(args.dataset, workers=args.workers,
+                                       batch_size=args.batch_size, rebuild=args.rebuild)
+    store = EmbeddingStore().load()
+    for name in store.names:
+        print(f"[INFO] {name}: {int((store.labels() == name).sum())} images")
+    print(f"[INFO] Embedded {embedded} new images, reused {reused}, removed {removed} "
+          f"-> {store.meta['count']} embeddings in {store.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# pipeline.py - Real-time face pipeline: latest-frame capture, sparse detection,
+# template tracking between detections, and embeddings only when a face changes
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class FrameGrabber:
+    """Reads the camera on its own thread and keeps only the newest frame"""
+
+    def __init__(self, capture, first_frame_timeout=30.0):
+        self.capture = capture
+        self.first_frame_timeout = first_frame_timeout  # DSHOW cameras can take seconds to start
+        self.frame = None
+        self.seq = 0
+        self.ok = True
+        self.lock = threading.Lock()
+        self.fresh = threading.Condition(self.lock)
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="face-capture", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            ret, frame = self.capture.read()
+            with self.lock:
+                if not ret:
+                    self.ok = False
+                    self.fresh.notify_all()
+                    return
+                self.frame = frame
+                self.seq += 1
+                self.fresh.notify_all()
+
+    def read(self, after=0, timeout=1.0):
+        """Newest frame newer than `after` -> (seq, frame); (seq, None) only if the camera stopped
+
+        Waits for the camera's first frame (up to first_frame_timeout); after
+        that, returns the current frame again if nothing newer arrives in `timeout`.
+        """
+        with self.lock:
+            if self.frame is None:
+                self.fresh.wait_for(lambda: self.frame is not None or not self.ok, self.first_frame_timeout)
+            else:
+                self.fresh.wait_for(lambda: self.seq > after or not self.ok, timeout)
+            if not self.ok or self.frame is None:
+                return self.seq, None
+            return self.seq, self.frame
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(2)
+        self.capture.release()
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+def thumbnail(gray, box, size=16):
+    x, y, w, h = box
+    crop = gray[y:y+h, x:x+w]
+    if crop.size == 0:
+        return None
+    return cv2.resize(crop, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+class Track:
+    """One face followed across frames"""
+
+    def __init__(self, box, now):
+        self.box = box
+        self.template = None        # small gray patch for template matching
+        self.thumb = None           # thumbnail at the last embedding
+        self.name = "Unknown"
+        self.score = -1.0
+        self.frames_since_embed = 0
+        self.first_seen = now
+
+
+class FacePipeline:
+    """Turns frames into [(box, name, score)] while doing as little model work as possible
+
+    detect(img_rgb) -> [(x, y, w, h)]   boxes in the coordinates of the image given
+    embed(faces)    -> (N, D) vectors    for a list of 160x160 RGB faces
+    gallery         -> Gallery           used for matching
+    """
+
+    def __init__(self, detect, embed, gallery, detect_every=5, scale=0.5,
+                 change_threshold=12.0, max_embed_age=15, min_track_score=0.5):
+        self.detect = detect
+        self.embed = embed
+        self.gallery = gallery
+        self.detect_every = detect_every
+        self.scale = scale
+        self.change_threshold = change_threshold   # mean abs gray change that forces re-embedding
+        self.max_embed_age = max_embed_age
+        self.min_track_score = min_track_score
+        self.tracks = []
+        self.frame_index = 0
+        self.stats = {"detections": 0, "embeddings": 0, "frames": 0}
+
+    def reset(self):
+        self.tracks = []
+        self.frame_index = 0
+
+    def process(self, img_rgb):
+        now = time.monotonic()
+        small = cv2.resize(img_rgb, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA) \
+            if self.scale != 1.0 else img_rgb
+        small_gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+        lost = self._track(small_gray)
+        if lost or not self.tracks or self.frame_index % self.detect_every == 0:
+            self._detect(small, now)
+        self.frame_index += 1
+        self.stats["frames"] += 1
+
+        self._embed_changed(img_rgb, small_gray)
+        for track in self.tracks:
+            track.template = self._patch(small_gray, track.box)
+        return [(self._full_box(t.box, img_rgb.shape), t.name, t.score) for t in self.tracks]
+
+    # -------------------- stages --------------------
+
+    def _detect(self, small, now):
+        self.stats["detections"] += 1
+        boxes = [tuple(int(v) for v in b) for b in self.detect(small)]
+        tracks = []
+        for box in boxes:
+            best = max(self.tracks, key=lambda t: iou(t.box, box), default=None)
+            if best is not None and iou(best.box, box) > 0.3 and best not in tracks:
+                best.box = box
+                tracks.append(best)
+            else:
+                tracks.append(Track(box, now))
+        self.tracks = tracks
+
+    def _track(self, small_gray):
+        """Move every track by template matching near its last box; True if one was lost"""
+        lost = False
+        kept = []
+        H, W = small_gray.shape
+        for track in self.tracks:
+            if track.template is None:
+                kept.append(track)
+                continue
+            x, y, w, h = track.box
+            mx, my = w // 2, h // 2
+            x0, y0 = max(0, x - mx), max(0, y - my)
+            x1, y1 = min(W, x + w + mx), min(H, y + h + my)
+            window = small_gray[y0:y1, x0:x1]
+            th, tw = track.template.shape
+            if window.shape[0] < th or window.shape[1] < tw:
+                lost = True
+                continue
+            result = cv2.matchTemplate(window, track.template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, loc = cv2.minMaxLoc(result)
+            if score < self.min_track_score:
+                lost = True
+                continue
+            track.box = (x0 + loc[0], y0 + loc[1], tw, th)
+            kept.append(track)
+        self.tracks = kept
+        return lost
+
+    def _embed_changed(self, img_rgb, small_gray):
+        """Embed (in one batch) only the tracks that are new or changed noticeably"""
+        pending, faces = [], []
+        for track in self.tracks:
+            track.frames_since_embed += 1
+            thumb = thumbnail(small_gray, track.box)
+            if thumb is None:
+                continue
+            changed = track.thumb is None or np.abs(thumb - track.thumb).mean() > self.change_threshold
+            if changed or track.frames_since_embed > self.max_embed_age:
+                x, y, w, h = self._full_box(track.box, img_rgb.shape)
+                crop = img_rgb[y:y+h, x:x+w]
+                if crop.size == 0:
+                    continue
+                pending.append((track, thumb))
+                faces.append(cv2.resize(crop, (160, 160)))
+        if not faces:
+            return
+        self.stats["embeddings"] += len(faces)
+        for (track, thumb), (name, score) in zip(pending, self.gallery.match_batch(self.embed(faces))):
+            track.name, track.score = name, score
+            track.thumb = thumb
+            track.frames_since_embed = 0
+
+    # -------------------- helpers --------------------
+
+    def _patch(self, gray, box):
+        x, y, w, h = box
+        patch = gray[y:y+h, x:x+w]
+        return patch.copy() if patch.size else None
+
+    def _full_box(self, box, shape):
+        x, y, w, h = (int(round(v / self.scale)) for v in box)
+        x, y = max(0, x), max(0, y)
+        return (x, y, min(w, shape[1] - x), min(h, shape[0] - y))
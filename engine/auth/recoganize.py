@@ -1,73 +1,131 @@
+import os
+import time
+
 import cv2
 import numpy as np
-from keras_facenet import FaceNet
-from mtcnn import MTCNN
-import joblib
-from sklearn.metrics.pairwise import cosine_similarity
 
-embedder = FaceNet()
-detector = MTCNN()
-embeddings = joblib.load("engine/auth/embeddings.pkl")
+from engine.auth.detectors import create_detector
+from engine.auth.embedders import create_embedder
+from engine.auth.embedding_store import EmbeddingStore, import_legacy
+from engine.auth.pipeline import FacePipeline
+from engine.auth.sources import is_headless, iter_frames, open_source
 
-def AuthenticateFace(threshold=0.55):
-    cam = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-    cam.set(3, 640)
-    cam.set(4, 480)
+EMBED_PATH = "engine/auth/embeddings.pkl"  # legacy format, imported into the store once
+MATCH_MODE = os.getenv("SYRA_FACE_MATCH", "centroids")  # or "images" for nearest-neighbour
 
-    print("[INFO] Press ESC to exit")
+embedder = None
+detector = None
+gallery = None
 
-    while True:
-        ret, frame = cam.read()
-        if not ret:
-            break
 
+def load_models():
+    """Load FaceNet, the face detector and the stored embeddings (once per process)"""
+    global embedder, detector, gallery
+    if embedder is None:
+        embedder = create_embedder()
+        detector = create_detector()
+        gallery = load_gallery()
+
+
+def load_gallery():
+    """Memory-map the embedding store (an old embeddings.pkl is migrated into it first)"""
+    store = EmbeddingStore()
+    if not store.exists():
+        if not os.path.exists(EMBED_PATH):
+            raise FileNotFoundError("no face embeddings; run python -m engine.auth.generate_embeddings")
+        print(f"[INFO] Migrating {EMBED_PATH} into {store.root}")
+        store = import_legacy(EMBED_PATH, store.root)
+    gallery = store.gallery(MATCH_MODE)
+    built_with = store.source.get("embedder")
+    if built_with != embedder.id:
+        print(f"[WARN] embeddings were built with {built_with or 'an unknown model'}, live faces use "
+              f"{embedder.id}; run python -m engine.auth.generate_embeddings")
+    return gallery
+
+
+def detect_faces(img_rgb):
+    """Face boxes [(x, y, w, h)] in `img_rgb` coordinates (detector from SYRA_FACE_DETECTOR)"""
+    load_models()
+    return [box for box, _ in detector.detect(img_rgb)]
+
+
+def embed_faces(faces):
+    """FaceNet embeddings for 160x160 RGB faces, in one batch (backend from SYRA_FACE_EMBEDDER)"""
+    load_models()
+    return embedder.embed(faces)
+
+
+def identify(img_rgb):
+    """Detect faces in an RGB frame -> [((x, y, w, h), best_match, best_score)]"""
+    boxes = detect_faces(img_rgb)
+    if not boxes:
+        return []
+    faces = [cv2.resize(img_rgb[y:y+h, x:x+w], (160,160)) for x, y, w, h in boxes]
+
+    # One FaceNet pass and one matmul for every face in the frame
+    matches = gallery.match_batch(embed_faces(faces))
+    return [(box, name, score) for box, (name, score) in zip(boxes, matches)]
+
+
+def make_pipeline(**options):
+    """FacePipeline over the loaded models (detection every few downscaled frames + tracking)"""
+    load_models()
+    return FacePipeline(detect_faces, embed_faces, gallery, **options)
+
+
+def draw_match(frame, box, name, score, threshold):
+    """Draw a labelled box; returns True if the face is accepted"""
+    x, y, w, h = box
+    color = (0,0,255)
+    if score >= threshold:
+        color = (0,255,0)
+        label = f"{name} ({score:.2f})"
+    else:
+        label = f"Unknown ({score:.2f})"
+
+    cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
+    cv2.putText(frame, label, (x, y-10),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+    return score >= threshold
+
+
+def AuthenticateFace(threshold=0.55, source=None, headless=None):
+    """(1, name) once a known face is matched, else 0 (ESC or end of the source)
+
+    `source` is a frame source or spec (see sources.open_source; default camera 0).
+    """
+    pipeline = make_pipeline()
+    source = source if hasattr(source, "read") else open_source(source)
+    headless = is_headless() if headless is None else headless
+
+    if not headless:
+        print("[INFO] Press ESC to exit")
+
+    result = 0
+    first_face = None
+    frames = iter_frames(source)
+    for frame in frames:
         img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = detector.detect_faces(img_rgb)
-
-        for r in results:
-            x, y, w, h = r['box']
-            x, y = abs(x), abs(y)
-            face = img_rgb[y:y+h, x:x+w]
-            face = cv2.resize(face, (160,160))
-            embedding = embedder.embeddings([face])[0]
-
-            best_match = "Unknown"
-            best_score = -1
-
-            for name, stored_embed in embeddings.items():
-                score = cosine_similarity(
-                    [embedding], [stored_embed]
-                )[0][0]
-                if score > best_score:
-                    best_score = score
-                    best_match = name
-
-            color = (0,0,255)
-            if best_score >= threshold:
-                color = (0,255,0)
-                label = f"{best_match} ({best_score:.2f})"
-                flag = 1
-            else:
-                label = f"Unknown ({best_score:.2f})"
-                flag = 0
-
-            cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
-            cv2.putText(frame, label, (x, y-10),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-
-            if flag == 1:
-                print(f"Authenticated: {best_match}")
-                cam.release()
-                cv2.destroyAllWindows()
-                return (1, best_match)
-
-        cv2.imshow("Face Recognition", frame)
-        if cv2.waitKey(10) & 0xFF == 27:
+
+        matches = pipeline.process(img_rgb)
+        if matches and first_face is None:
+            first_face = time.monotonic()
+        accepted = [m for m in matches if draw_match(frame, *m, threshold)]
+        if accepted:
+            best_match = accepted[0][1]
+            print(f"Authenticated: {best_match} ({(time.monotonic() - first_face) * 1000:.0f} ms after the face appeared)")
+            result = (1, best_match)
             break
 
-    cam.release()
-    cv2.destroyAllWindows()
-    return 0
+        if not headless:
+            cv2.imshow("Face Recognition", frame)
+            if cv2.waitKey(1) & 0xFF == 27:
+                break
+
+    frames.close()
+    if not headless:
+        cv2.destroyAllWindows()
+    return result
 
 if __name__ == "__main__":
     AuthenticateFace()
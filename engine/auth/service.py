@@ -0,0 +1,180 @@
+# service.py - Face authentication in a short-lived worker process
+#
+# The assistant process only owns the camera and the preview window. TensorFlow,
+# FaceNet, the face detector and the embeddings live in a worker process that reads frames
+# from shared memory and exits once authentication is over, returning its
+# memory to the OS.
+
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+FRAME_SHAPE = (480, 640, 3)
+
+
+def _worker_main(conn, shm_name, shape):
+    """Worker process: load models, then match frames until told to stop"""
+    from engine.auth import recoganize
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    try:
+        pipeline = recoganize.make_pipeline()
+        conn.send(("ready",))
+        while True:
+            message = conn.recv()
+            if message[0] == "stop":
+                break
+            seq = message[1]
+            try:
+                matches = pipeline.process(frame.copy())
+                conn.send(("result", seq, matches))
+            except Exception as e:
+                conn.send(("error", seq, str(e)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del frame
+        shm.close()
+
+
+class FaceAuthService:
+    """Starts the face-matching worker on demand (or early, via prewarm)"""
+
+    def __init__(self, shape=FRAME_SHAPE):
+        self.shape = shape
+        self.context = multiprocessing.get_context("spawn")
+        self.process = None
+        self.conn = None
+        self.shm = None
+        self.ready = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Spawn the worker; model loading overlaps whatever the caller does next"""
+        with self.lock:
+            if self.process and self.process.is_alive():
+                return
+            size = int(np.prod(self.shape))
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.conn, child = self.context.Pipe()
+            self.process = self.context.Process(
+                target=_worker_main, args=(child, self.shm.name, self.shape), daemon=True
+            )
+            self.process.start()
+            child.close()
+            self.ready = False
+
+    def prewarm(self):
+        """Start loading models now (e.g. while the UI loader animation plays)"""
+        self.start()
+
+    def wait_ready(self, timeout=120):
+        if self.ready:
+            return True
+        try:
+            if not self.conn.poll(timeout):
+                return False
+            message = self.conn.recv()
+        except (EOFError, OSError):
+            return False  # worker died while loading
+        self.ready = message[0] == "ready"
+        return self.ready
+
+    def stop(self):
+        """Stop the worker and free the shared frame buffer"""
+        with self.lock:
+            if self.process is None:
+                return
+            try:
+                self.conn.send(("stop",))
+            except (OSError, BrokenPipeError):
+                pass
+            self.process.join(5)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(1)
+            self.conn.close()
+            self.shm.close()
+            self.shm.unlink()
+            self.process = self.conn = self.shm = None
+            self.ready = False
+
+    def authenticate(self, threshold=0.55, timeout=60, source=None, headless=None):
+        """Same contract as recoganize.AuthenticateFace: (1, name) or 0"""
+        import cv2
+        from engine.auth.recoganize import draw_match
+        from engine.auth.sources import is_headless, iter_frames, open_source
+
+        self.start()
+        frame_buf = np.ndarray(self.shape, dtype=np.uint8, buffer=self.shm.buf)
+        source = source if hasattr(source, "read") else open_source(source)
+        headless = is_headless() if headless is None else headless
+        # Recorded sources wait for the worker on every frame instead of dropping frames
+        blocking = not source.live
+        frames = iter_frames(source)
+
+        if not headless:
+            print("[INFO] Press ESC to exit")
+        seq = 0
+        pending = False       # a frame is with the worker
+        last_matches = []
+        result = 0
+        started = time.monotonic()
+
+        try:
+            for frame in frames:
+                if not blocking and time.monotonic() - started > timeout:
+                    break   # recorded sources end on their own
+                if frame.shape != self.shape:
+                    frame = cv2.resize(frame, (self.shape[1], self.shape[0]))
+
+                if not self.ready and not self.wait_ready(timeout=120 if blocking else 0) and blocking:
+                    break
+
+                # Hand the newest frame over once the worker is free
+                if self.ready and not pending:
+                    seq += 1
+                    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame_buf)
+                    self.conn.send(("frame", seq))
+                    pending = True
+
+                if pending and self.conn.poll(timeout if blocking else 0):
+                    message = self.conn.recv()
+                    pending = False
+                    if message[0] == "result":
+                        last_matches = message[2]
+                    else:
+                        print(f"[WARN] Face worker error: {message[2]}")
+
+                accepted = None
+                for box, name, score in last_matches:
+                    if draw_match(frame, box, name, score, threshold) and accepted is None:
+                        accepted = name
+                if accepted:
+                    print(f"Authenticated: {accepted}")
+                    result = (1, accepted)
+                    break
+
+                if not headless:
+                    cv2.imshow("Face Recognition", frame)
+                    if cv2.waitKey(1) & 0xFF == 27:
+                        break
+
+                if not self.process.is_alive():
+                    print("[WARN] Face worker exited unexpectedly")
+                    break
+        finally:
+            frames.close()
+            if not headless:
+                cv2.destroyAllWindows()
+            del frame_buf
+            self.stop()
+
+        return result
+
+
+face_auth = FaceAuthService()
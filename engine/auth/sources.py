@@ -0,0 +1,114 @@
+# sources.py - Where authentication frames come from: camera, video file or image folder
+#
+# SYRA_FACE_SOURCE selects it ("0" / "camera:1" / path to a video / path to a folder),
+# and SYRA_HEADLESS=1 (or no display on Linux) skips the preview window.
+
+import glob
+import os
+import sys
+
+import cv2
+
+from engine.auth.pipeline import FrameGrabber
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+class CameraSource:
+    """Webcam via cv2.VideoCapture (DirectShow on Windows, as before)"""
+
+    live = True
+
+    def __init__(self, index=0, width=640, height=480):
+        backend = cv2.CAP_DSHOW if sys.platform == "win32" else cv2.CAP_ANY
+        self.capture = cv2.VideoCapture(index, backend)
+        self.capture.set(3, width)
+        self.capture.set(4, height)
+
+    def read(self):
+        return self.capture.read()
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource(CameraSource):
+    """Recorded video, read frame by frame (nothing is dropped)"""
+
+    live = False
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.capture = cv2.VideoCapture(path)
+
+
+class ImageFolderSource:
+    """Every image in a folder (sorted), as consecutive frames"""
+
+    live = False
+
+    def __init__(self, path):
+        self.paths = sorted(p for p in glob.glob(os.path.join(path, "*")) if p.lower().endswith(IMAGE_EXTS))
+        if not self.paths:
+            raise FileNotFoundError(f"no images in {path}")
+        self.index = 0
+
+    def read(self):
+        while self.index < len(self.paths):
+            frame = cv2.imread(self.paths[self.index])
+            self.index += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def release(self):
+        self.index = len(self.paths)
+
+
+def open_source(spec=None):
+    """Frame source from a spec: camera index, "camera:N", a video file or an image folder"""
+    spec = str(spec if spec is not None else os.getenv("SYRA_FACE_SOURCE", "0")).strip()
+    if spec.startswith("camera:"):
+        spec = spec.split(":", 1)[1]
+    if spec.isdigit():
+        return CameraSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageFolderSource(spec)
+    return VideoFileSource(spec)
+
+
+def is_headless():
+    """True if no preview window should be shown"""
+    if os.getenv("SYRA_HEADLESS", "").lower() in ("1", "true", "yes"):
+        return True
+    return sys.platform.startswith("linux") and not (os.getenv("DISPLAY") or os.getenv("WAYLAND_DISPLAY"))
+
+
+def iter_frames(source):
+    """Yield frames; live sources go through a FrameGrabber so only the newest frame is used"""
+    if not source.live:
+        yield from _read_all(source)
+        return
+
+    grabber = FrameGrabber(source).start()
+    seq = 0
+    try:
+        while True:
+            seq, frame = grabber.read(after=seq)
+            if frame is None:
+                return
+            yield frame.copy()
+    finally:
+        grabber.stop()
+
+
+def _read_all(source):
+    try:
+        while True:
+            ok, frame = source.read()
+            if not ok:
+                return
+            yield frame
+    finally:
+        source.release()
@@ -1,54 +1,133 @@
 import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 import numpy as np
-from tensorflow.keras.utils import to_categorical
+import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Conv2D, MaxPooling2D, Flatten, Dense, Dropout
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
+from tensorflow.keras.layers import RandomFlip, RandomRotation, RandomTranslation, RandomZoom
 from sklearn.preprocessing import LabelEncoder
-from tensorflow.keras.models import load_model
 import joblib
 
 DATASET_DIR = "datasets"
+CACHE_DIR = ".trainer_cache"   # resized images as raw RGB bytes, one file per source image hash
+HASH_INDEX = os.path.join(CACHE_DIR, "hashes.json")   # path -> {size, mtime, sha1}
 MODEL_PATH = "face_recognition_model.h5"
 ENCODER_PATH = "label_encoder.pkl"
 
-def load_dataset(img_size=(128, 128)):
-    X, y = [], []
-    for person in os.listdir(DATASET_DIR):
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_hash_index():
+    try:
+        with open(HASH_INDEX, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_hash_index(index):
+    tmp = HASH_INDEX + f".{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp, HASH_INDEX)
+
+def cached_hash(path, known):
+    """SHA-1 of `path`, reused from `known` while its size and mtime are unchanged -> (sha1, record)"""
+    st = os.stat(path)
+    old = known.get(path)
+    if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime:
+        return old["sha1"], old
+    sha1 = file_hash(path)
+    return sha1, {"size": st.st_size, "mtime": st.st_mtime, "sha1": sha1}
+
+def list_images():
+    """[(image path, person)] for every file under DATASET_DIR/<person>/"""
+    items = []
+    for person in sorted(os.listdir(DATASET_DIR)):
         person_dir = os.path.join(DATASET_DIR, person)
         if not os.path.isdir(person_dir):
             continue
-        for img_name in os.listdir(person_dir):
-            img_path = os.path.join(person_dir, img_name)
-            img = cv2.imread(img_path)
-            if img is None:
-                continue
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            img = cv2.resize(img, img_size)
-            X.append(img)
-            y.append(person)
-    return np.array(X), np.array(y)
+        for img_name in sorted(os.listdir(person_dir)):
+            items.append((os.path.join(person_dir, img_name), person))
+    return items
 
-def train_model():
-    print("[INFO] Loading dataset...")
-    X, y = load_dataset()
-    print(f"[INFO] Loaded {len(X)} images from {len(set(y))} classes")
+def preprocess(img_path, img_size, sha1):
+    """Decode + resize one image into the cache -> cache path (None if unreadable)
+
+    The cache key is the file's content hash plus the size, so renamed files are
+    still hits and edited files are redone.
+    """
+    cache_path = os.path.join(CACHE_DIR, f"{sha1}_{img_size[0]}x{img_size[1]}.rgb")
+    if os.path.exists(cache_path):
+        return cache_path
+    img = cv2.imread(img_path)
+    if img is None:
+        return None
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    img = cv2.resize(img, img_size)
+    tmp = cache_path + f".{os.getpid()}.tmp"
+    img.tofile(tmp)
+    os.replace(tmp, cache_path)
+    return cache_path
+
+def load_dataset(img_size=(128, 128), batch_size=16, workers=None):
+    """Streaming tf.data pipeline over the preprocessed cache -> (dataset, label encoder, count)
+
+    Only images missing from the cache are decoded (in parallel, cv2 releases
+    the GIL), and files whose size and mtime are unchanged are not re-hashed,
+    so a repeat run skips straight to training. Batches are read from the
+    cache on demand, so memory does not grow with the dataset.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    items = list_images()
+    known = load_hash_index()
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        hashes = list(pool.map(lambda item: cached_hash(item[0], known), items))
+        cached = list(pool.map(lambda item, h: preprocess(item[0], img_size, h[0]), items, hashes))
+    save_hash_index({path: record for (path, _), (_, record) in zip(items, hashes)})
+    paths = [c for c in cached if c]
+    people = [person for (_, person), c in zip(items, cached) if c]
+    if not paths:
+        raise ValueError(f"no readable images in {DATASET_DIR}/<person>/ - capture some faces first")
 
     le = LabelEncoder()
-    y_encoded = le.fit_transform(y)
-    y_cat = to_categorical(y_encoded)
+    labels = le.fit_transform(people).astype(np.int32)
+    classes = len(le.classes_)
+    h, w = img_size[1], img_size[0]
 
-    X = X / 255.0  # normalize
+    def load(path, label):
+        img = tf.io.decode_raw(tf.io.read_file(path), tf.uint8)
+        img = tf.reshape(img, (h, w, 3))
+        return tf.cast(img, tf.float32) / 255.0, tf.one_hot(label, classes)
+
+    augment = Sequential([
+        RandomRotation(10 / 360),
+        RandomZoom(0.1),
+        RandomTranslation(0.1, 0.1),
+        RandomFlip("horizontal"),
+    ])
 
-    datagen = ImageDataGenerator(
-        rotation_range=10,
-        zoom_range=0.1,
-        width_shift_range=0.1,
-        height_shift_range=0.1,
-        horizontal_flip=True
+    dataset = (
+        tf.data.Dataset.from_tensor_slices((paths, labels))
+        .shuffle(len(paths), reshuffle_each_iteration=True)
+        .map(load, num_parallel_calls=tf.data.AUTOTUNE)
+        .batch(batch_size)
+        .map(lambda x, y: (augment(x, training=True), y), num_parallel_calls=tf.data.AUTOTUNE)
+        .prefetch(tf.data.AUTOTUNE)
     )
-    datagen.fit(X)
+    return dataset, le, len(paths)
+
+def train_model():
+    print("[INFO] Loading dataset...")
+    dataset, le, count = load_dataset()
+    print(f"[INFO] Loaded {count} images from {len(le.classes_)} classes")
 
     model = Sequential([
         Conv2D(32, (3,3), activation='relu', input_shape=(128,128,3)),
@@ -60,13 +139,13 @@ def train_model():
         Flatten(),
         Dense(128, activation='relu'),
         Dropout(0.5),
-        Dense(len(set(y)), activation='softmax')
+        Dense(len(le.classes_), activation='softmax')
     ])
 
     model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
 
     print("[INFO] Training model...")
-    model.fit(datagen.flow(X, y_cat, batch_size=16), epochs=10, verbose=1)
+    model.fit(dataset, epochs=10, verbose=1)
 
     model.save(MODEL_PATH)
     joblib.dump(le, ENCODER_PATH)
@@ -0,0 +1,197 @@
+# brightness.py - Brightness service with cached display handles
+
+import glob
+import os
+import sys
+import threading
+import time
+
+
+class BrightnessError(Exception):
+    """Raised when a backend can't read or write brightness"""
+
+
+def _clamp(value):
+    return max(0, min(int(round(value)), 100))
+
+
+# ==================== BACKENDS ====================
+
+class SysfsBackend:
+    """Linux /sys/class/backlight (needs write access, e.g. a udev rule or the video group)"""
+
+    name = "sysfs"
+
+    def __init__(self, device=None):
+        devices = sorted(glob.glob("/sys/class/backlight/*"))
+        if device:
+            devices = [d for d in devices if os.path.basename(d) == device]
+        if not devices:
+            raise BrightnessError("no backlight device in /sys/class/backlight")
+        self.path = devices[0]
+        with open(os.path.join(self.path, "max_brightness")) as f:
+            self.max = int(f.read().strip())
+        self.displays = [os.path.basename(self.path)]
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith("linux") and bool(glob.glob("/sys/class/backlight/*"))
+
+    def get(self, display=0):
+        with open(os.path.join(self.path, "brightness")) as f:
+            return _clamp(int(f.read().strip()) * 100 / self.max)
+
+    def set(self, value, display=0):
+        raw = max(1 if value > 0 else 0, round(_clamp(value) * self.max / 100))
+        try:
+            with open(os.path.join(self.path, "brightness"), "w") as f:
+                f.write(str(raw))
+        except PermissionError:
+            raise BrightnessError(f"no permission to write {self.path}/brightness")
+
+
+class SbcBackend:
+    """screen_brightness_control with the monitor list enumerated once"""
+
+    name = "screen_brightness_control"
+
+    def __init__(self):
+        import screen_brightness_control as sbc
+
+        self.sbc = sbc
+        self.displays = sbc.list_monitors() or []
+        if not self.displays:
+            raise BrightnessError("no monitors found")
+
+    @staticmethod
+    def available():
+        try:
+            import screen_brightness_control  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def get(self, display=0):
+        level = self.sbc.get_brightness(display=self.displays[display])
+        return _clamp(level[0] if isinstance(level, list) else level)
+
+    def set(self, value, display=0):
+        self.sbc.set_brightness(_clamp(value), display=self.displays[display])
+
+
+class FakeBackend:
+    """In-memory displays for tests"""
+
+    name = "fake"
+
+    def __init__(self, levels=(50,)):
+        self.levels = list(levels)
+        self.displays = [f"fake{i}" for i in range(len(self.levels))]
+
+    def get(self, display=0):
+        return self.levels[display]
+
+    def set(self, value, display=0):
+        self.levels[display] = _clamp(value)
+
+
+BACKENDS = {"sysfs": SysfsBackend, "screen_brightness_control": SbcBackend, "fake": FakeBackend}
+
+
+# ==================== SERVICE ====================
+
+class BrightnessService:
+    """Discovers displays once and caches their levels.
+
+    `get` answers from the cache while it is younger than `max_age` seconds
+    (so hotkeys or the OS changing the level are picked up), `set` writes
+    once and updates it, and `ramp` fades to a level on a background thread
+    (a new ramp or set cancels the one in progress).
+    """
+
+    def __init__(self, backend, max_age=2.0):
+        self.backend = backend
+        self.max_age = max_age
+        self.levels = {}          # display -> (level, monotonic time it was read or written)
+        self.lock = threading.Lock()
+        self.ramp_cancel = None
+
+    def _remember(self, display, level):
+        self.levels[display] = (level, time.monotonic())
+
+    def get(self, display=0, refresh=False):
+        with self.lock:
+            cached = self.levels.get(display)
+            if refresh or cached is None or time.monotonic() - cached[1] > self.max_age:
+                self._remember(display, self.backend.get(display))
+            return self.levels[display][0]
+
+    def _cancel_ramp(self):
+        if self.ramp_cancel:
+            self.ramp_cancel.set()
+            self.ramp_cancel = None
+
+    def set(self, value, display=0):
+        self._cancel_ramp()
+        value = _clamp(value)
+        with self.lock:
+            self.backend.set(value, display)
+            self._remember(display, value)
+        return value
+
+    def ramp(self, value, display=0, duration=0.4, steps=10):
+        """Fade to `value` in the background; returns the target level"""
+        self._cancel_ramp()
+        start, target = self.get(display), _clamp(value)
+        cancel = threading.Event()
+        self.ramp_cancel = cancel
+
+        def step(i):
+            level = _clamp(start + (target - start) * i / steps)
+            with self.lock:
+                self.backend.set(level, display)
+                self._remember(display, level)
+
+        step(1)  # first step inline so permission/backend errors reach the caller
+
+        def run():
+            for i in range(2, steps + 1):
+                if cancel.is_set():
+                    return
+                time.sleep(duration / steps)
+                if cancel.is_set():
+                    return
+                try:
+                    step(i)
+                except Exception as e:
+                    print(f"Brightness ramp error: {e}")
+                    return
+
+        threading.Thread(target=run, daemon=True).start()
+        return target
+
+
+def create_service(name=None):
+    """Service over SYRA_BRIGHTNESS_BACKEND, else the first working backend (None if none)"""
+    name = name or os.getenv("SYRA_BRIGHTNESS_BACKEND")
+    if name:
+        return BrightnessService(BACKENDS[name]())
+    for backend in (SysfsBackend, SbcBackend):
+        if backend.available():
+            try:
+                return BrightnessService(backend())
+            except Exception as e:
+                print(f"⚠️ {backend.name} brightness backend unavailable: {e}")
+    return None
+
+
+_service = None
+_service_checked = False
+
+
+def get_brightness_service():
+    global _service, _service_checked
+    if not _service_checked:
+        _service = create_service()
+        _service_checked = True
+    return _service
@@ -0,0 +1,184 @@
+# chat_sessions.py - Warm HugChat sessions reused across chatBot calls
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+# ==================== BACKENDS ====================
+
+class HugChatBackend:
+    """Creates logged-in hugchat.ChatBot instances from the cookie file"""
+
+    def __init__(self, cookie_path=os.path.join("engine", "cookies.json")):
+        self.cookie_path = cookie_path
+
+    def create(self):
+        """Return (bot, conversation_id) for a new session"""
+        from hugchat import hugchat
+
+        bot = hugchat.ChatBot(cookie_path=self.cookie_path)
+        conversation = bot.new_conversation()
+        bot.change_conversation(conversation)
+        return bot, conversation
+
+    def chat(self, bot, conversation, text):
+        return str(bot.chat(text))
+
+    def ping(self, bot, conversation):
+        """Cheap liveness check - True if the login still works and the conversation still exists"""
+        wanted = getattr(conversation, "id", conversation)
+        return any(getattr(c, "id", c) == wanted for c in bot.get_conversation_list())
+
+
+class LocalChatBackend:
+    """In-process stand-in for HugChat, for tests and offline runs.
+
+    Replies echo the prompt and the turn number, so callers can see that
+    context is kept between turns of the same conversation.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.history = {}
+
+    def create(self):
+        self.created += 1
+        conversation = f"local-{self.created}"
+        self.history[conversation] = []
+        return object(), conversation
+
+    def chat(self, bot, conversation, text):
+        turns = self.history[conversation]
+        turns.append(text)
+        return f"[{conversation} turn {len(turns)}] {text}"
+
+    def ping(self, bot, conversation):
+        return conversation in self.history
+
+
+# ==================== POOL ====================
+
+class ChatSession:
+    def __init__(self, bot, conversation):
+        self.bot = bot
+        self.conversation = conversation
+        self.last_used = time.monotonic()
+        self.last_checked = self.last_used
+        self.lock = threading.Lock()
+
+
+class ChatSessionPool:
+    """Bounded LRU pool of warm chat sessions, one conversation per user.
+
+    Sessions idle for longer than `idle_timeout` are dropped (by a janitor
+    thread started with the first session), sessions unused for
+    `health_interval` are pinged before reuse, and a failed chat discards
+    the session and retries once on a fresh one.
+    """
+
+    def __init__(self, backend=None, max_sessions=4, idle_timeout=15 * 60, health_interval=5 * 60,
+                 evict_every=60):
+        self.backend = backend or HugChatBackend()
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.health_interval = health_interval
+        self.evict_every = evict_every
+        self.sessions = OrderedDict()  # user -> ChatSession
+        self.user_locks = {}           # user -> lock held while checking/creating their session
+        self.lock = threading.Lock()
+        self.janitor = None
+        self.stop_event = threading.Event()
+
+    def _healthy(self, session, now):
+        if now - session.last_used > self.idle_timeout:
+            return False
+        if now - session.last_checked > self.health_interval:
+            try:
+                if not self.backend.ping(session.bot, session.conversation):
+                    return False
+            except Exception:
+                return False
+            session.last_checked = now
+        return True
+
+    def evict_idle(self):
+        """Drop every session that has been idle for too long"""
+        now = time.monotonic()
+        with self.lock:
+            for user in [u for u, s in self.sessions.items() if now - s.last_used > self.idle_timeout]:
+                self._drop(user)
+
+    def _drop(self, user):
+        """Forget a user's session and, unless someone is in acquire() for them, their lock
+        (caller holds self.lock)"""
+        self.sessions.pop(user, None)
+        user_lock = self.user_locks.get(user)
+        if user_lock is not None and not user_lock.locked():
+            del self.user_locks[user]
+
+    def _run_janitor(self):
+        while not self.stop_event.wait(self.evict_every):
+            self.evict_idle()
+
+    def _start_janitor(self):
+        with self.lock:
+            if self.janitor is not None and self.janitor.is_alive():
+                return
+            self.stop_event.clear()
+            self.janitor = threading.Thread(target=self._run_janitor, name="chat-session-janitor", daemon=True)
+            self.janitor.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def acquire(self, user="default"):
+        """Return a warm session for the user, creating one if needed
+
+        Concurrent calls for the same user wait for each other, so only one
+        session is created (and logged in) per user.
+        """
+        self._start_janitor()
+        while True:
+            with self.lock:
+                user_lock = self.user_locks.setdefault(user, threading.Lock())
+            with user_lock:
+                with self.lock:
+                    if self.user_locks.get(user) is not user_lock:
+                        continue  # dropped with an evicted session before we got it; use the new one
+                    session = self.sessions.get(user)
+                    if session is not None:
+                        self.sessions.move_to_end(user)
+                if session is not None and self._healthy(session, time.monotonic()):
+                    return session
+
+                bot, conversation = self.backend.create()
+                session = ChatSession(bot, conversation)
+                with self.lock:
+                    self.sessions[user] = session
+                    self.sessions.move_to_end(user)
+                    while len(self.sessions) > self.max_sessions:
+                        self._drop(next(iter(self.sessions)))
+                return session
+
+    def discard(self, user="default"):
+        with self.lock:
+            self._drop(user)
+
+    def chat(self, text, user="default"):
+        """Send one turn on the user's conversation"""
+        for attempt in range(2):
+            session = self.acquire(user)
+            try:
+                with session.lock:
+                    reply = self.backend.chat(session.bot, session.conversation, text)
+                    session.last_used = session.last_checked = time.monotonic()
+                return reply
+            except Exception:
+                self.discard(user)
+                if attempt:
+                    raise
+
+
+chat_pool = ChatSessionPool()
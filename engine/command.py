@@ -57,6 +57,7 @@ def allCommands(message=1):
     """Main command dispatcher - CONTINUOUS LOOP FOR MULTIPLE COMMANDS"""
     try:
         from engine.agent import agent_executor
+        from engine.deadline import Deadline, current_deadline
 
         # INFINITE LOOP: Keep listening and processing commands
         while True:
@@ -75,11 +76,19 @@ def allCommands(message=1):
                 if agent_executor and query:
                     print(f"Processing: {query}")
                     # Invoke agent with proper state
-                    result = agent_executor.invoke({
-                        "input": query,
-                        "output": "",
-                        "tool_results": {}
-                    })
+                    # Fresh latency budget for this command; tools inherit it
+                    deadline = Deadline()
+                    token = current_deadline.set(deadline)
+                    try:
+                        result = agent_executor.invoke({
+                            "input": query,
+                            "output": "",
+                            "tool_results": {},
+                            "deadline": deadline
+                        })
+                    finally:
+                        current_deadline.reset(token)
+                    print(f"Command took {deadline.elapsed():.1f}s")
                     print(f"Agent Result: {result}")
 
                     # Check if result is valid
@@ -0,0 +1,168 @@
+# deadline.py - Per-command latency budget, jittered retries and circuit breakers
+
+import contextvars
+import random
+import threading
+import time
+
+
+# Overall budget for answering one voice command (seconds)
+COMMAND_BUDGET = 20.0
+
+# The deadline of the command being processed; tool threads inherit it
+current_deadline = contextvars.ContextVar("current_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage has no budget left to run"""
+
+
+class CircuitOpen(Exception):
+    """Raised when a service's circuit breaker is refusing calls"""
+
+
+# ==================== DEADLINE ====================
+
+class Deadline:
+    """Absolute point in time by which a command must be answered"""
+
+    def __init__(self, budget=COMMAND_BUDGET):
+        self.budget = budget
+        self.started = time.monotonic()
+        self.expires = self.started + budget
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def allows(self, seconds):
+        """True if at least `seconds` of budget are left"""
+        return self.remaining() >= seconds
+
+    def cap(self, timeout):
+        """`timeout` shortened to the remaining budget"""
+        return min(timeout, self.remaining()) if timeout is not None else self.remaining()
+
+    def __repr__(self):
+        return f"Deadline({self.remaining():.1f}s of {self.budget:.0f}s left)"
+
+
+def cap_timeout(timeout):
+    """Shorten `timeout` to the current command's remaining budget, if there is one"""
+    deadline = current_deadline.get()
+    return deadline.cap(timeout) if deadline else timeout
+
+
+# ==================== CIRCUIT BREAKER ====================
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and rejects calls
+    for `reset_timeout` seconds, then lets one trial call through (half-open).
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+                print(f"⚡ Circuit for {self.name} opened after {self.failures} failures")
+
+    def release(self):
+        """The call ended without telling us anything about the service's health"""
+        with self.lock:
+            self.trial_running = False
+
+    def call(self, func, *args, trips=None, **kwargs):
+        """Run `func` through the breaker; `trips(error)` decides which errors count as failures"""
+        if not self.allow():
+            raise CircuitOpen(f"{self.name} is temporarily unavailable")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if trips is None or trips(e):
+                self.failure()
+            else:
+                self.release()
+            raise
+        self.success()
+        return result
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(name):
+    """Shared circuit breaker for an external service"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+# ==================== RETRY ====================
+
+def retry(func, service=None, deadline=None, attempts=3, base_delay=0.3, max_delay=3.0,
+          retry_on=(Exception,)):
+    """Call `func()` with full-jitter exponential backoff.
+
+    Goes through the service's circuit breaker if `service` is given and
+    never sleeps past the deadline. CircuitOpen/DeadlineExceeded are not
+    retried.
+    """
+    deadline = deadline or current_deadline.get()
+    guard = breaker(service) if service else None
+
+    for attempt in range(attempts):
+        if deadline and deadline.expired():
+            raise DeadlineExceeded(f"no time left for {service or 'call'}")
+        try:
+            return guard.call(func) if guard else func()
+        except (CircuitOpen, DeadlineExceeded):
+            raise
+        except retry_on:
+            if attempt == attempts - 1:
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            if deadline and not deadline.allows(delay):
+                raise
+            time.sleep(delay)
@@ -0,0 +1,180 @@
+# disk_usage.py - Parallel, cached "what's taking up space" scanner
+
+import heapq
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DirEntry:
+    """Cached totals for the files directly inside one directory"""
+
+    __slots__ = ("mtime", "size", "files", "largest", "subdirs")
+
+    def __init__(self, mtime, size, files, largest, subdirs):
+        self.mtime = mtime
+        self.size = size          # bytes of direct files only
+        self.files = files
+        self.largest = largest    # [(size, path)] biggest direct files
+        self.subdirs = subdirs    # [path]
+
+
+class DiskAnalyzer:
+    """Walks a tree with os.scandir on a thread pool.
+
+    Per-directory results are cached by the directory's mtime, so a warm
+    re-scan only lists directories whose entries changed (one stat for the
+    rest). While scanning, `on_progress` gets partial results periodically.
+    Note: a file growing in place does not change its directory's mtime.
+    """
+
+    def __init__(self, workers=None, keep_files=20):
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self.keep_files = keep_files
+        self.cache = {}          # path -> DirEntry
+        self.lock = threading.Lock()
+
+    def _scan_dir(self, path):
+        """List one directory (or reuse the cache) -> DirEntry"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        with self.lock:
+            cached = self.cache.get(path)
+        if cached and cached.mtime == mtime:
+            return cached
+
+        size = files = 0
+        largest = []
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            file_size = entry.stat(follow_symlinks=False).st_size
+                            size += file_size
+                            files += 1
+                            if len(largest) < self.keep_files:
+                                heapq.heappush(largest, (file_size, entry.path))
+                            elif file_size > largest[0][0]:
+                                heapq.heapreplace(largest, (file_size, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        result = DirEntry(mtime, size, files, largest, subdirs)
+        with self.lock:
+            self.cache[path] = result
+        return result
+
+    def scan(self, root, count=10, on_progress=None, progress_every=0.5):
+        """Scan `root`; returns dict with total, largest folders and largest files
+
+        Finished directories arrive on a completion queue (no re-polling of
+        every outstanding future), and the totals, per-folder sizes and the
+        top-`count` files are kept up to date as they arrive, so a progress
+        report costs O(top-level folders) rather than a pass over the tree.
+        """
+        root = os.path.abspath(os.path.expanduser(root))
+        tally = _Tally(root, count)
+        started = time.monotonic()
+        next_progress = started + progress_every
+        done = queue.SimpleQueue()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            def submit(path, folder):
+                future = pool.submit(self._scan_dir, path)
+                future.add_done_callback(lambda f: done.put((path, folder, f)))
+
+            submit(root, None)
+            outstanding = 1
+            while outstanding:
+                try:
+                    path, folder, future = done.get(timeout=max(0.0, next_progress - time.monotonic()))
+                except queue.Empty:
+                    path = None
+                if path is not None:
+                    outstanding -= 1
+                    entry = future.result()
+                    if entry is not None:
+                        tally.add(path, folder, entry)
+                        for sub in entry.subdirs:
+                            submit(sub, folder or sub)   # sizes roll up to the top-level folder
+                            outstanding += 1
+
+                if time.monotonic() >= next_progress:
+                    next_progress = time.monotonic() + progress_every
+                    if on_progress:
+                        on_progress(tally.report(partial=True))
+
+        # Drop cache entries for directories that vanished under root
+        with self.lock:
+            prefix = root.rstrip(os.sep) + os.sep
+            for path in [p for p in self.cache if p.startswith(prefix) and p not in tally.seen]:
+                del self.cache[path]
+
+        report = tally.report(partial=False)
+        report["seconds"] = time.monotonic() - started
+        return report
+
+
+class _Tally:
+    """Running totals of one scan"""
+
+    def __init__(self, root, count):
+        self.root = root
+        self.count = count
+        self.seen = set()
+        self.total = 0
+        self.files = 0
+        self.folders = {}     # top-level folder -> recursive size
+        self.largest = []     # min-heap of the `count` biggest files
+
+    def add(self, path, folder, entry):
+        self.seen.add(path)
+        self.total += entry.size
+        self.files += entry.files
+        if folder is not None:
+            self.folders[folder] = self.folders.get(folder, 0) + entry.size
+        for item in entry.largest:
+            if len(self.largest) < self.count:
+                heapq.heappush(self.largest, item)
+            elif item > self.largest[0]:
+                heapq.heapreplace(self.largest, item)
+
+    def report(self, partial):
+        folders = heapq.nlargest(self.count, self.folders.items(), key=lambda item: item[1])
+        return {
+            "root": self.root,
+            "partial": partial,
+            "total": self.total,
+            "files_scanned": self.files,
+            "dirs_scanned": len(self.seen),
+            "folders": folders,
+            "files": [(p, s) for s, p in sorted(self.largest, reverse=True)],
+        }
+
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
+
+
+_analyzer = None
+
+
+def get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = DiskAnalyzer()
+    return _analyzer
@@ -0,0 +1,206 @@
+# executor.py - Run agent tools on a worker thread pool with hard per-tool deadlines
+
+import contextvars
+import json
+import queue
+import threading
+
+from engine.deadline import cap_timeout, current_deadline
+
+
+# Per-tool deadline (seconds); every tool runs on the thread pool
+DEFAULT_LIMIT = 20
+
+TOOL_LIMITS = {
+    "search": 10,
+    "search_wikipedia": 8,
+    "search_google": 8,
+    "search_youtube": 8,
+    "play_youtube": 15,
+    "get_weather": 10,
+    "get_stock_price": 10,
+    "get_stock_quotes": 15,
+    "send_sms": 20,
+    "make_call": 10,
+    "chat_with_ai": 30,
+    "query_gemini": 30,
+    "send_email": 30,
+    "look_at_screen": 30,
+    "create_file": 120,
+    "analyze_disk_usage": 60,
+}
+
+
+# Long jobs the user asked for explicitly: the command still only waits for its
+# budget, then answers "still working" while the job finishes in the background
+# (without the command deadline, so its own LLM/IO calls are not cut short)
+BACKGROUND_TOOLS = {"create_file", "analyze_disk_usage"}
+
+
+def timeout_result(tool_name, seconds):
+    """Structured result handed to the agent when a tool misses its deadline"""
+    return json.dumps({
+        "status": "timeout",
+        "tool": tool_name,
+        "seconds": round(seconds, 1),
+        "message": f"{tool_name} did not finish within {seconds:g}s and was cancelled",
+    })
+
+
+def background_result(tool_name, seconds):
+    """Result handed to the agent when a background tool is still running at its deadline"""
+    return json.dumps({
+        "status": "running",
+        "tool": tool_name,
+        "seconds": round(seconds, 1),
+        "message": f"{tool_name} is still working and will finish in the background",
+    })
+
+
+def announce(tool_name, result, error):
+    """Default report for a background job that finished after its command was answered"""
+    message = f"{tool_name} failed: {error}" if error else str(result)
+    print(f"✓ Background {tool_name} finished: {message[:200]}")
+    try:
+        import eel
+        eel.DisplayMessage(message)
+    except Exception:
+        pass
+
+
+# ==================== THREAD POOL ====================
+
+class Job:
+    def __init__(self, func, args, context=None):
+        self.func = func
+        self.args = args
+        # carries the command deadline into the worker
+        self.context = context or contextvars.copy_context()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.started = False
+        self.abandoned = False   # timed out: not to be run (or reported) any more
+        self.detached = False    # timed out but left to finish; on_done reports it
+        self.replaced = False    # its worker was written off and replaced
+        self.on_done = None
+
+
+class ThreadWorkerPool:
+    """Fixed number of healthy worker threads.
+
+    Threads can't be killed, so when a job misses its deadline its worker is
+    written off and a replacement is started; the stuck thread exits on its
+    own whenever the call finally returns. A job run with `on_done` is
+    detached instead of abandoned: it still runs (even if it was queued) and
+    on_done(result, error) is called when it finishes.
+    """
+
+    def __init__(self, size=4):
+        self.size = size
+        self.jobs = queue.Queue()
+        self.lock = threading.Lock()
+        self.healthy = 0
+        self.stuck = 0
+        for _ in range(size):
+            self._spawn()
+
+    def _spawn(self):
+        with self.lock:
+            self.healthy += 1
+        threading.Thread(target=self._work, daemon=True).start()
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            with self.lock:
+                if job.abandoned:
+                    continue  # timed out while queued - never run it late
+                job.started = True
+            try:
+                job.result = job.context.run(job.func, **job.args)
+            except Exception as e:
+                job.error = e
+            with self.lock:
+                job.done.set()
+                replaced, detached = job.replaced, job.detached
+                if replaced:
+                    self.stuck -= 1
+            if detached:
+                try:
+                    job.on_done(job.result, job.error)
+                except Exception as e:
+                    print(f"Background job report failed: {e}")
+            if replaced:
+                return  # a replacement already took this worker's place
+
+    def run(self, func, args, timeout, context=None, on_done=None):
+        """Result of func(**args); TimeoutError if it takes longer than `timeout`"""
+        job = Job(func, args, context)
+        job.on_done = on_done
+        self.jobs.put(job)
+        if job.done.wait(timeout):
+            if job.error:
+                raise job.error
+            return job.result
+
+        with self.lock:
+            if job.done.is_set():
+                timed_out = False
+            else:
+                timed_out = True
+                if on_done:
+                    job.detached = True
+                else:
+                    job.abandoned = True
+                if job.started:
+                    job.replaced = True
+                    self.healthy -= 1
+                    self.stuck += 1
+        if not timed_out:   # finished just as the wait ran out
+            if job.error:
+                raise job.error
+            return job.result
+        if job.replaced:
+            self._spawn()  # replace the worker stuck on this job
+        raise TimeoutError
+
+
+# ==================== EXECUTOR ====================
+
+class ToolExecutor:
+    """Runs each tool call under its policy and never blocks past the deadline"""
+
+    def __init__(self, threads=4, limits=None, background=BACKGROUND_TOOLS, on_background_done=announce):
+        self.threads = ThreadWorkerPool(threads)
+        self.limits = dict(TOOL_LIMITS, **(limits or {}))
+        self.background = set(background)
+        self.on_background_done = on_background_done
+
+    def limit_for(self, tool_name, timeout=None):
+        """The tool's own limit, shortened to `timeout` and the command's remaining budget"""
+        limit = self.limits.get(tool_name, DEFAULT_LIMIT)
+        if timeout is not None:
+            limit = min(limit, timeout)
+        return cap_timeout(limit)
+
+    def run(self, tool, args, timeout=None):
+        """Run `tool` (a LangChain tool) with `args`; returns its result, or a timeout
+        ("running" for background tools) result once its limit is used up"""
+        limit = self.limit_for(tool.name, timeout)
+        context = on_done = None
+        if tool.name in self.background:
+            context = contextvars.copy_context()
+            context.run(current_deadline.set, None)
+            on_done = lambda result, error: self.on_background_done(tool.name, result, error)
+        try:
+            return self.threads.run(tool.func, args, limit, context, on_done)
+        except TimeoutError:
+            if on_done:
+                print(f"⏳ Tool {tool.name} continues in the background after {limit:.1f}s")
+                return background_result(tool.name, limit)
+            print(f"⏱️ Tool {tool.name} timed out after {limit:.1f}s")
+            return timeout_result(tool.name, limit)
+
+
+tool_executor = ToolExecutor()
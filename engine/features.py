@@ -3,33 +3,35 @@ import re
 import sqlite3
 import time
 import json
-from playsound import playsound
 import eel
-import pyaudio
-import pyautogui
-import pywhatkit as kit
-import pvporcupine
-import requests
-from pipes import quote
-import markdown2
-from bs4 import BeautifulSoup
 from engine.command import speak, takecommand
 from engine.config import ASSISTANT_NAME, OPENWEATHERMAP_API_KEY
 from engine.helper import extract_yt_term, markdown_to_text, remove_words
-from hugchat import hugchat
-from langchain_google_genai import ChatGoogleGenerativeAI
+from engine.launcher import app_index, launch
+from engine.chat_sessions import chat_pool
+from engine.lazy import lazy_import
 from langchain_core.messages import SystemMessage, HumanMessage
 import struct
 from rapidfuzz import process, fuzz
 
+# Heavy/optional dependencies load on first use of the feature that needs them
+kit = lazy_import("pywhatkit")
+pvporcupine = lazy_import("pvporcupine")
+pyaudio = lazy_import("pyaudio")
+playsound_module = lazy_import("playsound")
+genai = lazy_import("langchain_google_genai")
+
 con = sqlite3.connect("jarvis.db")
 cursor = con.cursor()
 
+# Build the application index in the background so openCommand resolves instantly
+app_index.start()
+
 @eel.expose
 def playAssistantSound():
     """Play assistant sound"""
     music_dir = r"www\assets\audio\start_sound.mp3"
-    playsound(music_dir)
+    playsound_module.playsound(music_dir)
 
 
 def openCommand(query):
@@ -39,26 +41,19 @@ def openCommand(query):
     
     if query:
         try:
-            cursor.execute('SELECT path FROM sys_command WHERE name IN (?)', (query,))
-            results = cursor.fetchall()
+            entry = app_index.resolve(query)
             
-            if results:
+            if entry:
+                speak(f"Opening {entry['name']}")
+                launch(entry)
+            elif os.name == "nt":
                 speak(f"Opening {query}")
-                os.startfile(results[0][0])
+                try:
+                    os.startfile(query)
+                except OSError:
+                    speak("not found")
             else:
-                cursor.execute('SELECT url FROM web_command WHERE name IN (?)', (query,))
-                results = cursor.fetchall()
-                
-                if results:
-                    speak(f"Opening {query}")
-                    import webbrowser
-                    webbrowser.open(results[0][0])
-                else:
-                    speak(f"Opening {query}")
-                    try:
-                        os.system(f'start {query}')
-                    except:
-                        speak("not found")
+                speak("not found")
         except:
             speak("something went wrong")
 
@@ -180,43 +175,60 @@ def whatsApp(mobile_no, message, flag, name):
     speak(jarvis_message)
 
 
-def chatBot(query):
-    """Chat with HugChat"""
+def chatBot(query, user="default"):
+    """Chat with HugChat (reuses a warm session and conversation per user)"""
     user_input = query.lower()
-    chatbot = hugchat.ChatBot(cookie_path=r"engine\cookies.json")
-    id = chatbot.new_conversation()
-    chatbot.change_conversation(id)
-    response = chatbot.chat(user_input)
+    response = chat_pool.chat(user_input, user=user)
     print(response)
     return response
 
 
 def makeCall(name, mobileNo):
     """Make phone call via ADB"""
+    from engine.adb import get_adb_session
+
     mobileNo = mobileNo.replace(" ", "")
     speak(f"Calling {name}")
-    command = f'adb shell am start -a android.intent.action.CALL -d tel:{mobileNo}'
-    os.system(command)
+    get_adb_session().run(f'am start -a android.intent.action.CALL -d tel:{mobileNo}')
 
 
 def sendMessage(message, mobileNo, name):
     """Send message via ADB"""
-    from engine.helper import replace_spaces_with_percent_s, goback, keyEvent, tapEvents, adbInput
+    from engine.helper import replace_spaces_with_percent_s
+    from engine.adb import AdbError, get_adb_session
     
     message = replace_spaces_with_percent_s(message)
     mobileNo = replace_spaces_with_percent_s(mobileNo)
     
     speak("sending message")
-    goback(4)
-    time.sleep(1)
-    keyEvent(3)
-    tapEvents(136, 2220)
-    tapEvents(819, 2192)
-    adbInput(mobileNo)
-    tapEvents(601, 574)
-    tapEvents(390, 2270)
-    adbInput(message)
-    tapEvents(957, 1397)
+    adb = get_adb_session()
+
+    # Back out of whatever is open, go home and open Messages (once more if it doesn't come up)
+    for attempt in range(2):
+        adb.batch([adb.key(4)] * 6 + [adb.key(3), adb.tap(136, 2220)])
+        if adb.wait_for("messaging"):
+            break
+    else:
+        raise AdbError("Messages did not open on the phone")
+
+    # Start chat - wait for the new-conversation screen rather than a fixed pause
+    screen = adb.focus()
+    adb.run(adb.tap(819, 2192))
+    if not adb.wait_for_change(screen):
+        raise AdbError("could not start a new conversation")
+
+    # Type the number and tap the match; it shows up once the lookup finishes, so retap until the chat opens
+    screen = adb.focus()
+    adb.run(adb.text(mobileNo))
+    for attempt in range(4):
+        adb.run(adb.tap(601, 574))
+        if adb.wait_for_change(screen, timeout=1.5):
+            break
+    else:
+        raise AdbError(f"could not open the conversation with {name}")
+
+    # Type and send - one round-trip
+    adb.batch([adb.tap(390, 2270), adb.text(message), adb.tap(957, 1397)])
     
     speak(f"message send successfully to {name}")
 
@@ -227,10 +239,11 @@ def get_weather(city: str) -> str:
         return "Error: OpenWeatherMap API key not found"
     
     try:
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={OPENWEATHERMAP_API_KEY}&units=metric"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        from engine.http_client import http_client, WEATHER_URL
+
+        data = http_client.get_json("weather", WEATHER_URL, params={
+            "q": city, "appid": OPENWEATHERMAP_API_KEY, "units": "metric"
+        })
         
         if data.get("cod") != 200:
             return f"Error: Could not fetch weather for {city}"
@@ -255,7 +268,7 @@ def geminai(query):
             .strip()
         )
 
-        model = ChatGoogleGenerativeAI(
+        model = genai.ChatGoogleGenerativeAI(
             model="gemini-2.5-flash",
             api_key=os.getenv("GEMINI_API_KEY"),
             temperature=0.7,
@@ -381,6 +394,7 @@ def deleteSysCommand(id):
     """Delete system command"""
     cursor.execute("DELETE FROM sys_command WHERE id = ?", (id,))
     con.commit()
+    app_index.refresh(force=True)
 
 
 @eel.expose
@@ -388,6 +402,7 @@ def addSysCommand(key, value):
     """Add system command"""
     cursor.execute('INSERT INTO sys_command VALUES (?, ?, ?)', (None, key, value))
     con.commit()
+    app_index.refresh(force=True)
 
 
 @eel.expose
@@ -405,6 +420,7 @@ def addWebCommand(key, value):
     """Add web command"""
     cursor.execute('INSERT INTO web_command VALUES (?, ?, ?)', (None, key, value))
     con.commit()
+    app_index.refresh(force=True)
 
 
 @eel.expose
@@ -412,6 +428,7 @@ def deleteWebCommand(id):
     """Delete web command"""
     cursor.execute("DELETE FROM web_command WHERE Id = ?", (id,))
     con.commit()
+    app_index.refresh(force=True)
 
 
 @eel.expose
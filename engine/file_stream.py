@@ -0,0 +1,109 @@
+# file_stream.py - Incremental EXTENSION/CONTENT parser that streams to disk
+
+import os
+import tempfile
+import time
+
+
+class StreamingFileWriter:
+    """Parses the create_file response format as tokens arrive:
+
+        EXTENSION: .ext
+        CONTENT:
+        <file content>
+
+    Content lines are written to a temp file in `directory` as soon as they
+    are complete; `finish` renames it atomically to its final name. Only the
+    current partial line and a run of trailing blank lines are kept in memory.
+    """
+
+    HEADER, CONTENT = "header", "content"
+
+    def __init__(self, directory, on_progress=None, progress_every=0.5):
+        self.directory = directory
+        self.on_progress = on_progress
+        self.progress_every = progress_every
+        self.state = self.HEADER
+        self.extension = None
+        self.partial = []         # pieces of the current unfinished line
+        self.blank_run = 0        # blank lines held back (trailing whitespace is stripped)
+        self.started = False      # leading blank lines are stripped too
+        self.bytes_written = 0
+        self.lines_written = 0
+        self.last_progress = 0.0
+        fd, self.tmp_path = tempfile.mkstemp(prefix=".create_file_", suffix=".part", dir=directory)
+        self.file = os.fdopen(fd, "w", encoding="utf-8", newline="\n")
+
+    def feed(self, text):
+        """Consume the next chunk of model output
+
+        Only the new chunk is split, so a long line arriving in many small
+        chunks costs linear time, not a re-split of the whole line per chunk.
+        """
+        first, *rest = text.split("\n")
+        self.partial.append(first)
+        if rest:
+            self._line("".join(self.partial))
+            *lines, tail = rest
+            for line in lines:
+                self._line(line)
+            self.partial = [tail]
+        self._progress()
+
+    def _line(self, line):
+        line = line.replace("```", "")
+        stripped = line.strip()
+
+        if self.state == self.HEADER:
+            lowered = stripped.lower()
+            if lowered.startswith("extension"):
+                value = stripped.split(":", 1)[1].strip() if ":" in stripped else ""
+                if value:
+                    self.extension = value if value.startswith(".") else f".{value}"
+            elif lowered.startswith("content"):
+                self.state = self.CONTENT
+            return
+
+        if not stripped:
+            if self.started:
+                self.blank_run += 1
+            return
+
+        if self.blank_run:
+            self._write("\n" * self.blank_run)
+            self.lines_written += self.blank_run
+            self.blank_run = 0
+        if self.started:
+            self._write("\n")
+        self._write(line)
+        self.lines_written += 1
+        self.started = True
+
+    def _write(self, text):
+        self.file.write(text)
+        self.bytes_written += len(text.encode("utf-8"))
+
+    def _progress(self, force=False):
+        now = time.monotonic()
+        if self.on_progress and (force or now - self.last_progress >= self.progress_every):
+            self.last_progress = now
+            self.on_progress(self.bytes_written, self.lines_written)
+
+    def finish(self, filename_for):
+        """Flush, pick the final name via `filename_for(extension)` and rename atomically"""
+        if any(self.partial):
+            self._line("".join(self.partial))
+            self.partial = []
+        self.file.close()
+        self._progress(force=True)
+        path = os.path.join(self.directory, filename_for(self.extension or ".txt"))
+        os.replace(self.tmp_path, path)
+        return path
+
+    def abort(self):
+        """Discard the temp file"""
+        try:
+            self.file.close()
+        finally:
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
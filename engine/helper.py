@@ -1,8 +1,7 @@
-import os
 import re
-import time
 import markdown2
 from bs4 import BeautifulSoup
+from engine.adb import get_adb_session
 
 
 def extract_yt_term(command):
@@ -21,29 +20,26 @@ def remove_words(input_string, words_to_remove):
 
 def keyEvent(key_code):
     """Simulate key event via ADB"""
-    command = f'adb shell input keyevent {key_code}'
-    os.system(command)
-    time.sleep(1)
+    session = get_adb_session()
+    session.run(session.key(key_code))
 
 
 def tapEvents(x, y):
     """Simulate tap event via ADB"""
-    command = f'adb shell input tap {x} {y}'
-    os.system(command)
-    time.sleep(1)
+    session = get_adb_session()
+    session.run(session.tap(x, y))
 
 
 def adbInput(message):
     """Insert text via ADB"""
-    command = f'adb shell input text "{message}"'
-    os.system(command)
-    time.sleep(1)
+    session = get_adb_session()
+    session.run(session.text(message))
 
 
 def goback(key_code):
     """Go back multiple times"""
-    for i in range(6):
-        keyEvent(key_code)
+    session = get_adb_session()
+    session.batch([session.key(key_code)] * 6)
 
 
 def replace_spaces_with_percent_s(input_string):
@@ -0,0 +1,183 @@
+# http_client.py - Shared HTTP layer for API tools (keep-alive, TTL cache, rate limits)
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from engine.deadline import DeadlineExceeded, breaker, cap_timeout
+
+
+class RateLimited(Exception):
+    """Raised when an endpoint is out of tokens and has nothing cached to serve"""
+
+
+def is_service_failure(error):
+    """Only errors that say the service is unhealthy count against its circuit breaker
+    (5xx, 429, connection problems, timeouts) - not a 404 for a misspelled city"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout,
+                              requests.exceptions.RetryError))
+
+
+# ==================== RATE LIMITER ====================
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _fill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available. Returns seconds to wait otherwise (0 = got it)."""
+        with self.lock:
+            self._fill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, max_wait):
+        """Block for up to `max_wait` seconds for a token"""
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+# ==================== ENDPOINTS ====================
+
+class Endpoint:
+    """Cache and rate-limit policy for one API"""
+
+    def __init__(self, name, ttl, stale_ttl=0, rate_per_minute=None, burst=1, max_wait=2.0, cache_if=None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst) if rate_per_minute else None
+        self.max_wait = max_wait
+        self.cache_if = cache_if or (lambda data: True)
+        self.cache = {}            # key -> (fetched_at, data)
+        self.refreshing = set()    # keys being revalidated in the background
+        self.lock = threading.Lock()
+
+
+class HttpClient:
+    """requests.Session with pooled keep-alive connections, retries and per-endpoint caching.
+
+    Fresh cache hits return immediately. Entries past their TTL but within
+    `stale_ttl` are served right away while a background request refreshes
+    them (stale-while-revalidate). When the rate limit is exhausted the call
+    waits up to `max_wait`, then serves stale data or raises RateLimited.
+    Each endpoint has a circuit breaker; while it is open, stale data is
+    served if there is any, otherwise CircuitOpen is raised.
+    """
+
+    def __init__(self, pool_size=10, retries=2):
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.3,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.endpoints = {}
+
+    def register(self, name, **policy):
+        self.endpoints[name] = Endpoint(name, **policy)
+        return self.endpoints[name]
+
+    def _fetch(self, url, params, timeout, service=None):
+        def get():
+            response = self.session.get(url, params=params, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        return breaker(service).call(get, trips=is_service_failure) if service else get()
+
+    def _store(self, endpoint, key, data):
+        if endpoint.cache_if(data):
+            with endpoint.lock:
+                endpoint.cache[key] = (time.monotonic(), data)
+
+    def _revalidate(self, endpoint, key, url, params, timeout):
+        try:
+            if endpoint.bucket is None or endpoint.bucket.try_acquire() == 0:
+                self._store(endpoint, key, self._fetch(url, params, timeout, endpoint.name))
+        except Exception as e:
+            print(f"Background refresh of {endpoint.name} failed: {e}")
+        finally:
+            with endpoint.lock:
+                endpoint.refreshing.discard(key)
+
+    def get_json(self, name, url, params=None, timeout=10):
+        """GET `url` under the policy of endpoint `name` and return the decoded JSON"""
+        endpoint = self.endpoints[name]
+        params = params or {}
+        key = (url, tuple(sorted(params.items())))
+        now = time.monotonic()
+
+        with endpoint.lock:
+            cached = endpoint.cache.get(key)
+        if cached:
+            age = now - cached[0]
+            if age < endpoint.ttl:
+                return cached[1]
+            if age < endpoint.ttl + endpoint.stale_ttl:
+                with endpoint.lock:
+                    start = key not in endpoint.refreshing
+                    endpoint.refreshing.add(key)
+                if start:
+                    threading.Thread(target=self._revalidate,
+                                     args=(endpoint, key, url, params, timeout), daemon=True).start()
+                return cached[1]
+
+        # Never wait or block past the command's remaining budget
+        timeout = cap_timeout(timeout)
+        if timeout <= 0:
+            if cached:
+                return cached[1]
+            raise DeadlineExceeded(f"no time left to call {name}")
+        if endpoint.bucket and not endpoint.bucket.acquire(cap_timeout(endpoint.max_wait)):
+            if cached:
+                return cached[1]
+            raise RateLimited(f"{name} rate limit reached, try again shortly")
+
+        try:
+            data = self._fetch(url, params, timeout, endpoint.name)
+        except Exception:
+            if cached:
+                return cached[1]
+            raise
+        self._store(endpoint, key, data)
+        return data
+
+
+# ==================== SHARED CLIENT ====================
+
+http_client = HttpClient()
+
+# Weather changes on the scale of minutes
+http_client.register("weather", ttl=10 * 60, stale_ttl=30 * 60, rate_per_minute=60, burst=10,
+                     cache_if=lambda data: data.get("cod") == 200)
+
+# Alpha Vantage free tier: 5 calls per minute
+http_client.register("stock", ttl=60, stale_ttl=10 * 60, rate_per_minute=5, burst=5, max_wait=3.0,
+                     cache_if=lambda data: bool(data.get("Global Quote")))
+
+WEATHER_URL = "http://api.openweathermap.org/data/2.5/weather"
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
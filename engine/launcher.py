@@ -0,0 +1,262 @@
+# launcher.py - Indexed application launcher for openCommand
+
+import os
+import shlex
+import sqlite3
+import subprocess
+import sys
+import threading
+import webbrowser
+
+from rapidfuzz import process, fuzz
+
+
+# ==================== SOURCES ====================
+
+def desktop_dirs():
+    """XDG application directories that may hold .desktop files"""
+    data_home = os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+    data_dirs = os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(os.pathsep)
+    dirs = [os.path.join(data_home, "applications")]
+    dirs += [os.path.join(d, "applications") for d in data_dirs if d]
+    dirs += ["/var/lib/flatpak/exports/share/applications",
+             os.path.expanduser("~/.local/share/flatpak/exports/share/applications")]
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+def path_dirs():
+    """Directories on $PATH"""
+    return [d for d in os.environ.get("PATH", "").split(os.pathsep) if d and os.path.isdir(d)]
+
+
+def parse_desktop_file(path):
+    """Read the [Desktop Entry] section of a .desktop file into a dict"""
+    entry = {}
+    in_section = False
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("["):
+                    in_section = line == "[Desktop Entry]"
+                    continue
+                if in_section and "=" in line:
+                    key, value = line.split("=", 1)
+                    entry.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+
+    if entry.get("Type", "Application") != "Application":
+        return None
+    if entry.get("NoDisplay", "").lower() == "true" or entry.get("Hidden", "").lower() == "true":
+        return None
+    if not entry.get("Exec"):
+        return None
+    return entry
+
+
+def exec_to_argv(exec_line):
+    """Turn a .desktop Exec line into an argv list (field codes removed)"""
+    try:
+        parts = shlex.split(exec_line)
+    except ValueError:
+        parts = exec_line.split()
+
+    argv = []
+    for part in parts:
+        if len(part) == 2 and part.startswith("%") and part != "%%":
+            continue  # %f %F %u %U %i %c %k ...
+        argv.append(part.replace("%%", "%"))
+    return argv
+
+
+# ==================== INDEX ====================
+
+class AppIndex:
+    """Merged index of sys_command, web_command, .desktop apps and $PATH executables.
+
+    Built on a background thread and rebuilt only when the mtime of the
+    database or one of the scanned directories changes. Bare $PATH binaries
+    (no .desktop entry or DB row) and .desktop Keywords are only matched
+    exactly, so a fuzzy guess can never start something like `shutdown` or
+    `reboot`, or an app whose keyword list merely resembles the query.
+    """
+
+    def __init__(self, db_name="jarvis.db", refresh_interval=60):
+        self.db_name = db_name
+        self.refresh_interval = refresh_interval
+        self.entries = {}      # lowercase name -> entry dict
+        self.names = []        # keys open to fuzzy search (no bare $PATH binaries or Keywords)
+        self.mtimes = {}
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    # ---------- building ----------
+    def _source_mtimes(self):
+        mtimes = {}
+        sources = [self.db_name]
+        if sys.platform.startswith("linux"):
+            sources += desktop_dirs()
+        sources += path_dirs()
+        for src in sources:
+            try:
+                mtimes[src] = os.stat(src).st_mtime
+            except OSError:
+                pass
+        return mtimes
+
+    def _load_db(self, entries):
+        if not os.path.exists(self.db_name):
+            return
+        try:
+            con = sqlite3.connect(self.db_name)
+            cursor = con.cursor()
+            for name, path in cursor.execute("SELECT name, path FROM sys_command"):
+                if name:
+                    entries[name.lower().strip()] = {"name": name, "kind": "sys", "target": path}
+            for name, url in cursor.execute("SELECT name, url FROM web_command"):
+                if name:
+                    entries[name.lower().strip()] = {"name": name, "kind": "web", "target": url}
+            con.close()
+        except sqlite3.Error as e:
+            print(f"App index: could not read commands from {self.db_name}: {e}")
+
+    def _load_desktop(self, entries, exact):
+        """Add .desktop apps; their Keywords go to `exact` (never fuzzy-matched)"""
+        keywords = []
+        for directory in desktop_dirs():
+            try:
+                files = [e for e in os.scandir(directory) if e.name.endswith(".desktop")]
+            except OSError:
+                continue
+            for de in files:
+                info = parse_desktop_file(de.path)
+                if not info:
+                    continue
+                entry = {"name": info.get("Name", de.name[:-8]), "kind": "desktop",
+                         "target": exec_to_argv(info["Exec"])}
+                for key in (info.get("Name", ""), info.get("GenericName", ""), de.name[:-8]):
+                    key = key.lower().strip()
+                    # An app's own names win over a bare $PATH binary of the same name
+                    if key and (key not in entries or entries[key]["kind"] == "path"):
+                        entries[key] = entry
+                keywords += [(key.lower().strip(), entry) for key in info.get("Keywords", "").split(";")]
+
+        # Keywords only fill keys no app name or binary claimed
+        for key, entry in keywords:
+            if key and key not in entries:
+                entries[key] = entry
+                exact.add(key)
+
+    def _load_path(self, entries):
+        for directory in path_dirs():
+            try:
+                for de in os.scandir(directory):
+                    key = de.name.lower()
+                    if key in entries:
+                        continue
+                    if de.is_file() and os.access(de.path, os.X_OK):
+                        entries[key] = {"name": de.name, "kind": "path", "target": [de.path]}
+            except OSError:
+                continue
+
+    def refresh(self, force=False):
+        """Rebuild the index if any source changed since the last build"""
+        mtimes = self._source_mtimes()
+        if not force and mtimes == self.mtimes and self.ready.is_set():
+            return False
+
+        # Lowest priority first, user commands last so they win
+        entries, exact = {}, set()
+        self._load_path(entries)
+        if sys.platform.startswith("linux"):
+            self._load_desktop(entries, exact)
+        user_entries = {}
+        self._load_db(user_entries)
+        entries.update(user_entries)
+        exact -= user_entries.keys()
+
+        with self.lock:
+            self.entries = entries
+            self.names = [key for key, entry in entries.items()
+                          if entry["kind"] != "path" and key not in exact]
+            self.mtimes = mtimes
+        self.ready.set()
+        return True
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"App index refresh error: {e}")
+                self.ready.set()
+            self.stop_event.wait(self.refresh_interval)
+
+    def start(self):
+        """Build the index in the background and keep it fresh"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    # ---------- lookup ----------
+    def search(self, query, limit=1, score_cutoff=70, wait=2.0):
+        """Return up to `limit` (entry, score) pairs matching the query"""
+        if not self.ready.is_set():
+            if self.thread is None:
+                self.refresh()
+            else:
+                self.ready.wait(wait)
+
+        query = query.lower().strip()
+        if not query:
+            return []
+
+        with self.lock:
+            entries, names = self.entries, self.names
+
+        for key in (query, query.replace(" ", "")):
+            if key in entries:
+                return [(entries[key], 100.0)]
+
+        matches = process.extract(query, names, scorer=fuzz.WRatio,
+                                  limit=limit, score_cutoff=score_cutoff)
+        return [(entries[name], score) for name, score, _ in matches]
+
+    def resolve(self, query):
+        """Best entry for a query, or None"""
+        matches = self.search(query)
+        return matches[0][0] if matches else None
+
+
+# ==================== LAUNCH ====================
+
+def launch(entry):
+    """Start an index entry without going through a shell"""
+    kind, target = entry["kind"], entry["target"]
+
+    if kind == "web":
+        webbrowser.open(target)
+        return
+
+    if kind == "sys" and sys.platform.startswith("win"):
+        os.startfile(target)
+        return
+
+    argv = target if isinstance(target, list) else [target]
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if os.name == "posix":
+        kwargs["start_new_session"] = True
+    subprocess.Popen(argv, **kwargs)
+
+
+app_index = AppIndex()
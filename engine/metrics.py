@@ -0,0 +1,180 @@
+# metrics.py - Background system-metrics sampler (NumPy ring buffer)
+
+import threading
+import time
+
+import numpy as np
+import psutil
+
+
+# Columns of the ring buffer, one row per sample
+FIELDS = ("time", "cpu", "ram", "ram_available_gb", "disk", "battery", "plugged", "temp")
+COL = {name: i for i, name in enumerate(FIELDS)}
+
+
+class MetricsSampler:
+    """Samples CPU (per core), RAM, disk, battery and temperature on a thread.
+
+    Samples go into a fixed-size ring buffer, so the stats tools can read the
+    latest snapshot without blocking and ask for short-term averages/trends.
+    """
+
+    def __init__(self, interval=1.0, capacity=600, disk_path="/", temp_every=10):
+        self.interval = interval
+        self.capacity = capacity
+        self.disk_path = disk_path
+        self.temp_every = temp_every
+        self.cores = psutil.cpu_count() or 1
+        self.data = np.full((capacity, len(FIELDS)), np.nan)
+        self.per_core = np.full((capacity, self.cores), np.nan, dtype=np.float32)
+        self.count = 0            # total samples ever written
+        self.temps_supported = hasattr(psutil, "sensors_temperatures")
+        self.last_temp = np.nan
+        self.listeners = []       # callables(row dict) run after each sample
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    # ---------- sampling ----------
+    def _read_temp(self):
+        if not self.temps_supported:
+            return np.nan
+        try:
+            temps = psutil.sensors_temperatures()
+        except Exception:
+            temps = None
+        if not temps:
+            self.temps_supported = False  # don't probe again
+            return np.nan
+        first = list(temps.values())[0]
+        return first[0].current if first else np.nan
+
+    def sample(self):
+        """Take one sample (non-blocking CPU read since the previous call)"""
+        per_core = psutil.cpu_percent(percpu=True)
+        mem = psutil.virtual_memory()
+        try:
+            disk = psutil.disk_usage(self.disk_path).percent
+        except OSError:
+            disk = np.nan
+        battery = psutil.sensors_battery() if hasattr(psutil, "sensors_battery") else None
+        if self.count % self.temp_every == 0:
+            self.last_temp = self._read_temp()
+
+        row = (
+            time.time(),
+            float(np.mean(per_core)) if per_core else np.nan,
+            mem.percent,
+            mem.available / (1024 ** 3),
+            disk,
+            battery.percent if battery else np.nan,
+            float(battery.power_plugged) if battery and battery.power_plugged is not None else np.nan,
+            self.last_temp,
+        )
+
+        with self.lock:
+            slot = self.count % self.capacity
+            self.data[slot] = row
+            self.per_core[slot, :len(per_core)] = per_core[:self.cores]
+            self.count += 1
+        self.ready.set()
+
+        snapshot = dict(zip(FIELDS, row))
+        for listener in self.listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"Metrics listener error: {e}")
+
+    def _run(self):
+        psutil.cpu_percent(percpu=True)  # prime the CPU counters
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Metrics sampler error: {e}")
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    # ---------- reading ----------
+    def _ordered(self):
+        """Rows (and per-core rows) oldest -> newest"""
+        with self.lock:
+            n = min(self.count, self.capacity)
+            start = self.count % self.capacity if self.count > self.capacity else 0
+            idx = (np.arange(n) + start) % self.capacity
+            return self.data[idx], self.per_core[idx]
+
+    def latest(self, wait=2.0):
+        """Most recent sample as a dict (with 'per_core'), or None"""
+        if not self.ready.wait(wait):
+            return None
+        with self.lock:
+            slot = (self.count - 1) % self.capacity
+            snapshot = dict(zip(FIELDS, self.data[slot].tolist()))
+            snapshot["per_core"] = self.per_core[slot].tolist()
+        return snapshot
+
+    def window(self, field, seconds):
+        """(times, values) of `field` over the last `seconds`"""
+        rows, _ = self._ordered()
+        if not len(rows):
+            return np.empty(0), np.empty(0)
+        mask = rows[:, 0] >= time.time() - seconds
+        return rows[mask, 0], rows[mask, COL[field]]
+
+    def average(self, field, seconds=60):
+        _, values = self.window(field, seconds)
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else None
+
+    def trend(self, field, seconds=120):
+        """Least-squares slope of `field` in units per minute"""
+        times, values = self.window(field, seconds)
+        ok = ~np.isnan(values)
+        if ok.sum() < 3:
+            return None
+        slope = np.polyfit(times[ok] - times[ok][0], values[ok], 1)[0]
+        return float(slope * 60)
+
+    def sustained(self, field, threshold):
+        """Seconds that `field` has stayed at or above `threshold` up to now"""
+        rows, _ = self._ordered()
+        if not len(rows):
+            return 0.0
+        below = np.nonzero(~(rows[:, COL[field]] >= threshold))[0]
+        if len(below) == len(rows) or (len(below) and below[-1] == len(rows) - 1):
+            return 0.0
+        first = below[-1] + 1 if len(below) else 0
+        return float(rows[-1, 0] - rows[first, 0] + self.interval)
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    """Shared sampler, started on first use (the app starts it at launch, see start_sampler)"""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = MetricsSampler()
+            _sampler.start()
+        return _sampler
+
+
+def start_sampler():
+    """Start sampling at app startup, so the first stats question has data ready"""
+    try:
+        get_sampler()
+    except Exception as e:
+        print(f"⚠️ System metrics disabled: {e}")
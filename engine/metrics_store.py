@@ -0,0 +1,266 @@
+# metrics_store.py - On-disk, downsampled time series of system health
+
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+# One fixed-width record per sample; *_min/*_max only matter for rollups
+RECORD = np.dtype([
+    ("time", "<f8"),
+    ("cpu", "<f4"), ("cpu_max", "<f4"),
+    ("ram", "<f4"), ("ram_max", "<f4"),
+    ("disk", "<f4"),
+    ("battery", "<f4"), ("battery_min", "<f4"),
+    ("plugged", "<f4"),
+    ("count", "<u4"),
+])
+
+METRICS = ("cpu", "ram", "disk", "battery", "plugged")
+
+# Column holding the true extreme of a rolled-up bucket (the plain column is its mean)
+MAX_COLUMN = {"cpu": "cpu_max", "ram": "ram_max"}
+MIN_COLUMN = {"battery": "battery_min"}
+
+# (name, bucket seconds, retention seconds)
+TIERS = (
+    ("1s", 1, 24 * 3600),
+    ("1m", 60, 30 * 24 * 3600),
+    ("1h", 3600, 2 * 365 * 24 * 3600),
+)
+
+
+class Series:
+    """Append-only binary file of RECORDs for one resolution"""
+
+    def __init__(self, path, bucket, retention):
+        self.path = path
+        self.bucket = bucket
+        self.retention = retention
+
+    def append(self, records):
+        with open(self.path, "ab") as f:
+            f.write(records.tobytes())
+
+    def read(self):
+        """Memory-map the whole file (zero-copy, read-only)"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < RECORD.itemsize:
+            return np.empty(0, dtype=RECORD)
+        n = os.path.getsize(self.path) // RECORD.itemsize
+        return np.memmap(self.path, dtype=RECORD, mode="r", shape=(n,))
+
+    def compact(self, now):
+        """Drop records older than the retention limit (rewrite + atomic rename)"""
+        data = self.read()
+        if not len(data) or data["time"][0] >= now - self.retention:
+            return
+        keep = np.array(data[data["time"] >= now - self.retention])
+        del data
+        tmp = self.path + ".tmp"
+        keep.tofile(tmp)
+        os.replace(tmp, self.path)
+
+
+def rollup(records, bucket):
+    """Aggregate records into `bucket`-second buckets (count-weighted means, min/max kept)"""
+    if not len(records):
+        return np.empty(0, dtype=RECORD)
+    keys = (records["time"] // bucket).astype(np.int64)
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    weights = records["count"].astype(np.float64)
+    totals = np.bincount(inverse, weights=weights)
+
+    out = np.zeros(len(uniq), dtype=RECORD)
+    out["time"] = uniq * bucket
+    out["count"] = totals
+    for name in METRICS:
+        values = records[name].astype(np.float64)
+        ok = ~np.isnan(values)
+        sums = np.bincount(inverse[ok], weights=(values * weights)[ok], minlength=len(uniq))
+        seen = np.bincount(inverse[ok], weights=weights[ok], minlength=len(uniq))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[name] = np.where(seen > 0, sums / seen, np.nan)
+
+    for name, src, ufunc in (("cpu_max", "cpu_max", np.fmax), ("ram_max", "ram_max", np.fmax),
+                             ("battery_min", "battery_min", np.fmin)):
+        agg = np.full(len(uniq), np.nan)
+        ufunc.at(agg, inverse, records[src].astype(np.float64))
+        out[name] = agg
+    return out
+
+
+class MetricsStore:
+    """1 s -> 1 min -> 1 h rollups of CPU/RAM/disk/battery kept on disk.
+
+    Raw samples are buffered and appended to the 1 s file in small batches;
+    finished minutes/hours are rolled up into the coarser files, and each
+    tier is trimmed to its retention limit once an hour.
+    """
+
+    def __init__(self, directory=os.path.join("engine", "metrics"), flush_every=30):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.flush_every = flush_every
+        self.tiers = [Series(os.path.join(directory, f"health_{name}.bin"), bucket, retention)
+                      for name, bucket, retention in TIERS]
+        self.pending = []
+        self.rolled = {}      # tier index -> end time already rolled into the next tier
+        self.last_compact = 0.0
+        self.lock = threading.Lock()
+        for i, series in enumerate(self.tiers[:-1]):
+            nxt = self.tiers[i + 1].read()
+            self.rolled[i] = float(nxt["time"][-1] + self.tiers[i + 1].bucket) if len(nxt) else 0.0
+
+    # ---------- writing ----------
+    def add(self, sample):
+        """Queue one sampler snapshot (dict with time/cpu/ram/disk/battery/plugged)"""
+        with self.lock:
+            self.pending.append(sample)
+            if len(self.pending) >= self.flush_every:
+                self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        records = np.zeros(len(self.pending), dtype=RECORD)
+        for field in ("time",) + METRICS:
+            records[field] = [s.get(field, np.nan) for s in self.pending]
+        records["cpu_max"] = records["cpu"]
+        records["ram_max"] = records["ram"]
+        records["battery_min"] = records["battery"]
+        records["count"] = 1
+        self.pending = []
+        self.tiers[0].append(records)
+        self._rollup(float(records["time"][-1]))
+
+    def _rollup(self, now):
+        for i, series in enumerate(self.tiers[:-1]):
+            target = self.tiers[i + 1]
+            complete_until = (now // target.bucket) * target.bucket
+            if complete_until <= self.rolled[i]:
+                continue
+            data = series.read()
+            lo, hi = np.searchsorted(data["time"], [self.rolled[i], complete_until])
+            if hi > lo:
+                target.append(rollup(data[lo:hi], target.bucket))
+            self.rolled[i] = complete_until
+            data = None  # release the memmap before any compaction rewrites the file
+
+        if now - self.last_compact > 3600:
+            self.last_compact = now
+            for series in self.tiers:
+                series.compact(now)
+
+    # ---------- querying ----------
+    def _tier_for(self, start):
+        """Finest tier that still covers `start`"""
+        age = time.time() - start
+        for series in self.tiers:
+            if age <= series.retention:
+                return series
+        return self.tiers[-1]
+
+    def query(self, start, end, bucket=None):
+        """Records between start and end (epoch seconds), optionally re-bucketed"""
+        with self.lock:
+            self.flush()
+            series = self._tier_for(start)
+            data = series.read()
+            lo, hi = np.searchsorted(data["time"], [start, end])
+            records = np.array(data[lo:hi])
+        if bucket and bucket > series.bucket:
+            records = rollup(records, bucket)
+        return records
+
+    def summary(self, metric, start, end):
+        """mean/min/max of `metric` and when the extremes happened
+
+        On the 1 min / 1 h tiers a bucket's mean hides its spikes, so extremes
+        come from the *_max/*_min columns where the metric has them.
+        """
+        records = self.query(start, end)
+        if not len(records):
+            return None
+        values = records[metric].astype(np.float64)
+        ok = ~np.isnan(values)
+        if not ok.any():
+            return None
+        times, counts = records["time"][ok], records["count"][ok]
+        highs = records[MAX_COLUMN.get(metric, metric)][ok].astype(np.float64)
+        lows = records[MIN_COLUMN.get(metric, metric)][ok].astype(np.float64)
+        return {
+            "mean": float(np.average(values[ok], weights=counts)),
+            "min": float(np.nanmin(lows)), "min_at": float(times[np.nanargmin(lows)]),
+            "max": float(np.nanmax(highs)), "max_at": float(times[np.nanargmax(highs)]),
+            "samples": int(counts.sum()),
+        }
+
+    def fastest_drop(self, metric, start, end, window=600):
+        """Largest fall of `metric` over `window` seconds (e.g. battery drain)"""
+        records = self.query(start, end, bucket=60)
+        values = records[metric].astype(np.float64)
+        ok = ~np.isnan(values)
+        times, values = records["time"][ok], values[ok]
+        if len(values) < 2:
+            return None
+        later = np.searchsorted(times, times + window, side="right") - 1
+        drops = values - values[later]
+        i = int(np.argmax(drops))
+        if drops[i] <= 0:
+            return None
+        return {"drop": float(drops[i]), "from": float(times[i]), "to": float(times[later[i]])}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Shared store, fed by the metrics sampler"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from engine.metrics import get_sampler
+
+            _store = MetricsStore()
+            get_sampler().listeners.append(_store.add)
+        return _store
+
+
+def start_recording():
+    """Begin recording health history (called once at app startup, not on import)"""
+    try:
+        get_store()
+    except Exception as e:
+        print(f"⚠️ Health history disabled: {e}")
+
+
+# ==================== PERIOD PARSING ====================
+
+PARTS_OF_DAY = {"morning": (6, 12), "afternoon": (12, 18), "evening": (18, 23), "night": (0, 6)}
+
+
+def parse_period(period, now=None):
+    """Turn 'this afternoon', 'yesterday', 'last 3 hours' ... into (start, end) epoch seconds"""
+    now = now or time.time()
+    today = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    period = (period or "today").lower().strip()
+
+    match = re.search(r"(?:last|past)\s+(\d+)?\s*(minute|hour|day|week)s?", period)
+    if match:
+        amount = int(match.group(1) or 1)
+        unit = {"minute": 60, "hour": 3600, "day": 86400, "week": 7 * 86400}[match.group(2)]
+        return now - amount * unit, now
+
+    day = today - timedelta(days=1) if "yesterday" in period else today
+    for part, (lo, hi) in PARTS_OF_DAY.items():
+        if part in period:
+            start = day + timedelta(hours=lo)
+            end = day + timedelta(hours=hi)
+            return start.timestamp(), min(end.timestamp(), now)
+
+    return day.timestamp(), min((day + timedelta(days=1)).timestamp(), now)
@@ -0,0 +1,131 @@
+# portfolio.py - Concurrent multi-symbol stock quotes and a saved watchlist
+
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from engine.config import ALPHA_VANTAGE_API_KEY
+from engine.http_client import http_client, ALPHA_VANTAGE_URL, RateLimited
+
+
+# ==================== QUOTES ====================
+
+def parse_symbols(symbols) -> list:
+    """Accept 'AAPL, TSLA INFY' or ['aapl', 'tsla'] and return unique uppercase symbols"""
+    if isinstance(symbols, str):
+        symbols = re.split(r"[,\s;]+", symbols)
+    seen = []
+    for symbol in symbols:
+        symbol = str(symbol).strip().upper()
+        if symbol and symbol not in seen:
+            seen.append(symbol)
+    return seen
+
+
+def fetch_quote(symbol: str) -> dict:
+    """Fetch one GLOBAL_QUOTE through the shared, rate-limited HTTP client"""
+    symbol = symbol.upper()
+    try:
+        data = http_client.get_json("stock", ALPHA_VANTAGE_URL, params={
+            "function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": ALPHA_VANTAGE_API_KEY
+        })
+    except RateLimited:
+        return {"symbol": symbol, "error": "rate limited"}
+    except Exception as e:
+        return {"symbol": symbol, "error": str(e)}
+
+    quote = data.get("Global Quote") or {}
+    if not quote.get("05. price"):
+        return {"symbol": symbol, "error": "not found"}
+    return {
+        "symbol": symbol,
+        "price": quote.get("05. price"),
+        "change": quote.get("09. change"),
+        "change_percent": quote.get("10. change percent"),
+    }
+
+
+def fetch_quotes(symbols, max_workers=5) -> list:
+    """Fetch several quotes concurrently; order follows the input"""
+    symbols = parse_symbols(symbols)
+    if not symbols:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+        return list(pool.map(fetch_quote, symbols))
+
+
+# ==================== WATCHLIST ====================
+
+class Watchlist:
+    """Saved symbols in jarvis.db, with quotes kept warm by a background thread"""
+
+    def __init__(self, db_name="jarvis.db", refresh_interval=5 * 60):
+        self.db_name = db_name
+        self.refresh_interval = refresh_interval
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.init_db()
+
+    def init_db(self):
+        """Initialize watchlist table"""
+        con = sqlite3.connect(self.db_name)
+        con.execute('''CREATE TABLE IF NOT EXISTS watchlist
+                       (symbol VARCHAR(20) PRIMARY KEY)''')
+        con.commit()
+        con.close()
+
+    def symbols(self) -> list:
+        con = sqlite3.connect(self.db_name)
+        rows = con.execute("SELECT symbol FROM watchlist ORDER BY symbol").fetchall()
+        con.close()
+        return [row[0] for row in rows]
+
+    def add(self, symbols) -> list:
+        added = parse_symbols(symbols)
+        con = sqlite3.connect(self.db_name)
+        con.executemany("INSERT OR IGNORE INTO watchlist (symbol) VALUES (?)", [(s,) for s in added])
+        con.commit()
+        con.close()
+        return added
+
+    def remove(self, symbols) -> list:
+        removed = parse_symbols(symbols)
+        con = sqlite3.connect(self.db_name)
+        con.executemany("DELETE FROM watchlist WHERE symbol = ?", [(s,) for s in removed])
+        con.commit()
+        con.close()
+        return removed
+
+    def _run(self):
+        # Refresh right away, then every refresh_interval
+        while not self.stop_event.is_set():
+            try:
+                fetch_quotes(self.symbols())
+            except Exception as e:
+                print(f"Watchlist refresh error: {e}")
+            self.stop_event.wait(self.refresh_interval)
+
+    def start(self):
+        """Refresh watchlist quotes in the background so asks hit the cache"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+
+_watchlist = None
+_watchlist_lock = threading.Lock()
+
+
+def get_watchlist():
+    global _watchlist
+    with _watchlist_lock:
+        if _watchlist is None:
+            _watchlist = Watchlist()
+            _watchlist.start()
+        return _watchlist
@@ -0,0 +1,116 @@
+# processes.py - "What's eating my CPU/RAM" with one psutil pass
+
+import heapq
+import threading
+import time
+
+import psutil
+
+
+ATTRS = ["pid", "name", "cpu_times", "memory_info", "io_counters", "create_time"]
+
+
+class ProcessTracker:
+    """Ranks processes by CPU, memory and I/O without a blocking interval.
+
+    Every scan stores per-PID baselines (CPU seconds, I/O bytes, wall time);
+    the next scan turns the deltas into rates. PIDs seen for the first time
+    fall back to their average since the process started.
+
+    Baselines are refreshed every `refresh_every` seconds from the metrics
+    sampler thread (see refresh, registered at app startup by start_tracking),
+    so top() never waits and its rates cover the last few seconds.
+    """
+
+    def __init__(self, refresh_every=5.0):
+        self.baselines = {}   # (pid, create_time) -> (wall, cpu_seconds, io_bytes)
+        self.scanned_at = 0.0
+        self.refresh_every = refresh_every
+        self.lock = threading.Lock()
+
+    def scan(self):
+        """One process_iter pass -> list of per-process dicts"""
+        now = time.time()
+        rows = []
+        baselines = {}
+        for proc in psutil.process_iter(attrs=ATTRS, ad_value=None):
+            info = proc.info
+            cpu_times = info["cpu_times"]
+            if cpu_times is None:
+                continue
+            cpu_seconds = cpu_times.user + cpu_times.system
+            io = info["io_counters"]
+            io_bytes = (io.read_bytes + io.write_bytes) if io else 0
+            key = (info["pid"], info["create_time"])
+
+            with self.lock:
+                previous = self.baselines.get(key)
+            if previous:
+                wall = max(now - previous[0], 1e-6)
+                cpu = (cpu_seconds - previous[1]) / wall * 100
+                io_rate = (io_bytes - previous[2]) / wall
+            else:
+                wall = max(now - (info["create_time"] or now), 1.0)
+                cpu = cpu_seconds / wall * 100
+                io_rate = io_bytes / wall
+
+            baselines[key] = (now, cpu_seconds, io_bytes)
+            memory = info["memory_info"].rss if info["memory_info"] else 0
+            rows.append({
+                "pid": info["pid"],
+                "name": info["name"] or "?",
+                "cpu": max(cpu, 0.0),
+                "memory": memory,
+                "io": max(io_rate, 0.0),
+            })
+
+        with self.lock:
+            self.baselines = baselines   # dead PIDs drop out here
+            self.scanned_at = now
+        return rows
+
+    def refresh(self, snapshot=None):
+        """Sampler listener: re-baseline every `refresh_every` seconds"""
+        if time.time() - self.scanned_at >= self.refresh_every:
+            self.scan()
+
+    def top(self, sort_by="cpu", count=5, group=True):
+        """Top `count` processes (or applications, if grouped) by cpu/memory/io"""
+        rows = self.scan()
+        if group:
+            apps = {}
+            for row in rows:
+                name = row["name"].lower()
+                if name.endswith(".exe"):
+                    name = name[:-4]
+                app = apps.setdefault(name, {"name": name, "cpu": 0.0, "memory": 0, "io": 0.0, "processes": 0})
+                app["cpu"] += row["cpu"]
+                app["memory"] += row["memory"]
+                app["io"] += row["io"]
+                app["processes"] += 1
+            rows = apps.values()
+        return heapq.nlargest(count, rows, key=lambda r: r[sort_by])
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_tracker():
+    """Shared tracker, kept fresh by the metrics sampler"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            from engine.metrics import get_sampler
+
+            _tracker = ProcessTracker()
+            get_sampler().listeners.append(_tracker.refresh)
+        return _tracker
+
+
+def start_tracking():
+    """Create the tracker at app startup, so baselines are fresh by the first question"""
+    try:
+        get_tracker()
+    except Exception as e:
+        print(f"⚠️ Process tracking disabled: {e}")
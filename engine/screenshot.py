@@ -0,0 +1,142 @@
+# screenshot.py - Screen capture pipeline (region/window, scaling, off-thread encoding)
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from engine.lazy import lazy_import
+
+cv2 = lazy_import("cv2")
+
+
+# cv2.imencode releases the GIL, so one worker keeps encoding off the agent thread
+_encoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-encoder")
+
+FORMATS = {
+    # extension -> (cv2 params builder)
+    "png": lambda quality: [cv2.IMWRITE_PNG_COMPRESSION, 1],       # fast compression level
+    "jpg": lambda quality: [cv2.IMWRITE_JPEG_QUALITY, quality],
+    "webp": lambda quality: [cv2.IMWRITE_WEBP_QUALITY, quality],
+}
+
+
+def window_region(title):
+    """Bounding box {left, top, width, height} of the first window whose title contains `title`"""
+    try:
+        import pygetwindow
+    except ImportError:
+        raise RuntimeError("window capture needs pygetwindow")
+    windows = [w for w in pygetwindow.getAllWindows() if title.lower() in (w.title or "").lower()]
+    if not windows:
+        raise RuntimeError(f"no window titled '{title}'")
+    w = windows[0]
+    return {"left": w.left, "top": w.top, "width": w.width, "height": w.height}
+
+
+def parse_region(region):
+    """'x,y,w,h' -> mss region dict"""
+    left, top, width, height = (int(float(v)) for v in region.split(","))
+    return {"left": left, "top": top, "width": width, "height": height}
+
+
+def grab(region=None, window=None, monitor=1):
+    """Capture the screen (or a region/window) as a BGR NumPy array"""
+    import mss
+
+    with mss.mss() as sct:
+        if window:
+            area = window_region(window)
+        elif region:
+            area = parse_region(region) if isinstance(region, str) else region
+        else:
+            area = sct.monitors[monitor]
+        shot = sct.grab(area)
+        return np.asarray(shot)[:, :, :3]  # BGRA -> BGR view
+
+
+def downscale(image, scale=1.0, max_side=None):
+    h, w = image.shape[:2]
+    factor = scale
+    if max_side and max(h, w) * factor > max_side:
+        factor = max_side / max(h, w)
+    if factor >= 1.0:
+        return image
+    return cv2.resize(image, (max(1, int(w * factor)), max(1, int(h * factor))), interpolation=cv2.INTER_AREA)
+
+
+def normalize_format(fmt):
+    """'.JPEG' -> 'jpg'; ValueError for formats we cannot encode"""
+    fmt = fmt.lower().lstrip(".").replace("jpeg", "jpg")
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported image format '{fmt}' (use {', '.join(FORMATS)})")
+    return fmt
+
+
+def encode(image, fmt="png", quality=80):
+    """Encode to bytes (runs in the caller's thread)"""
+    fmt = normalize_format(fmt)
+    ok, buf = cv2.imencode(f".{fmt}", image, FORMATS[fmt](quality))
+    if not ok:
+        raise RuntimeError(f"could not encode screenshot as {fmt}")
+    return buf.tobytes()
+
+
+def encode_async(image, fmt="png", quality=80, path=None):
+    """Encode on the worker; returns a Future of the bytes (also written to `path` if given)
+
+    The format is checked here, so a bad one fails in the caller; encode and write
+    errors surface from the future's result().
+    """
+    fmt = normalize_format(fmt)
+    image = np.ascontiguousarray(image)  # detach from the mss buffer
+
+    def job():
+        data = encode(image, fmt, quality)
+        if path:
+            with open(path, "wb") as f:
+                f.write(data)
+        return data
+
+    return _encoder.submit(job)
+
+
+def dhash(image, size=8):
+    """64-bit difference hash - near-identical screens hash within a few bits"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming(a, b):
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count("1")
+
+
+class AnswerCache:
+    """Small LRU of answers about a screen, keyed by (screen hash, question);
+    a near-identical screen (within `max_distance` bits) counts as the same one"""
+
+    def __init__(self, size=32, max_distance=4):
+        self.size = size
+        self.max_distance = max_distance
+        self.answers = OrderedDict()   # (hash, question) -> answer
+        self.lock = threading.Lock()
+
+    def get(self, screen_hash, question):
+        with self.lock:
+            for key in reversed(self.answers):
+                if key[1] == question and hamming(key[0], screen_hash) <= self.max_distance:
+                    self.answers.move_to_end(key)
+                    return self.answers[key]
+        return None
+
+    def put(self, screen_hash, question, answer):
+        with self.lock:
+            self.answers[(screen_hash, question)] = answer
+            self.answers.move_to_end((screen_hash, question))
+            while len(self.answers) > self.size:
+                self.answers.popitem(last=False)
+
@@ -1,21 +1,26 @@
 # tools.py - All Tool Definitions for the Agent
 
 import os
-import requests
 import json
 from datetime import datetime
 from langchain_core.tools import Tool, tool
-from langchain_community.utilities import GoogleSerperAPIWrapper
+from langchain_core.messages import HumanMessage
 from engine.config import (
     GEMINI_API_KEY, SERPER_API_KEY,
     ALPHA_VANTAGE_API_KEY, OPENWEATHERMAP_API_KEY,
     ASSISTANT_NAME
 )
-import wikipedia
-from googlesearch import search as google_search
-from yt_dlp import YoutubeDL
-import pyautogui
-import cv2
+from engine.http_client import http_client, WEATHER_URL
+from engine.portfolio import fetch_quote, fetch_quotes, get_watchlist
+from engine.metrics import get_sampler
+from engine.metrics_store import get_store, parse_period
+from engine.processes import get_tracker
+from engine.disk_usage import get_analyzer, format_size
+from engine.volume import get_mixer
+from engine.brightness import get_brightness_service
+from engine import screenshot
+from engine.file_stream import StreamingFileWriter
+from engine.lazy import lazy_import
 import threading
 from pathlib import Path
 import time
@@ -24,6 +29,7 @@ import webbrowser
 import psutil
 import platform
 import re
+import math
 
 # ==================== IMPORT DICTIONARY-BASED TASKS ====================
 from engine.simple_tasks_dict import (
@@ -41,20 +47,10 @@ from engine.simple_tasks_dict import (
     delete_task
 )
 
-# ==================== TRY-EXCEPT IMPORTS FOR OPTIONAL LIBRARIES ====================
-try:
-    from screen_brightness_control import set_brightness, get_brightness
-except ImportError:
-    print("⚠️ screen_brightness_control not installed. Brightness control disabled on this platform.")
-    set_brightness = None
-    get_brightness = None
-
-try:
-    from pycaw.pycaw import AudioUtilities, ISimpleAudioVolume
-    PYCAW_AVAILABLE = True
-except ImportError:
-    PYCAW_AVAILABLE = False
-    print("⚠️ pycaw not available. Volume control limited.")
+# ==================== LAZY IMPORTS FOR HEAVY LIBRARIES ====================
+# Loaded on first use of the tool that needs them, not at startup
+wikipedia = lazy_import("wikipedia")
+langchain_utilities = lazy_import("langchain_community.utilities")
 
 # ==================== TASK MANAGEMENT TOOLS (LLM-ACCESSIBLE) ====================
 
@@ -144,7 +140,7 @@ def get_current_datetime() -> str:
 def search_wrapper(search_query: str) -> str:
     """Wrapper to fix GoogleSerperAPIWrapper call"""
     try:
-        search = GoogleSerperAPIWrapper(serpapi_api_key=SERPER_API_KEY)
+        search = langchain_utilities.GoogleSerperAPIWrapper(serpapi_api_key=SERPER_API_KEY)
         result = search.run(search_query)
         return str(result)
     except Exception as e:
@@ -163,10 +159,9 @@ def get_weather(city: str) -> str:
         return "Weather API not configured. Please set OPENWEATHERMAP_API_KEY in config."
     
     try:
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={OPENWEATHERMAP_API_KEY}&units=metric"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = http_client.get_json("weather", WEATHER_URL, params={
+            "q": city, "appid": OPENWEATHERMAP_API_KEY, "units": "metric"
+        })
         
         if data.get("cod") != 200:
             return f"Could not fetch weather for {city}. Please check the city name."
@@ -213,22 +208,68 @@ def get_stock_price(symbol: str) -> str:
         if not ALPHA_VANTAGE_API_KEY or ALPHA_VANTAGE_API_KEY == "YOUR_ALPHA_VANTAGE_API_KEY":
             return "Stock API not configured. Using demo data only."
         
-        url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol.upper()}&apikey={ALPHA_VANTAGE_API_KEY}"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        if "Global Quote" in data and data["Global Quote"] and data["Global Quote"].get("05. price"):
-            quote = data["Global Quote"]
-            price = quote.get("05. price", "N/A")
-            change = quote.get("09. change", "N/A")
-            change_percent = quote.get("10. change percent", "N/A")
-            return f"Stock {symbol.upper()}: ${price} (Change: {change}, {change_percent})"
-        else:
+        quote = fetch_quote(symbol)
+        
+        if "error" not in quote:
+            return f"Stock {quote['symbol']}: ${quote['price']} (Change: {quote['change']}, {quote['change_percent']})"
+        elif quote["error"] == "not found":
             return f"Could not find stock data for {symbol}. Try another symbol."
+        else:
+            return f"Stock error: {quote['error']}"
     except Exception as e:
         return f"Stock error: {str(e)}"
 
+@tool
+def get_stock_quotes(symbols: str = "") -> str:
+    """Get prices for SEVERAL stocks in one call, fetched concurrently.
+    
+    Args:
+        symbols: Comma-separated symbols, e.g. 'AAPL, TSLA, INFY'.
+                 Leave empty to get the saved watchlist.
+    
+    Returns: JSON list of {symbol, price, change, change_percent} (or {symbol, error})
+    
+    Examples:
+        "How are AAPL, TSLA and INFY doing?"
+        "How is my watchlist doing?"
+    """
+    try:
+        if not ALPHA_VANTAGE_API_KEY or ALPHA_VANTAGE_API_KEY == "YOUR_ALPHA_VANTAGE_API_KEY":
+            return "Stock API not configured. Using demo data only."
+        
+        if not symbols.strip():
+            symbols = get_watchlist().symbols()
+            if not symbols:
+                return "Your watchlist is empty. Add symbols with manage_watchlist."
+        
+        return json.dumps(fetch_quotes(symbols), separators=(",", ":"))
+    except Exception as e:
+        return f"Stock error: {str(e)}"
+
+@tool
+def manage_watchlist(action: str, symbols: str = "") -> str:
+    """Add, remove or list saved stock watchlist symbols.
+    
+    Args:
+        action: 'add', 'remove' or 'list'
+        symbols: Comma-separated symbols for add/remove (e.g. 'AAPL, TSLA')
+    """
+    try:
+        watchlist = get_watchlist()
+        action = action.lower().strip()
+        
+        if action == "add":
+            return f"Added to watchlist: {', '.join(watchlist.add(symbols)) or 'nothing'}"
+        elif action == "remove":
+            return f"Removed from watchlist: {', '.join(watchlist.remove(symbols)) or 'nothing'}"
+        elif action == "list":
+            saved = watchlist.symbols()
+            return f"Watchlist: {', '.join(saved)}" if saved else "Your watchlist is empty."
+        else:
+            return "Invalid action. Use: 'add', 'remove' or 'list'"
+    except Exception as e:
+        return f"Watchlist error: {str(e)}"
+
 @tool
 def open_application(app_name: str) -> str:
     """Open application or website. Examples: 'chrome', 'whatsapp', 'spotify', 'https://google.com'"""
@@ -431,6 +472,19 @@ def search_youtube(query: str) -> str:
         error_msg = str(e)
         return f"YouTube search error: {error_msg}. Please check if a default browser is set."
 
+def describe_cpu_load(sampler) -> str:
+    """Short-term CPU context, e.g. ' - has been at/above 90% for 2 min'"""
+    for threshold in (90, 75):
+        seconds = sampler.sustained("cpu", threshold)
+        if seconds >= 30:
+            return f" - has been at/above {threshold}% for {seconds / 60:.0f} min" if seconds >= 90 \
+                else f" - has been at/above {threshold}% for {seconds:.0f}s"
+    trend = sampler.trend("cpu", 120)
+    if trend is not None and abs(trend) >= 10:
+        return f" - {'rising' if trend > 0 else 'falling'} ~{abs(trend):.0f}%/min"
+    return ""
+
+
 @tool
 def get_system_stats() -> str:
     """Get comprehensive system resource statistics.
@@ -443,26 +497,27 @@ def get_system_stats() -> str:
         "Check my RAM"
     """
     try:
+        sampler = get_sampler()
+        snap = sampler.latest()
+        if snap is None:
+            return "System stats are not available yet, try again in a moment."
+        
+        cpu_avg = sampler.average("cpu", 60)   # None until the sampler has a reading
+        avg = f" (1-min avg {cpu_avg:.1f}%)" if cpu_avg is not None else ""
         stats = {
-            "⚡ CPU Usage": f"{psutil.cpu_percent(interval=1)}%",
-            "💾 RAM Usage": f"{psutil.virtual_memory().percent}%",
-            "📦 RAM Available": f"{psutil.virtual_memory().available / (1024**3):.2f} GB",
-            "💿 Disk Usage": f"{psutil.disk_usage('/').percent}%",
+            "⚡ CPU Usage": f"{snap['cpu']:.1f}%{avg}{describe_cpu_load(sampler)}",
+            "💾 RAM Usage": f"{snap['ram']:.1f}%",
+            "📦 RAM Available": f"{snap['ram_available_gb']:.2f} GB",
+            "💿 Disk Usage": f"{snap['disk']:.1f}%",
         }
         
         # Battery info
-        battery = psutil.sensors_battery()
-        if battery:
-            stats["🔋 Battery"] = f"{battery.percent}% - {'🔌 Plugged' if battery.power_plugged else '⚡ Discharging'}"
+        if not math.isnan(snap["battery"]):
+            stats["🔋 Battery"] = f"{snap['battery']:.0f}% - {'🔌 Plugged' if snap['plugged'] == 1 else '⚡ Discharging'}"
         
         # Temperature (if available)
-        try:
-            temps = psutil.sensors_temperatures()
-            if temps:
-                first_temp = list(temps.values())[0]
-                stats["🌡️ CPU Temp"] = f"{first_temp.current}°C"
-        except:
-            pass
+        if not math.isnan(snap["temp"]):
+            stats["🌡️ CPU Temp"] = f"{snap['temp']:.1f}°C"
         
         # Format output
         output = "📊 System Status:\n"
@@ -479,13 +534,49 @@ def get_system_stats() -> str:
 def get_cpu_usage() -> str:
     """Get detailed CPU usage information."""
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count = psutil.cpu_count()
-        return f"CPU Usage: {cpu_percent}% (Cores: {cpu_count})"
+        sampler = get_sampler()
+        snap = sampler.latest()
+        if snap is None:
+            return "CPU usage is not available yet, try again in a moment."
+        
+        busiest = max(snap["per_core"])
+        cpu_avg = sampler.average("cpu", 60)   # None until the sampler has a reading
+        avg = f", 1-min avg {cpu_avg:.1f}%" if cpu_avg is not None else ""
+        return (f"CPU Usage: {snap['cpu']:.1f}% (Cores: {sampler.cores}, busiest core {busiest:.0f}%"
+                f"{avg}){describe_cpu_load(sampler)}")
     except Exception as e:
         return f"CPU error: {str(e)}"
 
 
+@tool
+def get_top_processes(sort_by: str = "cpu", count: int = 5) -> str:
+    """Show which applications are using the most CPU, memory or disk I/O.
+    
+    Args:
+        sort_by: 'cpu', 'memory' or 'io'
+        count: How many applications to list (default 5)
+    
+    Examples:
+        "What's eating my CPU?"
+        "Which apps use the most RAM?"
+    """
+    try:
+        sort_by = {"ram": "memory", "mem": "memory", "disk": "io"}.get(sort_by.lower().strip(), sort_by.lower().strip())
+        if sort_by not in ("cpu", "memory", "io"):
+            return "Invalid sort. Use: 'cpu', 'memory' or 'io'"
+        
+        top = get_tracker().top(sort_by, max(1, min(int(count), 20)))
+        
+        output = f"🔝 Top apps by {sort_by}:\n"
+        for i, app in enumerate(top, 1):
+            procs = f" ({app['processes']} processes)" if app["processes"] > 1 else ""
+            output += (f"{i}. {app['name']}{procs}: CPU {app['cpu']:.1f}%, "
+                       f"RAM {app['memory'] / (1024**2):.0f} MB, I/O {app['io'] / 1024:.0f} KB/s\n")
+        return output.strip()
+    except Exception as e:
+        return f"Process list error: {str(e)}"
+
+
 @tool
 def get_ram_usage() -> str:
     """Get detailed RAM usage information."""
@@ -496,6 +587,88 @@ def get_ram_usage() -> str:
         return f"RAM error: {str(e)}"
 
 
+@tool
+def get_health_history(metric: str = "cpu", period: str = "today") -> str:
+    """Look up recorded system health history.
+    
+    Args:
+        metric: 'cpu', 'ram', 'disk' or 'battery'
+        period: e.g. 'today', 'this afternoon', 'yesterday morning', 'last 2 hours', 'last week'
+    
+    Returns: Average, peak and lowest values (with times); for battery also the fastest drain
+    
+    Examples:
+        "What was my RAM usage this afternoon?"
+        "When did the battery drain fastest today?"
+    """
+    try:
+        metric = metric.lower().strip()
+        if metric not in ("cpu", "ram", "disk", "battery"):
+            return "Invalid metric. Use: 'cpu', 'ram', 'disk' or 'battery'"
+        
+        store = get_store()
+        start, end = parse_period(period)
+        summary = store.summary(metric, start, end)
+        if not summary:
+            return f"No {metric} history recorded for {period} yet."
+        
+        at = lambda ts: datetime.fromtimestamp(ts).strftime("%H:%M")
+        output = (f"📈 {metric.upper()} {period}: avg {summary['mean']:.1f}%, "
+                  f"peak {summary['max']:.1f}% at {at(summary['max_at'])}, "
+                  f"lowest {summary['min']:.1f}% at {at(summary['min_at'])}")
+        
+        if metric == "battery":
+            drop = store.fastest_drop("battery", start, end)
+            if drop:
+                output += (f". Fastest drain: -{drop['drop']:.0f}% between "
+                           f"{at(drop['from'])} and {at(drop['to'])}")
+        return output
+    except Exception as e:
+        return f"Health history error: {str(e)}"
+
+
+@tool
+def analyze_disk_usage(path: str = "~", count: int = 5) -> str:
+    """Find what's taking up disk space: largest folders and files under a path.
+    
+    Args:
+        path: Folder to analyze (default: home folder '~')
+        count: How many folders/files to list (default 5)
+    
+    Examples:
+        "What's taking up space on my disk?"
+        "Which folders are biggest in Downloads?"
+    """
+    try:
+        target = Path(path).expanduser()
+        if not target.is_dir():
+            return f"⚠️ Folder not found: {target}"
+        
+        def show_progress(report):
+            biggest = report["files"][0] if report["files"] else None
+            message = f"Scanned {report['files_scanned']} files..."
+            if biggest:
+                message += f" largest so far: {Path(biggest[0]).name} ({format_size(biggest[1])})"
+            try:
+                import eel
+                eel.DisplayMessage(message)
+            except Exception:
+                print(message)
+        
+        report = get_analyzer().scan(str(target), max(1, min(int(count), 20)), on_progress=show_progress)
+        
+        output = f"💽 {report['root']}: {format_size(report['total'])} in {report['files_scanned']} files\n"
+        output += "📁 Largest folders:\n"
+        for folder, size in report["folders"]:
+            output += f"  - {Path(folder).name}: {format_size(size)}\n"
+        output += "📄 Largest files:\n"
+        for file, size in report["files"]:
+            output += f"  - {file}: {format_size(size)}\n"
+        return output.strip()
+    except Exception as e:
+        return f"Disk usage error: {str(e)}"
+
+
 @tool
 def get_battery_status() -> str:
     """Get battery status and health.
@@ -579,24 +752,22 @@ def control_brightness(action: str, value: int = 0) -> str:
         "Decrease brightness"
     """
     try:
-        if get_brightness is None:
+        service = get_brightness_service()
+        if service is None:
             return "Brightness control not available on this platform."
         
-        current = get_brightness(display=0)
+        current = service.get()
         
         if action == "increase":
-            new_brightness = min(current + 10, 100)
-            set_brightness(new_brightness, display=0)
+            new_brightness = service.ramp(min(current + 10, 100))
             return f"✅ Brightness increased: {current}% → {new_brightness}%"
         
         elif action == "decrease":
-            new_brightness = max(current - 10, 0)
-            set_brightness(new_brightness, display=0)
+            new_brightness = service.ramp(max(current - 10, 0))
             return f"✅ Brightness decreased: {current}% → {new_brightness}%"
         
         elif action == "set":
-            value = max(0, min(value, 100))
-            set_brightness(value, display=0)
+            value = service.ramp(value)
             return f"✅ Brightness set to {value}%"
         
         elif action == "get":
@@ -627,16 +798,9 @@ def play_spotify(query: str) -> str:
     except Exception as e:
         return f"Spotify error: {str(e)}"
 
-@tool
-def control_volume(action: str, value: int = 0) -> str:
-    """
-    Control system volume using keyboard shortcuts.
-    Works on all Windows systems without Pycaw.
-    """
+def control_volume_keys(action: str, value: int = 0) -> str:
+    """Fallback: fake volume control with media keys when no mixer backend exists"""
     import pyautogui
-    import time
-
-    action = action.lower().strip()
 
     if action == "increase":
         for _ in range(5):  # Increase 5 steps
@@ -650,13 +814,9 @@ def control_volume(action: str, value: int = 0) -> str:
             time.sleep(0.05)
         return "🔉 Volume decreased"
 
-    elif action == "mute":
-        pyautogui.press("volumemute")
-        return "🔇 System muted"
-
-    elif action == "unmute":
+    elif action in ("mute", "unmute"):
         pyautogui.press("volumemute")  # toggle mute
-        return "🔊 System unmuted"
+        return "🔇 System muted" if action == "mute" else "🔊 System unmuted"
 
     elif action == "set":
         # Normalize: set → mute → raise volume
@@ -672,34 +832,94 @@ def control_volume(action: str, value: int = 0) -> str:
 
     return "Unknown command"
 
+
 @tool
-def take_screenshot(save_location: str = "") -> str:
+def control_volume(action: str, value: int = 0, app: str = "") -> str:
     """
-    Windows-10 stable screenshot tool using mss (NOT pyautogui).
-    Saves screenshots inside ./screenshots unless a custom folder is given.
+    Control system (or one application's) volume.
+    
+    Args:
+        action: 'increase', 'decrease', 'set', 'get', 'mute', 'unmute'
+        value: Volume 0-100 for 'set', or step size for increase/decrease (default 10)
+        app: Optional application name (e.g. 'spotify', 'chrome') to change only its volume
     """
+    action = action.lower().strip()
 
     try:
-        import mss
-        import mss.tools
+        mixer = get_mixer()
+        if mixer is None:
+            return control_volume_keys(action, value)
+
+        if app:
+            apps = mixer.list_apps()
+            current = next((v for name, v in apps.items() if app.lower() in name.lower()), None)
+            if current is None:
+                return f"⚠️ No audio from '{app}' right now"
+            if action == "get":
+                return f"🔊 {app} volume: {current}%"
+            step = value or 10
+            target = {"increase": current + step, "decrease": current - step, "set": value}.get(action)
+            if target is None:
+                return "Invalid action for an app. Use: 'increase', 'decrease', 'set', or 'get'"
+            mixer.set_app(app, max(0, min(target, 100)))
+            return f"🔊 {app} volume: {current}% → {max(0, min(target, 100))}%"
+
+        if action == "mute":
+            mixer.set_mute(True)
+            return "🔇 System muted"
+        if action == "unmute":
+            mixer.set_mute(False)
+            return "🔊 System unmuted"
+
+        current = mixer.get()
+        if action == "get":
+            return f"🔊 Volume is {current}%{' (muted)' if mixer.is_muted() else ''}"
+
+        step = value or 10
+        target = {"increase": current + step, "decrease": current - step, "set": value}.get(action)
+        if target is None:
+            return "Invalid action. Use: 'increase', 'decrease', 'set', 'get', 'mute' or 'unmute'"
+        target = max(0, min(target, 100))
+        mixer.set(target)
+        if mixer.is_muted() and target > 0:
+            mixer.set_mute(False)
+        return f"🔊 Volume: {current}% → {target}%"
+
+    except Exception as e:
+        return f"Volume control error: {str(e)}"
+
+@tool
+def take_screenshot(save_location: str = "", region: str = "", window: str = "",
+                    scale: float = 1.0, image_format: str = "png") -> str:
+    """
+    Take a screenshot using mss (NOT pyautogui).
+    Saves screenshots inside ./screenshots unless a custom folder is given.
+    
+    Args:
+        save_location: Folder to save into (default ./screenshots)
+        region: Optional 'x,y,width,height' area to capture
+        window: Optional window title to capture (e.g. 'WhatsApp')
+        scale: Downscale factor, e.g. 0.5 for half size
+        image_format: 'png', 'jpg' or 'webp'
+    """
 
+    try:
         # Default folder → ./screenshots
         if not save_location:
             save_location = Path.cwd() / "screenshots"
         else:
             save_location = Path(save_location)
 
+        # File name (rejects unknown formats before anything is captured)
+        image_format = screenshot.normalize_format(image_format)
         save_location.mkdir(parents=True, exist_ok=True)
-
-        # File name
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = save_location / f"screenshot_{timestamp}.png"
+        filename = save_location / f"screenshot_{timestamp}.{image_format}"
 
-        # Capture full screen using mss (most stable on Windows)
-        with mss.mss() as sct:
-            monitor = sct.monitors[1]  # primary monitor
-            screenshot = sct.grab(monitor)
-            mss.tools.to_png(screenshot.rgb, screenshot.size, output=str(filename))
+        # Capture now, encode + write on the encoder thread; failures are reported when they happen
+        image = screenshot.downscale(screenshot.grab(region=region or None, window=window or None), scale)
+        screenshot.encode_async(image, image_format, path=str(filename)).add_done_callback(
+            lambda future: report_screenshot_error(future, filename))
 
         return f"📸 Screenshot saved: {filename}"
 
@@ -707,6 +927,73 @@ def take_screenshot(save_location: str = "") -> str:
         return f"❌ Screenshot error: {str(e)}"
 
 
+def report_screenshot_error(future, filename):
+    """Encoder-thread callback: tell the user if a screenshot could not be written"""
+    error = future.exception()
+    if error is None:
+        return
+    message = f"❌ Screenshot {filename} could not be saved: {error}"
+    print(message)
+    try:
+        import eel
+        eel.DisplayMessage(message)
+    except Exception:
+        pass
+
+
+_screen_answers = screenshot.AnswerCache(size=32)
+_vision_llm = None
+
+
+def get_vision_llm():
+    """Gemini client for look_at_screen, built once and reused"""
+    global _vision_llm
+    if _vision_llm is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        _vision_llm = ChatGoogleGenerativeAI(
+            model="gemini-2.5-flash",
+            api_key=GEMINI_API_KEY,
+            temperature=0.2
+        )
+    return _vision_llm
+
+
+@tool
+def look_at_screen(question: str, window: str = "") -> str:
+    """
+    Look at the current screen (or one window) and answer a question about it.
+    The screen is sent to the AI directly in memory - no file needed.
+    
+    Args:
+        question: What to find out, e.g. 'list the unread WhatsApp chats'
+        window: Optional window title to look at (e.g. 'WhatsApp')
+    """
+    try:
+        import base64
+
+        image = screenshot.downscale(screenshot.grab(window=window or None), max_side=1280)
+        screen_hash = screenshot.dhash(image)
+        question_key = question.strip().lower()
+        answer = _screen_answers.get(screen_hash, question_key)
+        if answer is not None:
+            return answer
+
+        # The bytes are needed right here, so encode in this (tool worker) thread
+        data = screenshot.encode(image, "jpg", quality=75)
+        response = get_vision_llm().invoke([HumanMessage(content=[
+            {"type": "text", "text": question},
+            {"type": "image_url", "image_url": "data:image/jpeg;base64," + base64.b64encode(data).decode()},
+        ])])
+        answer = response.content if hasattr(response, "content") else str(response)
+
+        _screen_answers.put(screen_hash, question_key, answer)
+        return answer
+
+    except Exception as e:
+        return f"❌ Screen reading error: {str(e)}"
+
+
 @tool
 def send_email(to: str, message_summary: str) -> str:
     """
@@ -802,6 +1089,23 @@ def delete_folder(folder_name: str) -> str:
     except Exception as e:
         return f"❌ Error deleting folder: {str(e)}"
 
+_file_llm = None
+
+
+def get_file_llm():
+    """Gemini client for create_file, built once and reused"""
+    global _file_llm
+    if _file_llm is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        _file_llm = ChatGoogleGenerativeAI(
+            model="gemini-2.5-flash",
+            api_key=GEMINI_API_KEY,
+            temperature=0.5
+        )
+    return _file_llm
+
+
 @tool
 def create_file(instruction: str) -> str:
     """
@@ -815,19 +1119,11 @@ def create_file(instruction: str) -> str:
     Args:
         instruction: Description of what file to create.
     """
+    writer = None
     try:
-        from engine.config import GEMINI_API_KEY
-        from langchain_google_genai import ChatGoogleGenerativeAI
-
         codebase_dir = Path.cwd() / "codebase"
         codebase_dir.mkdir(exist_ok=True)
 
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            api_key=GEMINI_API_KEY,
-            temperature=0.5
-        )
-
         # Detect filename if user gave one (e.g. hello.txt)
         filename_match = re.search(r"\b([\w\-]+\.\w+)\b", instruction)
         user_filename = filename_match.group(1) if filename_match else None
@@ -850,67 +1146,43 @@ Rules:
 - Do NOT add commentary
 """
 
-        response = llm.invoke(prompt)
-        text = response.content if hasattr(response, "content") else str(response)
+        def show_progress(bytes_written, lines_written):
+            message = f"Writing file... {lines_written} lines, {bytes_written / 1024:.1f} KB"
+            try:
+                import eel
+                eel.DisplayMessage(message)
+            except Exception:
+                print(message)
 
         # ============================
-        #     CLEAN PARSING LOGIC
+        #   STREAM + PARSE + WRITE
         # ============================
-        # Remove markdown code fences if present
-        text = text.replace("```", "").strip()
-
-        extension = None
-        content = ""
-
-        lines = text.splitlines()
-        reading_content = False
-
-        for line in lines:
-            # EXTENSION detection
-            if line.strip().lower().startswith("extension"):
-                ext_value = line.split(":", 1)[1].strip()
-                extension = ext_value if ext_value.startswith(".") else f".{ext_value}"
-                continue
-
-            # CONTENT detection
-            if line.strip().lower().startswith("content"):
-                reading_content = True
-                continue
-
-            if reading_content:
-                content += line + "\n"
-
-        if not extension:
-            extension = ".txt"
-
-        content = content.strip()
+        writer = StreamingFileWriter(str(codebase_dir), on_progress=show_progress)
+        for chunk in get_file_llm().stream(prompt):
+            text = chunk.content if hasattr(chunk, "content") else str(chunk)
+            if isinstance(text, list):
+                text = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in text)
+            writer.feed(text)
 
         # ============================
         # Create filename
         # ============================
-
-        if user_filename:
-            if not user_filename.endswith(extension):
-                base = user_filename.rsplit(".", 1)[0]
-                filename = f"{base}{extension}"
-            else:
-                filename = user_filename
-        else:
+        def filename_for(extension):
+            if user_filename:
+                if not user_filename.endswith(extension):
+                    base = user_filename.rsplit(".", 1)[0]
+                    return f"{base}{extension}"
+                return user_filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"generated_file_{timestamp}{extension}"
-
-        filepath = codebase_dir / filename
+            return f"generated_file_{timestamp}{extension}"
 
-        # ============================
-        # Save file
-        # ============================
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        filepath = writer.finish(filename_for)
 
         return f"✅ File created successfully: {filepath}"
 
     except Exception as e:
-        print(e)
+        if writer:
+            writer.abort()
         return f"❌ Error creating file: {str(e)}"
 
 # ==================== Export All Tools ====================
@@ -941,6 +1213,8 @@ all_tools = [
     # ===== INFORMATION =====
     get_weather,
     get_stock_price,
+    get_stock_quotes,
+    manage_watchlist,
     calculator,
     chat_with_ai,
     query_gemini,
@@ -950,12 +1224,16 @@ all_tools = [
     control_volume,
     control_brightness,
     take_screenshot,
+    look_at_screen,
     
     # ===== SYSTEM INFO =====
     get_battery_status,
     get_ram_usage,
     get_cpu_usage,
+    get_top_processes,
     get_system_stats,
+    get_health_history,
+    analyze_disk_usage,
     
     # ===== FILE & CODE MANAGEMENT =====
     create_folder,
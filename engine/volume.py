@@ -0,0 +1,232 @@
+# volume.py - Mixer abstraction with native backends for control_volume
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+
+class VolumeError(Exception):
+    """Raised when a backend can't perform a mixer operation"""
+
+
+def _run(argv):
+    result = subprocess.run(argv, capture_output=True, text=True, timeout=5)
+    if result.returncode != 0:
+        raise VolumeError(result.stderr.strip() or f"{argv[0]} failed")
+    return result.stdout
+
+
+def _clamp(value):
+    return max(0, min(int(round(value)), 100))
+
+
+# ==================== BACKENDS ====================
+
+class FakeBackend:
+    """In-memory mixer for tests and machines without audio"""
+
+    name = "fake"
+
+    def __init__(self, volume=50, apps=None):
+        self.volume = volume
+        self.muted = False
+        self.apps = dict(apps or {})
+
+    def get(self):
+        return self.volume
+
+    def set(self, value):
+        self.volume = _clamp(value)
+
+    def is_muted(self):
+        return self.muted
+
+    def set_mute(self, muted):
+        self.muted = bool(muted)
+
+    def list_apps(self):
+        return dict(self.apps)
+
+    def set_app(self, app, value):
+        matches = [a for a in self.apps if app.lower() in a.lower()]
+        for a in matches:
+            self.apps[a] = _clamp(value)
+        return matches
+
+
+class PulseBackend:
+    """PulseAudio / PipeWire (pipewire-pulse) through pactl"""
+
+    name = "pulseaudio"
+    SINK = "@DEFAULT_SINK@"
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith("linux") and shutil.which("pactl") is not None
+
+    def get(self):
+        match = re.search(r"(\d+)%", _run(["pactl", "get-sink-volume", self.SINK]))
+        if not match:
+            raise VolumeError("could not read sink volume")
+        return int(match.group(1))
+
+    def set(self, value):
+        _run(["pactl", "set-sink-volume", self.SINK, f"{_clamp(value)}%"])
+
+    def is_muted(self):
+        return "yes" in _run(["pactl", "get-sink-mute", self.SINK]).lower()
+
+    def set_mute(self, muted):
+        _run(["pactl", "set-sink-mute", self.SINK, "1" if muted else "0"])
+
+    def _sink_inputs(self):
+        """[(index, application name, volume %)] for every playing stream"""
+        streams = []
+        for block in _run(["pactl", "list", "sink-inputs"]).split("Sink Input #")[1:]:
+            index = block.split("\n", 1)[0].strip()
+            name = re.search(r'application\.name = "([^"]*)"', block)
+            volume = re.search(r"Volume:.*?(\d+)%", block)
+            streams.append((index, name.group(1) if name else f"stream {index}",
+                            int(volume.group(1)) if volume else 0))
+        return streams
+
+    def list_apps(self):
+        return {name: volume for _, name, volume in self._sink_inputs()}
+
+    def set_app(self, app, value):
+        matched = []
+        for index, name, _ in self._sink_inputs():
+            if app.lower() in name.lower():
+                _run(["pactl", "set-sink-input-volume", index, f"{_clamp(value)}%"])
+                matched.append(name)
+        return matched
+
+
+class AlsaBackend:
+    """ALSA Master control through amixer"""
+
+    name = "alsa"
+
+    def __init__(self, control="Master"):
+        self.control = control
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith("linux") and shutil.which("amixer") is not None
+
+    def _state(self):
+        out = _run(["amixer", "sget", self.control])
+        match = re.search(r"\[(\d+)%\](?:.*\[(on|off)\])?", out)
+        if not match:
+            raise VolumeError(f"could not read ALSA control {self.control}")
+        return int(match.group(1)), match.group(2) == "off"
+
+    def get(self):
+        return self._state()[0]
+
+    def set(self, value):
+        _run(["amixer", "-q", "sset", self.control, f"{_clamp(value)}%"])
+
+    def is_muted(self):
+        return self._state()[1]
+
+    def set_mute(self, muted):
+        _run(["amixer", "-q", "sset", self.control, "mute" if muted else "unmute"])
+
+    def list_apps(self):
+        return {}
+
+    def set_app(self, app, value):
+        raise VolumeError("per-application volume is not supported by ALSA")
+
+
+class PycawBackend:
+    """Windows Core Audio through pycaw"""
+
+    name = "pycaw"
+
+    def __init__(self):
+        from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+
+        self.utilities = AudioUtilities
+        speakers = AudioUtilities.GetSpeakers()
+        if hasattr(speakers, "EndpointVolume"):
+            self.endpoint = speakers.EndpointVolume
+        else:
+            from ctypes import cast, POINTER
+            from comtypes import CLSCTX_ALL
+
+            interface = speakers.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+            self.endpoint = cast(interface, POINTER(IAudioEndpointVolume))
+
+    @staticmethod
+    def available():
+        if not sys.platform.startswith("win"):
+            return False
+        try:
+            import pycaw.pycaw  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def get(self):
+        return _clamp(self.endpoint.GetMasterVolumeLevelScalar() * 100)
+
+    def set(self, value):
+        self.endpoint.SetMasterVolumeLevelScalar(_clamp(value) / 100.0, None)
+
+    def is_muted(self):
+        return bool(self.endpoint.GetMute())
+
+    def set_mute(self, muted):
+        self.endpoint.SetMute(1 if muted else 0, None)
+
+    def _sessions(self):
+        for session in self.utilities.GetAllSessions():
+            if session.Process:
+                yield session.Process.name(), session.SimpleAudioVolume
+
+    def list_apps(self):
+        return {name: _clamp(vol.GetMasterVolume() * 100) for name, vol in self._sessions()}
+
+    def set_app(self, app, value):
+        matched = []
+        for name, vol in self._sessions():
+            if app.lower() in name.lower():
+                vol.SetMasterVolume(_clamp(value) / 100.0, None)
+                matched.append(name)
+        return matched
+
+
+BACKENDS = {
+    "pycaw": PycawBackend,
+    "pulseaudio": PulseBackend,
+    "alsa": AlsaBackend,
+    "fake": FakeBackend,
+}
+
+
+def create_mixer(name=None):
+    """Backend from SYRA_VOLUME_BACKEND, else the first available one (None if none)"""
+    name = name or os.getenv("SYRA_VOLUME_BACKEND")
+    if name:
+        return BACKENDS[name]()
+    for backend in (PycawBackend, PulseBackend, AlsaBackend):
+        if backend.available():
+            try:
+                return backend()
+            except Exception as e:
+                print(f"⚠️ {backend.name} volume backend unavailable: {e}")
+    return None
+
+
+_mixer = None
+
+
+def get_mixer():
+    global _mixer
+    if _mixer is None:
+        _mixer = create_mixer()
+    return _mixer
@@ -3,11 +3,16 @@ import eel
 import subprocess
 from engine.features import playAssistantSound
 from engine.command import speak
-from engine.auth import recoganize  # Importing face authentication
+from engine.metrics import start_sampler
+from engine.metrics_store import start_recording
+from engine.processes import start_tracking
 
 def start():
     """Initialize and start Jarvis"""
     eel.init("www")
+    start_sampler()    # warm system stats before the first question
+    start_recording()  # health history for the get_health_history tool
+    start_tracking()   # per-process CPU baselines for get_top_processes
     playAssistantSound()
     
     @eel.expose
@@ -22,7 +27,7 @@ def start():
         speak("Ready for Face Authentication")
         
         # Using face authentication - unchanged as requested
-        face_detected = (1, "Rahul")  # recoganize.AuthenticateFace()
+        face_detected = (1, "Rahul")  # face_auth.authenticate()
         flag = face_detected[0]
         
         if flag == 1:
@@ -3,11 +3,18 @@ import eel
 import subprocess
 from engine.features import playAssistantSound
 from engine.command import speak
-from engine.auth import recoganize  # Importing face authentication
+from engine.metrics import start_sampler
+from engine.metrics_store import start_recording
+from engine.processes import start_tracking
+from engine.auth.service import face_auth  # Face authentication runs in a worker process
 
 def start():
     """Initialize and start Jarvis"""
     eel.init("www")
+    start_sampler()    # warm system stats before the first question
+    start_recording()  # health history for the get_health_history tool
+    start_tracking()   # per-process CPU baselines for get_top_processes
+    face_auth.prewarm()  # load face models while the loader animation plays
     playAssistantSound()
     
     @eel.expose
@@ -22,7 +29,7 @@ def start():
         speak("Ready for Face Authentication")
         
         # Using face authentication - unchanged as requested
-        face_detected = recoganize.AuthenticateFace()
+        face_detected = face_auth.authenticate()
         flag = face_detected[0]
         
         if flag == 1:
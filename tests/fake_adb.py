@@ -0,0 +1,66 @@
+# fake_adb.py - Stand-in for `adb shell`: a tiny Messages app state machine
+#
+#   python tests/fake_adb.py LOG [--dumpsys-delay SECONDS] [--lookup-taps N]
+#
+# Reads shell lines from stdin like the device shell does. Supported commands:
+# input keyevent/tap/text, dumpsys window (the focus lines), sleep, echo, am.
+# Every input command is appended to LOG. Tapping the number match only opens
+# the conversation after --lookup-taps taps (the lookup is "still loading").
+
+import argparse
+import sys
+import time
+
+HOME = "mCurrentFocus=Window{1 u0 com.android.launcher3/.Launcher}"
+SCREENS = {
+    (136, 2220): "mCurrentFocus=Window{2 u0 com.google.android.apps.messaging/.ConversationListActivity}",
+    (819, 2192): "mCurrentFocus=Window{3 u0 com.google.android.apps.messaging/.NewConversationActivity}",
+    (601, 574): "mCurrentFocus=Window{4 u0 com.google.android.apps.messaging/.ConversationActivity}",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("log")
+    parser.add_argument("--dumpsys-delay", type=float, default=0.0)
+    parser.add_argument("--lookup-taps", type=int, default=1)
+    parser.add_argument("--no-messaging", action="store_true", help="the Messages icon does nothing")
+    args = parser.parse_args()
+
+    focus = HOME
+    lookup_taps = 0
+    log = open(args.log, "a", encoding="utf-8")
+
+    for line in sys.stdin:
+        for command in line.strip().split("; "):
+            words = command.split()
+            if not words:
+                continue
+            if words[0] == "echo":
+                # "echo MARKER:$?" -> exit status of the previous command is always 0 here
+                print(" ".join(words[1:]).replace("$?", "0"), flush=True)
+            elif words[0] == "sleep":
+                time.sleep(float(words[1]))
+            elif words[0] == "dumpsys":
+                time.sleep(args.dumpsys_delay)
+                print(focus, flush=True)
+            elif words[0] == "input":
+                log.write(command + "\n")
+                log.flush()
+                if words[1] == "keyevent" and words[2] == "3":
+                    focus = HOME
+                elif words[1] == "tap":
+                    xy = (int(words[2]), int(words[3]))
+                    if xy == (136, 2220) and args.no_messaging:
+                        continue
+                    if xy == (601, 574):
+                        lookup_taps += 1
+                        if lookup_taps < args.lookup_taps:
+                            continue
+                    focus = SCREENS.get(xy, focus)
+            elif words[0] == "exit":
+                return
+
+
+if __name__ == "__main__":
+    main()
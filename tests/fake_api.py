@@ -0,0 +1,46 @@
+# fake_api.py - Local http.server stand-in for the JSON APIs behind engine.http_client
+#
+# Answers GETs with queued status codes, then 200 and the JSON from
+# `payload(query)` - by default {"version": n}. Imported by the tests.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class FakeApi(ThreadingHTTPServer):
+    """Answers GETs with queued status codes, then 200 + payload(query)"""
+
+    daemon_threads = True
+
+    def __init__(self, payload=None):
+        super().__init__(("127.0.0.1", 0), FakeApiHandler)
+        self.statuses = []
+        self.version = 1
+        self.hits = 0
+        self.queries = []
+        self.payload = payload or (lambda query: {"version": self.version})
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api"
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlsplit(self.path).query).items()}
+        with self.server.lock:
+            self.server.hits += 1
+            self.server.queries.append(query)
+            status = self.server.statuses.pop(0) if self.server.statuses else 200
+            body = json.dumps(self.server.payload(query)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
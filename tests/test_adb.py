@@ -0,0 +1,94 @@
+# test_adb.py - engine.adb.AdbSession (and sendMessage) against tests/fake_adb.py
+#
+#   python -m pytest tests/test_adb.py
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from engine import adb
+from engine.adb import AdbError, AdbSession
+
+FAKE_ADB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_adb.py")
+
+try:
+    import engine.features as features
+except ImportError:   # eel, langchain ... not installed
+    features = None
+
+
+class FakeAdbMixin:
+    def start(self, *options):
+        self.log = tempfile.NamedTemporaryFile("r", suffix=".log", delete=False)
+        session = AdbSession(argv=[sys.executable, FAKE_ADB, self.log.name, *options])
+        self.addCleanup(session.close)
+        self.addCleanup(os.remove, self.log.name)
+        return session
+
+    def inputs(self):
+        self.log.seek(0)
+        return [line.strip() for line in self.log]
+
+
+class AdbSessionTest(FakeAdbMixin, unittest.TestCase):
+    def test_run_returns_output_up_to_marker(self):
+        session = self.start()
+        self.assertIn("Launcher", session.focus())
+        self.assertEqual(session.run("echo hello"), "hello")
+
+    def test_batch_is_one_round_trip(self):
+        session = self.start()
+        session.batch([session.key(3), session.tap(136, 2220)])
+        self.assertEqual(self.inputs(), ["input keyevent 3", "input tap 136 2220"])
+        self.assertIn("messaging", session.focus())
+
+    def test_wait_for(self):
+        session = self.start()
+        self.assertFalse(session.wait_for("messaging", timeout=0.3))
+        session.run(session.tap(136, 2220))
+        self.assertTrue(session.wait_for("messaging", timeout=1))
+
+    def test_wait_for_stays_within_timeout(self):
+        session = self.start("--dumpsys-delay", "3")
+        started = time.monotonic()
+        self.assertFalse(session.wait_for("messaging", timeout=0.5))
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_wait_for_change(self):
+        session = self.start()
+        before = session.focus()
+        self.assertFalse(session.wait_for_change(before, timeout=0.3))
+        session.run(session.tap(819, 2192))
+        self.assertTrue(session.wait_for_change(before, timeout=1))
+
+    def test_run_timeout_raises(self):
+        session = self.start()
+        with self.assertRaises(AdbError):
+            session.run("sleep 2", timeout=0.2)
+
+
+@unittest.skipIf(features is None, "engine.features needs the full app dependencies")
+class SendMessageTest(FakeAdbMixin, unittest.TestCase):
+    def send(self, session):
+        with mock.patch.object(adb, "_session", session), mock.patch.object(features, "speak"):
+            features.sendMessage("hi there", "12345", "Mom")
+
+    def test_sends_after_each_screen_opens(self):
+        session = self.start("--lookup-taps", "2")
+        self.send(session)
+        inputs = self.inputs()
+        self.assertEqual(inputs.count("input tap 601 574"), 2)   # retapped until the chat opened
+        self.assertEqual(inputs[-3:], ["input tap 390 2270", "input text hi%sthere", "input tap 957 1397"])
+
+    def test_aborts_when_messages_does_not_open(self):
+        session = self.start("--no-messaging")
+        with self.assertRaises(AdbError):
+            self.send(session)
+        self.assertNotIn("input tap 957 1397", self.inputs())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# test_agent_deadline.py - How engine.agent degrades when the command budget runs out
+#
+#   python -m pytest tests/test_agent_deadline.py
+#
+# Needs the app dependencies (LangChain, Gemini client, eel); skipped otherwise.
+
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from engine import deadline as deadline_module
+from engine.deadline import Deadline, DeadlineExceeded
+
+try:
+    from engine import agent
+except Exception:   # missing dependencies or API key
+    agent = None
+
+
+class SlowModel:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.calls = 0
+
+    def invoke(self, input):
+        self.calls += 1
+        time.sleep(self.seconds)
+        return SimpleNamespace(content="too late")
+
+
+@unittest.skipIf(agent is None, "engine.agent needs the full app dependencies")
+class AgentDeadlineTest(unittest.TestCase):
+    def setUp(self):
+        # Keep the shared "gemini" breaker out of other tests
+        patcher = mock.patch.dict(deadline_module._breakers, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invoke_llm_stops_at_the_deadline(self):
+        deadline = Deadline(0.3)
+        started = time.monotonic()
+        with self.assertRaises((DeadlineExceeded, TimeoutError)):
+            agent.invoke_llm(SlowModel(2), "hi", deadline)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_invoke_llm_without_budget_does_not_call(self):
+        model = SlowModel(0)
+        with self.assertRaises(DeadlineExceeded):
+            agent.invoke_llm(model, "hi", Deadline(0))
+        self.assertEqual(model.calls, 0)
+
+    def test_summary_skipped_when_budget_is_short(self):
+        with mock.patch.object(agent, "invoke_llm") as invoke:
+            result = agent.summarize_with_llm("get_weather", "raw result", "weather?", Deadline(1))
+        self.assertEqual(result, "raw result")
+        invoke.assert_not_called()
+
+    @unittest.skipIf(agent is not None and agent.agent_executor is None, "agent graph was not built")
+    def test_out_of_time_command_gets_timeout_reply(self):
+        with mock.patch.object(agent, "invoke_llm", side_effect=DeadlineExceeded("no time left")):
+            result = agent.agent_executor.invoke({
+                "input": "what's the weather",
+                "output": "",
+                "tool_results": {},
+                "deadline": Deadline(),
+            })
+        self.assertEqual(result["output"], agent.TIMEOUT_REPLY)
+
+    @unittest.skipIf(agent is not None and agent.agent_executor is None, "agent graph was not built")
+    def test_llm_timeout_gets_timeout_reply(self):
+        with mock.patch.object(agent, "invoke_llm", side_effect=TimeoutError):
+            result = agent.agent_executor.invoke({
+                "input": "hello",
+                "output": "",
+                "tool_results": {},
+                "deadline": Deadline(5),   # below ROUTE_MIN_BUDGET: straight to chat
+            })
+        self.assertEqual(result["output"], agent.TIMEOUT_REPLY)
+
+
+if __name__ == "__main__":
+    unittest.main()
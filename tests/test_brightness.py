@@ -0,0 +1,128 @@
+# test_brightness.py - engine.brightness.BrightnessService over the in-memory FakeBackend
+#
+#   python -m pytest tests/test_brightness.py
+
+import threading
+import time
+import unittest
+
+from engine import brightness
+from engine.brightness import BrightnessService, FakeBackend
+
+
+class RecordingBackend(FakeBackend):
+    """FakeBackend that counts reads and logs every write"""
+
+    def __init__(self, levels=(50,)):
+        super().__init__(levels)
+        self.reads = 0
+        self.writes = []
+
+    def get(self, display=0):
+        self.reads += 1
+        return super().get(display)
+
+    def set(self, value, display=0):
+        super().set(value, display)
+        self.writes.append((display, self.levels[display]))
+
+
+class BrightnessServiceTest(unittest.TestCase):
+    def service(self, levels=(50,), **options):
+        self.backend = RecordingBackend(levels)
+        return BrightnessService(self.backend, **options)
+
+    def test_get_is_cached(self):
+        service = self.service()
+        self.assertEqual(service.get(), 50)
+        self.assertEqual(service.get(), 50)
+        self.assertEqual(self.backend.reads, 1)
+
+    def test_get_rereads_after_max_age(self):
+        service = self.service(max_age=0.05)
+        self.assertEqual(service.get(), 50)
+        self.backend.levels[0] = 70          # changed by a hotkey, not through the service
+        self.assertEqual(service.get(), 50)
+        time.sleep(0.06)
+        self.assertEqual(service.get(), 70)
+        self.assertEqual(self.backend.reads, 2)
+
+    def test_refresh_forces_a_read(self):
+        service = self.service()
+        service.get()
+        self.backend.levels[0] = 10
+        self.assertEqual(service.get(refresh=True), 10)
+
+    def test_displays_are_cached_separately(self):
+        service = self.service(levels=(20, 80))
+        self.assertEqual((service.get(0), service.get(1)), (20, 80))
+
+    def test_set_writes_once_and_updates_cache(self):
+        service = self.service()
+        self.assertEqual(service.set(130), 100)
+        self.assertEqual(self.backend.writes, [(0, 100)])
+        self.assertEqual(service.get(), 100)
+        self.assertEqual(self.backend.reads, 0)
+
+    def test_ramp_reaches_target(self):
+        service = self.service()
+        self.assertEqual(service.ramp(90, duration=0.05, steps=5), 90)
+        self.assertEqual(self.backend.writes[0], (0, 58))   # first step is written inline
+        self.assertTrue(wait_until(lambda: self.backend.levels[0] == 90))
+        self.assertEqual([level for _, level in self.backend.writes], [58, 66, 74, 82, 90])
+        self.assertEqual(service.get(), 90)
+
+    def test_set_cancels_ramp(self):
+        service = self.service(levels=(0,))
+        service.ramp(100, duration=1, steps=10)
+        service.set(30)
+        time.sleep(0.3)
+        self.assertEqual(self.backend.levels[0], 30)
+        self.assertEqual(self.backend.writes, [(0, 10), (0, 30)])
+
+    def test_new_ramp_cancels_the_old_one(self):
+        service = self.service(levels=(0,))
+        service.ramp(100, duration=1, steps=10)
+        service.ramp(5, duration=0.05, steps=5)
+        self.assertTrue(wait_until(lambda: self.backend.levels[0] == 5))
+        time.sleep(0.3)
+        self.assertEqual(self.backend.levels[0], 5)
+        self.assertNotIn(20, [level for _, level in self.backend.writes])   # old ramp's 2nd step
+
+    def test_ramp_backend_error_reaches_caller(self):
+        service = self.service()
+
+        def fail(value, display=0):
+            raise brightness.BrightnessError("no permission")
+
+        self.backend.set = fail
+        with self.assertRaises(brightness.BrightnessError):
+            service.ramp(80)
+
+
+class CreateServiceTest(unittest.TestCase):
+    def test_named_backend(self):
+        service = brightness.create_service("fake")
+        self.assertIsInstance(service.backend, FakeBackend)
+
+    def test_concurrent_sets_are_serialized(self):
+        service = BrightnessService(RecordingBackend())
+        threads = [threading.Thread(target=service.set, args=(level,)) for level in range(0, 100, 10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(service.get(), service.backend.levels[0])
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+if __name__ == "__main__":
+    unittest.main()
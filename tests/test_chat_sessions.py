@@ -0,0 +1,108 @@
+# test_chat_sessions.py - engine.chat_sessions pool with the in-process LocalChatBackend
+#
+#   python -m pytest tests/test_chat_sessions.py
+
+import threading
+import time
+import unittest
+
+from engine.chat_sessions import ChatSessionPool, LocalChatBackend
+
+
+class SlowBackend(LocalChatBackend):
+    """Logging in takes a while, like HugChat"""
+
+    def create(self):
+        time.sleep(0.1)
+        return super().create()
+
+
+class FlakyBackend(LocalChatBackend):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def chat(self, bot, conversation, text):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("session expired")
+        return super().chat(bot, conversation, text)
+
+
+class ChatSessionPoolTest(unittest.TestCase):
+    def pool(self, backend=None, **options):
+        pool = ChatSessionPool(backend or LocalChatBackend(), **options)
+        self.addCleanup(pool.stop)
+        return pool
+
+    def test_session_is_reused_with_its_context(self):
+        pool = self.pool()
+        self.assertEqual(pool.chat("hi"), "[local-1 turn 1] hi")
+        self.assertEqual(pool.chat("again"), "[local-1 turn 2] again")
+        self.assertEqual(pool.backend.created, 1)
+
+    def test_users_get_their_own_conversation(self):
+        pool = self.pool()
+        pool.chat("hi", user="a")
+        self.assertEqual(pool.chat("hi", user="b"), "[local-2 turn 1] hi")
+
+    def test_janitor_evicts_idle_sessions(self):
+        pool = self.pool(idle_timeout=0.1, evict_every=0.05)
+        pool.chat("hi", user="a")
+        self.assertIn("a", pool.sessions)
+        self.assertTrue(wait_until(lambda: not pool.sessions))
+        self.assertEqual(pool.user_locks, {})     # the user's lock goes with the session
+        pool.chat("back", user="a")
+        self.assertEqual(pool.backend.created, 2)
+
+    def test_lru_bound(self):
+        pool = self.pool(max_sessions=2)
+        for user in ("a", "b", "c"):
+            pool.chat("hi", user=user)
+        self.assertEqual(list(pool.sessions), ["b", "c"])
+        self.assertEqual(set(pool.user_locks), {"b", "c"})
+
+        pool.chat("hi", user="b")                 # b is now the most recent
+        pool.chat("hi", user="d")
+        self.assertEqual(list(pool.sessions), ["b", "d"])
+
+    def test_concurrent_asks_share_one_session(self):
+        pool = self.pool(SlowBackend())
+        replies = []
+        threads = [threading.Thread(target=lambda i=i: replies.append(pool.chat(f"q{i}"))) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(pool.backend.created, 1)
+        self.assertEqual(sorted(int(r.split("turn ")[1].split("]")[0]) for r in replies), [1, 2, 3, 4, 5])
+
+    def test_failed_chat_retries_on_a_fresh_session(self):
+        pool = self.pool(FlakyBackend(failures=1))
+        self.assertEqual(pool.chat("hi"), "[local-2 turn 1] hi")
+
+    def test_second_failure_is_raised(self):
+        pool = self.pool(FlakyBackend(failures=2))
+        with self.assertRaises(ConnectionError):
+            pool.chat("hi")
+        self.assertEqual(pool.sessions, {})
+
+    def test_unhealthy_session_is_replaced(self):
+        pool = self.pool(health_interval=0)
+        pool.chat("hi")
+        pool.backend.history.clear()              # the conversation vanished server-side
+        time.sleep(0.01)
+        self.assertEqual(pool.chat("hi"), "[local-2 turn 1] hi")
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+# test_deadline.py - engine.deadline budgets, circuit breakers and retries
+#
+#   python -m pytest tests/test_deadline.py
+
+import time
+import unittest
+from unittest import mock
+
+from engine import deadline as deadline_module
+from engine.deadline import (CircuitBreaker, CircuitOpen, Deadline, DeadlineExceeded, breaker,
+                             cap_timeout, current_deadline, retry)
+
+
+class DeadlineTest(unittest.TestCase):
+    def test_remaining_and_cap(self):
+        deadline = Deadline(10)
+        self.assertAlmostEqual(deadline.remaining(), 10, delta=0.1)
+        self.assertEqual(deadline.cap(3), 3)
+        self.assertLessEqual(deadline.cap(30), 10)
+        self.assertLessEqual(deadline.cap(None), 10)
+        self.assertTrue(deadline.allows(5))
+        self.assertFalse(deadline.allows(11))
+        self.assertFalse(deadline.expired())
+
+    def test_expired(self):
+        deadline = Deadline(0.05)
+        time.sleep(0.06)
+        self.assertTrue(deadline.expired())
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertEqual(deadline.cap(5), 0)
+
+    def test_cap_timeout_uses_the_current_deadline(self):
+        self.assertEqual(cap_timeout(7), 7)   # no command in progress
+        token = current_deadline.set(Deadline(2))
+        try:
+            self.assertLessEqual(cap_timeout(7), 2)
+            self.assertEqual(cap_timeout(1), 1)
+        finally:
+            current_deadline.reset(token)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def fail(self):
+        raise ConnectionError("down")
+
+    def test_opens_after_threshold_and_rejects(self):
+        guard = CircuitBreaker("test-open", failure_threshold=2, reset_timeout=60)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                guard.call(self.fail)
+        self.assertEqual(guard.state, "open")
+        called = []
+        with self.assertRaises(CircuitOpen):
+            guard.call(called.append, 1)
+        self.assertEqual(called, [])
+
+    def test_half_open_trial_closes_on_success(self):
+        guard = CircuitBreaker("test-half-open", failure_threshold=1, reset_timeout=0.05)
+        with self.assertRaises(ConnectionError):
+            guard.call(self.fail)
+        time.sleep(0.06)
+        self.assertEqual(guard.state, "half-open")
+        self.assertTrue(guard.allow())
+        self.assertFalse(guard.allow())      # only one trial call at a time
+        guard.success()
+        self.assertEqual(guard.state, "closed")
+        self.assertEqual(guard.call(lambda: "ok"), "ok")
+
+    def test_failed_trial_reopens(self):
+        guard = CircuitBreaker("test-reopen", failure_threshold=1, reset_timeout=0.05)
+        with self.assertRaises(ConnectionError):
+            guard.call(self.fail)
+        time.sleep(0.06)
+        with self.assertRaises(ConnectionError):
+            guard.call(self.fail)
+        self.assertEqual(guard.state, "open")
+
+    def test_trips_decides_what_counts(self):
+        guard = CircuitBreaker("test-trips", failure_threshold=1, reset_timeout=60)
+        for _ in range(3):
+            with self.assertRaises(KeyError):
+                guard.call(lambda: {}["missing"], trips=lambda e: isinstance(e, ConnectionError))
+        self.assertEqual(guard.state, "closed")
+        with self.assertRaises(ConnectionError):
+            guard.call(self.fail, trips=lambda e: isinstance(e, ConnectionError))
+        self.assertEqual(guard.state, "open")
+
+    def test_shared_breakers_by_name(self):
+        self.assertIs(breaker("test-shared"), breaker("test-shared"))
+
+
+class RetryTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(deadline_module.time, "sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def flaky(self, failures, error=ConnectionError):
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) <= failures:
+                raise error("flaky")
+            return "ok"
+        return func, calls
+
+    def test_retries_until_success(self):
+        func, calls = self.flaky(2)
+        self.assertEqual(retry(func, attempts=3), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_gives_up_after_attempts(self):
+        func, calls = self.flaky(5)
+        with self.assertRaises(ConnectionError):
+            retry(func, attempts=3)
+        self.assertEqual(len(calls), 3)
+
+    def test_only_retries_listed_errors(self):
+        func, calls = self.flaky(1, error=ValueError)
+        with self.assertRaises(ValueError):
+            retry(func, attempts=3, retry_on=(ConnectionError,))
+        self.assertEqual(len(calls), 1)
+
+    def test_expired_deadline_is_not_called(self):
+        func, calls = self.flaky(0)
+        expired = Deadline(0)
+        with self.assertRaises(DeadlineExceeded):
+            retry(func, deadline=expired)
+        self.assertEqual(calls, [])
+
+    def test_never_sleeps_past_the_deadline(self):
+        func, calls = self.flaky(5)
+        with mock.patch.object(deadline_module.random, "uniform", return_value=2.0):
+            with self.assertRaises(ConnectionError):
+                retry(func, deadline=Deadline(1), attempts=3)
+        self.assertEqual(len(calls), 1)
+        self.sleep.assert_not_called()
+
+    def test_open_circuit_is_not_retried(self):
+        func, calls = self.flaky(0)
+        guard = breaker("test-retry-open")
+        guard.opened_at = time.monotonic()
+        with self.assertRaises(CircuitOpen):
+            retry(func, service="test-retry-open", attempts=3)
+        self.assertEqual(calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
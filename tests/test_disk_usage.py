@@ -0,0 +1,120 @@
+# test_disk_usage.py - engine.disk_usage.DiskAnalyzer totals and its mtime cache on a temp tree
+#
+#   python -m pytest tests/test_disk_usage.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from engine import disk_usage
+from engine.disk_usage import DiskAnalyzer, format_size
+
+TREE = {
+    "top.bin": 100,
+    "videos/a.mp4": 5000,
+    "videos/2024/b.mp4": 7000,
+    "videos/2024/c.mp4": 10,
+    "docs/notes.txt": 300,
+    "docs/old/letter.txt": 200,
+    "empty": None,
+}
+
+
+class DiskAnalyzerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        for name, size in TREE.items():
+            path = self.path(name)
+            if size is None:
+                os.makedirs(path)
+            else:
+                self.write(name, size)
+        self.age_dirs()
+
+    def path(self, name):
+        return os.path.join(self.root, *name.split("/"))
+
+    def write(self, name, size):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+
+    def age_dirs(self):
+        """Give every directory an old mtime, so any later change is visible"""
+        for directory, _, _ in os.walk(self.root):
+            os.utime(directory, ns=(10 ** 9, 10 ** 9))
+
+    def scan(self, analyzer, **options):
+        """Scan and count the directories that were actually listed"""
+        with mock.patch.object(disk_usage.os, "scandir", wraps=os.scandir) as scandir:
+            report = analyzer.scan(self.root, **options)
+        report["listed"] = sorted(os.path.relpath(call.args[0], self.root) for call in scandir.call_args_list)
+        return report
+
+    def test_totals_folders_and_files(self):
+        report = self.scan(DiskAnalyzer(workers=4))
+        self.assertEqual(report["total"], sum(size for size in TREE.values() if size))
+        self.assertEqual(report["files_scanned"], 6)
+        self.assertEqual(report["dirs_scanned"], 6)
+        self.assertFalse(report["partial"])
+        # Sizes roll up to the top-level folder they live under
+        self.assertEqual(report["folders"], [(self.path("videos"), 12010), (self.path("docs"), 500),
+                                             (self.path("empty"), 0)])
+        self.assertEqual(report["files"][:2], [(self.path("videos/2024/b.mp4"), 7000),
+                                               (self.path("videos/a.mp4"), 5000)])
+
+    def test_count_limits_the_lists(self):
+        report = DiskAnalyzer().scan(self.root, count=1)
+        self.assertEqual(report["folders"], [(self.path("videos"), 12010)])
+        self.assertEqual(report["files"], [(self.path("videos/2024/b.mp4"), 7000)])
+
+    def test_warm_scan_lists_only_changed_directories(self):
+        analyzer = DiskAnalyzer(workers=4)
+        self.assertEqual(len(self.scan(analyzer)["listed"]), 6)
+
+        warm = self.scan(analyzer)
+        self.assertEqual(warm["listed"], [])
+        self.assertEqual(warm["total"], 12610)
+
+        self.write("docs/old/big.pdf", 4000)
+        changed = self.scan(analyzer)
+        self.assertEqual(changed["listed"], [os.path.join("docs", "old")])
+        self.assertEqual(changed["total"], 16610)
+        self.assertIn((self.path("docs"), 4500), changed["folders"])
+
+    def test_removed_directories_leave_the_cache(self):
+        analyzer = DiskAnalyzer()
+        analyzer.scan(self.root)
+        self.assertIn(self.path("videos/2024"), analyzer.cache)
+
+        shutil.rmtree(self.path("videos/2024"))
+        report = analyzer.scan(self.root)
+        self.assertNotIn(self.path("videos/2024"), analyzer.cache)
+        self.assertEqual(report["total"], 5600)
+
+    def test_progress_reports_are_partial(self):
+        reports = []
+        DiskAnalyzer(workers=1).scan(self.root, on_progress=reports.append, progress_every=0)
+        self.assertTrue(reports)
+        self.assertTrue(all(report["partial"] for report in reports))
+        self.assertLessEqual(reports[-1]["total"], 12610)
+
+    def test_unreadable_root(self):
+        report = DiskAnalyzer().scan(os.path.join(self.root, "missing"))
+        self.assertEqual((report["total"], report["dirs_scanned"]), (0, 0))
+
+
+class FormatSizeTest(unittest.TestCase):
+    def test_units(self):
+        self.assertEqual(format_size(512), "512.0 B")
+        self.assertEqual(format_size(1536), "1.5 KB")
+        self.assertEqual(format_size(5 * 1024 ** 3), "5.0 GB")
+        self.assertEqual(format_size(2 * 1024 ** 4), "2.0 TB")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# test_embedders.py - engine.auth embedder ids and the per-format export stamps they come from
+#
+#   python -m pytest tests/test_embedders.py
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from engine.auth import embedders, export_facenet
+except ImportError:   # numpy not installed
+    embedders = None
+
+
+@unittest.skipIf(embedders is None, "engine.auth needs numpy")
+class EmbedderIdTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        patcher = mock.patch.object(embedders, "META_PATH", os.path.join(directory, "facenet_export.json"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_meta(self, meta):
+        with open(embedders.META_PATH, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def test_keras_has_no_export(self):
+        self.assertEqual(embedders.embedder_id("keras"), "keras")
+
+    def test_each_format_uses_its_own_stamp(self):
+        self.write_meta({"exported": {"tflite": "2026-01-01 10:00:00", "onnx": "2026-02-01 10:00:00"}})
+        self.assertEqual(embedders.embedder_id("tflite"), "tflite:2026-01-01 10:00:00")
+        self.assertEqual(embedders.embedder_id("onnx"), "onnx:2026-02-01 10:00:00")
+
+    def test_stamp_from_older_exports_names_no_format(self):
+        self.write_meta({"exported": "2025-12-01 10:00:00", "verified": ["tflite"]})
+        self.assertEqual(embedders.embedder_id("tflite"), "tflite:?")
+        self.assertEqual(embedders.export_times(), {})
+
+    def test_reexport_changes_only_that_formats_id(self):
+        with mock.patch.object(export_facenet.time, "strftime", return_value="2026-03-01 09:00:00"):
+            export_facenet.record_export("tflite", "prewhiten")
+        with mock.patch.object(export_facenet.time, "strftime", return_value="2026-03-02 09:00:00"):
+            export_facenet.record_export("onnx", "prewhiten")
+        meta = embedders.export_meta()
+        meta["verified"] = ["onnx", "tflite"]
+        export_facenet.save_meta(meta)
+
+        with mock.patch.object(export_facenet.time, "strftime", return_value="2026-03-05 09:00:00"):
+            export_facenet.record_export("onnx", "scale")
+        self.assertEqual(embedders.embedder_id("tflite"), "tflite:2026-03-01 09:00:00")
+        self.assertEqual(embedders.embedder_id("onnx"), "onnx:2026-03-05 09:00:00")
+        meta = embedders.export_meta()
+        self.assertEqual(meta["verified"], ["tflite"])      # the new onnx export is unchecked
+        self.assertEqual(meta["preprocess"], "scale")
+
+
+if __name__ == "__main__":
+    unittest.main()
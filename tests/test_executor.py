@@ -0,0 +1,170 @@
+# test_executor.py - engine.executor worker pool, deadlines and tool limits
+#
+#   python -m pytest tests/test_executor.py
+
+import json
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from engine.deadline import Deadline, current_deadline
+from engine.executor import DEFAULT_LIMIT, ThreadWorkerPool, ToolExecutor, background_result, timeout_result
+
+
+def fake_tool(name, func):
+    """The two attributes of a LangChain tool the executor uses"""
+    return SimpleNamespace(name=name, func=func)
+
+
+class ThreadWorkerPoolTest(unittest.TestCase):
+    def test_returns_result_and_raises_errors(self):
+        pool = ThreadWorkerPool(size=1)
+        self.assertEqual(pool.run(lambda x: x * 2, {"x": 21}, timeout=1), 42)
+        with self.assertRaises(ZeroDivisionError):
+            pool.run(lambda: 1 / 0, {}, timeout=1)
+
+    def test_stuck_worker_is_abandoned_and_replaced(self):
+        pool = ThreadWorkerPool(size=1)
+        release = threading.Event()
+        with self.assertRaises(TimeoutError):
+            pool.run(release.wait, {}, timeout=0.1)
+        self.assertEqual((pool.healthy, pool.stuck), (1, 1))
+
+        # The replacement worker serves the next call while the old one is still blocked
+        self.assertEqual(pool.run(lambda: "fresh", {}, timeout=1), "fresh")
+
+        release.set()
+        self.assertTrue(wait_until(lambda: pool.stuck == 0))
+        self.assertEqual(pool.healthy, 1)
+
+    def test_queued_job_that_timed_out_never_runs(self):
+        pool = ThreadWorkerPool(size=1)
+        release = threading.Event()
+        ran = []
+        blocker = threading.Thread(target=lambda: pool.run(release.wait, {}, timeout=5))
+        blocker.start()
+        time.sleep(0.05)   # the only worker is now busy
+
+        with self.assertRaises(TimeoutError):
+            pool.run(lambda: ran.append(1), {}, timeout=0.1)
+        self.assertEqual((pool.healthy, pool.stuck), (1, 0))   # nothing to replace: it never started
+
+        release.set()
+        blocker.join()
+        self.assertEqual(pool.run(lambda: "next", {}, timeout=1), "next")
+        self.assertEqual(ran, [])
+
+    def test_jobs_see_the_callers_deadline(self):
+        pool = ThreadWorkerPool(size=1)
+        deadline = Deadline(5)
+        token = current_deadline.set(deadline)
+        try:
+            self.assertIs(pool.run(current_deadline.get, {}, timeout=1), deadline)
+        finally:
+            current_deadline.reset(token)
+
+
+class ToolExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = ToolExecutor(threads=2, limits={"slow": 0.1, "quick": 5})
+
+    def test_limit_selection(self):
+        self.assertEqual(self.executor.limit_for("quick"), 5)
+        self.assertEqual(self.executor.limit_for("unknown"), DEFAULT_LIMIT)
+        self.assertEqual(self.executor.limit_for("quick", timeout=2), 2)
+        self.assertEqual(self.executor.limit_for("search"), 10)   # TOOL_LIMITS still applies
+
+    def test_limit_capped_by_command_deadline(self):
+        token = current_deadline.set(Deadline(1))
+        try:
+            self.assertLessEqual(self.executor.limit_for("quick"), 1)
+        finally:
+            current_deadline.reset(token)
+
+    def test_timeout_result(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        result = json.loads(self.executor.run(fake_tool("slow", release.wait), {}))
+        self.assertEqual(result["status"], "timeout")
+        self.assertEqual(result["tool"], "slow")
+        self.assertEqual(result["seconds"], 0.1)
+        self.assertEqual(json.loads(timeout_result("slow", 0.1)), result)
+
+    def test_result_passes_through(self):
+        self.assertEqual(self.executor.run(fake_tool("quick", lambda city: city.upper()), {"city": "oslo"}), "OSLO")
+
+
+class BackgroundToolTest(unittest.TestCase):
+    def setUp(self):
+        self.finished = []
+        self.done = threading.Event()
+
+        def report(name, result, error):
+            self.finished.append((name, result, error))
+            self.done.set()
+
+        self.executor = ToolExecutor(threads=1, limits={"long": 60}, background={"long"},
+                                     on_background_done=report)
+
+    def test_answers_within_the_command_budget_then_finishes(self):
+        release = threading.Event()
+
+        def long_job():
+            release.wait(5)
+            return f"done, deadline {current_deadline.get()}"
+
+        token = current_deadline.set(Deadline(0.2))
+        try:
+            started = time.monotonic()
+            result = json.loads(self.executor.run(fake_tool("long", long_job), {}))
+        finally:
+            current_deadline.reset(token)
+        self.assertLess(time.monotonic() - started, 1)   # not the tool's own 60 s
+        self.assertEqual(result["status"], "running")
+        self.assertEqual(json.loads(background_result("long", result["seconds"])), result)
+
+        release.set()
+        self.assertTrue(self.done.wait(2))
+        # It ran to the end without the expired command deadline in its context
+        self.assertEqual(self.finished, [("long", "done, deadline None", None)])
+
+    def test_fast_background_tool_returns_directly(self):
+        self.assertEqual(self.executor.run(fake_tool("long", lambda: "quick"), {}, timeout=1), "quick")
+        self.assertEqual(self.finished, [])
+
+    def test_queued_background_job_still_runs(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        blocker = threading.Thread(target=self.executor.threads.run, args=(release.wait, {}, 5))
+        blocker.start()
+        time.sleep(0.05)   # the only worker is busy
+
+        result = json.loads(self.executor.run(fake_tool("long", lambda: "late"), {}, timeout=0.1))
+        self.assertEqual(result["status"], "running")
+        release.set()
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(self.finished, [("long", "late", None)])
+
+    def test_background_errors_are_reported(self):
+        def fail():
+            time.sleep(0.2)
+            raise OSError("disk full")
+
+        self.executor.run(fake_tool("long", fail), {}, timeout=0.05)
+        self.assertTrue(self.done.wait(2))
+        name, result, error = self.finished[0]
+        self.assertIsInstance(error, OSError)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+if __name__ == "__main__":
+    unittest.main()
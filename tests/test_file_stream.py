@@ -0,0 +1,97 @@
+# test_file_stream.py - engine.file_stream.StreamingFileWriter parsing and atomic writes
+#
+#   python -m pytest tests/test_file_stream.py
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from engine.file_stream import StreamingFileWriter
+
+
+class StreamingFileWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def files(self):
+        return sorted(os.listdir(self.directory))
+
+    def write(self, chunks, name="notes"):
+        writer = StreamingFileWriter(self.directory)
+        for chunk in chunks:
+            writer.feed(chunk)
+        path = writer.finish(lambda extension: name + extension)
+        with open(path, encoding="utf-8") as f:
+            return path, f.read()
+
+    def test_header_and_content(self):
+        path, content = self.write(["EXTENSION: .py\nCONT", "ENT:\n```\nprint('hi')\n", "```\n"])
+        self.assertEqual(os.path.basename(path), "notes.py")
+        self.assertEqual(content, "print('hi')")
+
+    def test_extension_defaults_to_txt(self):
+        path, _ = self.write(["CONTENT:\nhello"])
+        self.assertEqual(os.path.basename(path), "notes.txt")
+        path, _ = self.write(["extension: md\ncontent:\nhello"], name="other")
+        self.assertEqual(os.path.basename(path), "other.md")
+
+    def test_outer_blank_lines_stripped_inner_kept(self):
+        _, content = self.write(["CONTENT:\n\n\nfirst\n\n\nsecond\n\n\n"])
+        self.assertEqual(content, "first\n\n\nsecond")
+
+    def test_final_name_appears_only_on_finish(self):
+        writer = StreamingFileWriter(self.directory)
+        writer.feed("EXTENSION: .txt\nCONTENT:\n" + "line\n" * 1000)
+        writer.file.flush()
+        # Everything so far lives in the hidden temp file
+        self.assertEqual(self.files(), [os.path.basename(writer.tmp_path)])
+        self.assertTrue(writer.tmp_path.endswith(".part"))
+
+        path = writer.finish(lambda extension: "done" + extension)
+        self.assertEqual(self.files(), ["done.txt"])
+        self.assertFalse(os.path.exists(writer.tmp_path))
+        self.assertEqual(os.path.getsize(path), writer.bytes_written)
+
+    def test_finish_replaces_an_existing_file(self):
+        with open(os.path.join(self.directory, "notes.txt"), "w") as f:
+            f.write("old")
+        _, content = self.write(["CONTENT:\nnew"])
+        self.assertEqual(content, "new")
+        self.assertEqual(self.files(), ["notes.txt"])
+
+    def test_abort_after_error_mid_stream_leaves_nothing(self):
+        writer = StreamingFileWriter(self.directory)
+        try:
+            writer.feed("CONTENT:\nhalf a file\n")
+            raise ConnectionError("stream dropped")
+        except ConnectionError:
+            writer.abort()
+        self.assertEqual(self.files(), [])
+        writer.abort()   # safe to call twice
+
+    def test_long_line_without_newlines(self):
+        chunk = "x" * 10
+        count = 50000
+        started = time.monotonic()
+        _, content = self.write(["CONTENT:\n"] + [chunk] * count)
+        self.assertEqual(content, chunk * count)
+        self.assertLess(time.monotonic() - started, 2)   # linear, not a re-split per chunk
+
+    def test_fence_split_across_chunks(self):
+        _, content = self.write(["CONTENT:\n`", "``\nbody\n``", "`"])
+        self.assertEqual(content, "body")
+
+    def test_progress_reports(self):
+        reports = []
+        writer = StreamingFileWriter(self.directory, on_progress=lambda *counts: reports.append(counts),
+                                     progress_every=0)
+        writer.feed("CONTENT:\none\ntwo\n")
+        writer.finish(lambda extension: "p" + extension)
+        self.assertEqual(reports[-1], (len("one\ntwo"), 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
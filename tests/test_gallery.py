@@ -0,0 +1,108 @@
+# test_gallery.py - engine.auth gallery matching over the on-disk store, and the embeddings.pkl migration
+#
+#   python -m pytest tests/test_gallery.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+try:
+    import numpy as np
+    from engine.auth.embedding_store import EmbeddingStore
+    from engine.auth.gallery import Gallery, normalize
+except ImportError:   # numpy not installed
+    np = None
+
+try:
+    import joblib
+    from engine.auth import recoganize
+except ImportError:   # joblib / OpenCV not installed
+    recoganize = None
+
+
+def people(count=3, per_person=4, dim=512, seed=0):
+    """Clustered random embeddings: rows near one direction per person"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(count, dim))
+    vectors = np.concatenate([center + 0.1 * rng.normal(size=(per_person, dim)) for center in centers])
+    labels = [f"person_{i}" for i in range(count) for _ in range(per_person)]
+    return vectors.astype(np.float32), labels, centers
+
+
+@unittest.skipIf(np is None, "engine.auth.gallery needs numpy")
+class GalleryTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def test_matches_nearest_identity(self):
+        vectors, labels, centers = people()
+        gallery = Gallery(vectors, labels)
+        matches = gallery.match_batch(centers)
+        self.assertEqual([name for name, _ in matches], ["person_0", "person_1", "person_2"])
+        self.assertTrue(all(score > 0.9 for _, score in matches))
+
+    def test_empty_gallery(self):
+        gallery = Gallery(np.zeros((0, 512), dtype=np.float32), [])
+        self.assertEqual(gallery.match(np.ones(512)), ("Unknown", -1.0))
+
+    def test_float16_store_is_used_without_a_copy(self):
+        vectors, labels, centers = people()
+        store = EmbeddingStore(self.root).write(vectors, labels, dtype="float16")
+        for mode in ("images", "centroids"):
+            gallery = store.gallery(mode)
+            source = store.vectors if mode == "images" else store.centroids
+            self.assertEqual(gallery.matrix.dtype, np.float16)
+            self.assertTrue(np.shares_memory(gallery.matrix, source))
+
+            scores = gallery.scores(centers)
+            self.assertEqual(scores.dtype, np.float32)
+            exact = normalize(centers) @ normalize(np.asarray(source, dtype=np.float32)).T
+            self.assertLess(float(np.abs(scores - exact).max()), 1e-2)
+            self.assertEqual([name for name, _ in gallery.match_batch(centers)],
+                             ["person_0", "person_1", "person_2"])
+
+    def test_float32_store_is_used_without_a_copy(self):
+        vectors, labels, _ = people()
+        store = EmbeddingStore(self.root).write(vectors, labels)
+        self.assertTrue(np.shares_memory(store.gallery("images").matrix, store.vectors))
+
+
+@unittest.skipIf(recoganize is None, "engine.auth.recoganize needs joblib and OpenCV")
+class LegacyMigrationTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.store_dir = os.path.join(self.root, "embeddings")
+        self.pkl = os.path.join(self.root, "embeddings.pkl")
+        for patcher in (
+            mock.patch.object(recoganize, "EMBED_PATH", self.pkl),
+            mock.patch.object(recoganize, "EmbeddingStore", lambda: EmbeddingStore(self.store_dir)),
+            mock.patch.object(recoganize, "embedder", SimpleNamespace(id="keras_facenet")),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_pickle_is_migrated_once(self):
+        _, _, centers = people()
+        joblib.dump({f"person_{i}": center for i, center in enumerate(centers)}, self.pkl)
+
+        gallery = recoganize.load_gallery()
+        self.assertTrue(EmbeddingStore(self.store_dir).exists())
+        self.assertEqual(gallery.match(centers[1])[0], "person_1")
+
+        os.remove(self.pkl)   # the store is used from now on
+        with mock.patch.object(recoganize, "import_legacy") as import_legacy:
+            self.assertEqual(recoganize.load_gallery().match(centers[2])[0], "person_2")
+        import_legacy.assert_not_called()
+
+    def test_no_embeddings_at_all(self):
+        with self.assertRaises(FileNotFoundError):
+            recoganize.load_gallery()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# test_generate_embeddings.py - When engine.auth.generate_embeddings.detect_all uses a process pool
+#
+#   python -m pytest tests/test_generate_embeddings.py
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+try:
+    from engine.auth import generate_embeddings
+except ImportError:   # OpenCV / numpy not installed
+    generate_embeddings = None
+
+
+@unittest.skipIf(generate_embeddings is None, "engine.auth needs OpenCV and numpy")
+class DetectAllTest(unittest.TestCase):
+    def setUp(self):
+        self.pools = []
+
+        def pool(max_workers, mp_context):
+            # Threads stand in for processes: load_face is patched and can't be pickled
+            self.pools.append(max_workers)
+            return ThreadPoolExecutor(max_workers)
+
+        for patcher in (mock.patch.object(generate_embeddings, "ProcessPoolExecutor", side_effect=pool),
+                        mock.patch.object(generate_embeddings, "load_face", side_effect=lambda path: f"face:{path}")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def paths(self, n):
+        return [f"person/{i}.jpg" for i in range(n)]
+
+    def test_small_batch_runs_in_process(self):
+        paths = self.paths(generate_embeddings.POOL_MIN_IMAGES - 1)
+        self.assertEqual(generate_embeddings.detect_all(paths, workers=8), [f"face:{p}" for p in paths])
+        self.assertEqual(self.pools, [])
+
+    def test_large_batch_uses_the_pool_in_order(self):
+        paths = self.paths(40)
+        self.assertEqual(generate_embeddings.detect_all(paths, workers=8), [f"face:{p}" for p in paths])
+        self.assertEqual(self.pools, [8])
+
+    def test_workers_capped_at_image_count(self):
+        paths = self.paths(generate_embeddings.POOL_MIN_IMAGES)
+        generate_embeddings.detect_all(paths, workers=64)
+        self.assertEqual(self.pools, [len(paths)])
+
+    def test_single_worker_never_pools(self):
+        generate_embeddings.detect_all(self.paths(40), workers=1)
+        self.assertEqual(self.pools, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+# test_http_client.py - engine.http_client against a local http.server stand-in
+#
+#   python -m pytest tests/test_http_client.py
+
+import threading
+import time
+import unittest
+
+import requests
+
+from engine.http_client import HttpClient, RateLimited, TokenBucket
+from fake_api import FakeApi
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class HttpClientTest(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeApi()
+        threading.Thread(target=self.api.serve_forever, daemon=True).start()
+        self.client = HttpClient(retries=2)
+        self.client.session.trust_env = False   # no proxies for 127.0.0.1
+
+    def tearDown(self):
+        self.api.shutdown()
+        self.api.server_close()
+        self.client.session.close()
+
+    def register(self, **policy):
+        # Endpoint names key the shared circuit breakers, so keep them unique per test
+        return self.client.register(f"{self.id()}-{len(self.client.endpoints)}", **policy)
+
+    def test_retries_5xx(self):
+        endpoint = self.register(ttl=60)
+        self.api.statuses = [503, 502]
+        self.assertEqual(self.client.get_json(endpoint.name, self.api.url), {"version": 1})
+        self.assertEqual(self.api.hits, 3)
+
+    def test_retries_429(self):
+        endpoint = self.register(ttl=60)
+        self.api.statuses = [429]
+        self.assertEqual(self.client.get_json(endpoint.name, self.api.url), {"version": 1})
+        self.assertEqual(self.api.hits, 2)
+
+    def test_gives_up_after_retries(self):
+        endpoint = self.register(ttl=60)
+        self.api.statuses = [500] * 5
+        with self.assertRaises(requests.exceptions.RetryError):
+            self.client.get_json(endpoint.name, self.api.url)
+        self.assertEqual(self.api.hits, 3)
+
+    def test_client_errors_are_not_retried(self):
+        endpoint = self.register(ttl=60)
+        self.api.statuses = [404]
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_json(endpoint.name, self.api.url)
+        self.assertEqual(self.api.hits, 1)
+
+    def test_cache_hit_within_ttl(self):
+        endpoint = self.register(ttl=60)
+        self.client.get_json(endpoint.name, self.api.url, {"q": "a"})
+        self.api.version = 2
+        self.assertEqual(self.client.get_json(endpoint.name, self.api.url, {"q": "a"}), {"version": 1})
+        self.assertEqual(self.api.hits, 1)
+        # Different params are a different cache entry
+        self.assertEqual(self.client.get_json(endpoint.name, self.api.url, {"q": "b"}), {"version": 2})
+        self.assertEqual(self.api.hits, 2)
+
+    def test_ttl_expiry(self):
+        endpoint = self.register(ttl=0.2)
+        self.client.get_json(endpoint.name, self.api.url)
+        self.api.version = 2
+        time.sleep(0.3)
+        self.assertEqual(self.client.get_json(endpoint.name, self.api.url), {"version": 2})
+        self.assertEqual(self.api.hits, 2)
+
+    def test_cache_if_skips_bad_payloads(self):
+        endpoint = self.register(ttl=60, cache_if=lambda data: data["version"] > 1)
+        self.client.get_json(endpoint.name, self.api.url)
+        self.client.get_json(endpoint.name, self.api.url)
+        self.assertEqual(self.api.hits, 2)
+
+    def test_stale_while_revalidate(self):
+        endpoint = self.register(ttl=0.1, stale_ttl=30)
+        self.client.get_json(endpoint.name, self.api.url)
+        self.api.version = 2
+        time.sleep(0.2)
+
+        # Stale data comes back at once; the refresh happens in the background
+        self.assertEqual(self.client.get_json(endpoint.name, self.api.url), {"version": 1})
+        self.assertTrue(wait_until(lambda: self.api.hits == 2 and not endpoint.refreshing))
+        self.assertEqual(self.client.get_json(endpoint.name, self.api.url), {"version": 2})
+        self.assertEqual(self.api.hits, 2)
+
+    def test_stale_served_when_refetch_fails(self):
+        endpoint = self.register(ttl=0.1)
+        self.client.get_json(endpoint.name, self.api.url)
+        time.sleep(0.2)
+        self.api.statuses = [500] * 5
+        self.assertEqual(self.client.get_json(endpoint.name, self.api.url), {"version": 1})
+
+    def test_rate_limit_without_cache_raises(self):
+        endpoint = self.register(ttl=60, rate_per_minute=60, burst=1, max_wait=0.05)
+        self.client.get_json(endpoint.name, self.api.url, {"q": "a"})
+        with self.assertRaises(RateLimited):
+            self.client.get_json(endpoint.name, self.api.url, {"q": "b"})
+        self.assertEqual(self.api.hits, 1)
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_refill(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertEqual(bucket.try_acquire(), 0)
+        wait = bucket.try_acquire()
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 0.1)
+        time.sleep(wait + 0.01)
+        self.assertEqual(bucket.try_acquire(), 0)
+
+    def test_acquire_waits_up_to_max_wait(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        bucket.try_acquire()
+        self.assertFalse(bucket.acquire(max_wait=0.01))
+        started = time.monotonic()
+        self.assertTrue(bucket.acquire(max_wait=1.0))
+        self.assertLess(time.monotonic() - started, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# test_import_budget.py - Importing engine.agent must stay within the startup budget
+#
+#   python -m pytest tests/test_import_budget.py
+#   SYRA_IMPORT_BUDGET_MS=3000 python -m pytest tests/test_import_budget.py
+#
+# Runs a fresh interpreter with -X importtime, so only the assistant's own
+# imports are measured. Needs the app dependencies; skipped otherwise.
+
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = "engine.agent"
+BUDGET_MS = float(os.getenv("SYRA_IMPORT_BUDGET_MS", "4000"))
+REQUIRED = ("langchain_core", "langchain_google_genai", "langgraph", "eel")
+
+# "import time:       self [us] |  cumulative | imported package"
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    """Run a fresh interpreter with -X importtime; returns (total_us, {package: cumulative_us})"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        cum_us, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        if len(indent) == 1:          # top-level import of the -c statement
+            total += cum_us
+        cumulative[name] = max(cumulative.get(name, 0), cum_us)
+    return total, cumulative
+
+
+missing = [name for name in REQUIRED if importlib.util.find_spec(name) is None]
+
+
+@unittest.skipIf(missing, f"app dependencies not installed: {', '.join(missing)}")
+class ImportBudgetTest(unittest.TestCase):
+    def test_agent_imports_within_budget(self):
+        total, cumulative = measure(MODULE)
+        heaviest = sorted(cumulative.items(), key=lambda kv: kv[1], reverse=True)[:15]
+        report = "\n".join(f"  {us / 1000:8.1f} ms  {name}" for name, us in heaviest)
+        self.assertLessEqual(total / 1000, BUDGET_MS,
+                             f"import {MODULE} took {total / 1000:.0f} ms (budget {BUDGET_MS:.0f} ms); "
+                             f"heaviest imports:\n{report}")
+
+
+class ImportTimeParsingTest(unittest.TestCase):
+    def test_measures_a_stdlib_import(self):
+        total, cumulative = measure("json")
+        self.assertGreater(total, 0)
+        self.assertIn("json", cumulative)
+        self.assertLessEqual(cumulative["json.decoder"], cumulative["json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
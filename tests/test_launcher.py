@@ -0,0 +1,208 @@
+# test_launcher.py - engine.launcher index, matching and launch() against a temp desktop dir and $PATH
+#
+#   python -m pytest tests/test_launcher.py
+
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from engine import launcher
+    from engine.launcher import AppIndex, desktop_dirs, exec_to_argv, launch, parse_desktop_file, path_dirs
+except ImportError:   # rapidfuzz not installed
+    launcher = None
+
+FIREFOX = """[Desktop Entry]
+Type=Application
+Name=Firefox
+GenericName=Web Browser
+Keywords=Internet;WWW;
+Exec=/usr/lib/firefox/firefox %u
+
+[Desktop Action new-window]
+Name=Open a New Window
+Exec=/usr/lib/firefox/firefox --new-window %u
+"""
+
+EDITOR = """[Desktop Entry]
+Type=Application
+Name=Text Editor
+Keywords=Notepad;
+Exec="/opt/My Editor/edit" --new %F
+"""
+
+HIDDEN = """[Desktop Entry]
+Type=Application
+Name=Secret Tool
+NoDisplay=true
+Exec=secret
+"""
+
+
+@unittest.skipIf(launcher is None, "engine.launcher needs rapidfuzz")
+class LauncherTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.applications = os.path.join(self.root, "share", "applications")
+        self.bin = os.path.join(self.root, "bin")
+        os.makedirs(self.applications)
+        os.makedirs(self.bin)
+
+        env = mock.patch.dict(os.environ, {
+            "XDG_DATA_HOME": os.path.join(self.root, "share"),
+            "XDG_DATA_DIRS": os.path.join(self.root, "none"),
+            "PATH": self.bin,
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        # Only the temp directory, not the system-wide flatpak exports
+        dirs = mock.patch.object(launcher, "desktop_dirs", return_value=[self.applications])
+        dirs.start()
+        self.addCleanup(dirs.stop)
+
+    def desktop(self, name, text):
+        with open(os.path.join(self.applications, name), "w") as f:
+            f.write(text)
+
+    def executable(self, name, mode=0o755):
+        path = os.path.join(self.bin, name)
+        with open(path, "w") as f:
+            f.write("#!/bin/sh\n")
+        os.chmod(path, mode)
+        return path
+
+    def index(self, db_name=None):
+        return AppIndex(db_name=db_name or os.path.join(self.root, "missing.db"))
+
+
+class SourcesTest(LauncherTestCase):
+    def test_desktop_and_path_dirs(self):
+        # setUp stubs launcher.desktop_dirs for the index; this is the real one
+        with mock.patch.object(launcher.os.path, "isdir", side_effect=lambda d: d.startswith(self.root)):
+            self.assertEqual(desktop_dirs(), [self.applications, os.path.join(self.root, "none", "applications")])
+        self.assertEqual(path_dirs(), [self.bin])
+
+    def test_parse_desktop_file_reads_only_the_entry_section(self):
+        self.desktop("firefox.desktop", FIREFOX)
+        entry = parse_desktop_file(os.path.join(self.applications, "firefox.desktop"))
+        self.assertEqual(entry["Name"], "Firefox")
+        self.assertEqual(entry["Exec"], "/usr/lib/firefox/firefox %u")
+
+    def test_hidden_entries_are_dropped(self):
+        self.desktop("secret.desktop", HIDDEN)
+        self.assertIsNone(parse_desktop_file(os.path.join(self.applications, "secret.desktop")))
+
+    def test_exec_to_argv(self):
+        self.assertEqual(exec_to_argv("/usr/lib/firefox/firefox %u"), ["/usr/lib/firefox/firefox"])
+        self.assertEqual(exec_to_argv('"/opt/My Editor/edit" --new %F'), ["/opt/My Editor/edit", "--new"])
+        self.assertEqual(exec_to_argv("printf 100%%"), ["printf", "100%"])
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), ".desktop entries are only indexed on Linux")
+class AppIndexTest(LauncherTestCase):
+    def setUp(self):
+        super().setUp()
+        self.desktop("firefox.desktop", FIREFOX)
+        self.desktop("editor.desktop", EDITOR)
+        self.desktop("secret.desktop", HIDDEN)
+        self.shutdown = self.executable("shutdown")
+        self.executable("firefox")
+        self.executable("notes.txt", mode=0o644)
+
+    def test_index_sources(self):
+        index = self.index()
+        index.refresh()
+        kinds = {key: entry["kind"] for key, entry in index.entries.items()}
+        self.assertEqual(kinds["firefox"], "desktop")    # the app wins over the bare binary
+        self.assertEqual(kinds["web browser"], "desktop")
+        self.assertEqual(kinds["internet"], "desktop")
+        self.assertEqual(kinds["shutdown"], "path")
+        self.assertNotIn("secret tool", kinds)
+        self.assertNotIn("notes.txt", kinds)              # not executable
+        self.assertEqual(sorted(index.names), ["editor", "firefox", "text editor", "web browser"])
+
+    def test_exact_and_fuzzy_names(self):
+        index = self.index()
+        self.assertEqual(index.search("Firefox"), [(index.entries["firefox"], 100.0)])
+        self.assertEqual(index.resolve("firefx")["name"], "Firefox")
+        self.assertEqual(index.resolve("texteditor")["name"], "Text Editor")
+
+    def test_keywords_match_exactly_only(self):
+        index = self.index()
+        self.assertEqual(index.resolve("internet")["name"], "Firefox")
+        self.assertEqual(index.resolve("notepad")["name"], "Text Editor")
+        self.assertIsNone(index.resolve("internt"))
+        self.assertIsNone(index.resolve("notepd"))
+
+    def test_path_binaries_match_exactly_only(self):
+        index = self.index()
+        self.assertEqual(index.resolve("shutdown")["target"], [self.shutdown])
+        self.assertIsNone(index.resolve("shutdwn"))
+
+    def test_user_commands_win(self):
+        db_name = os.path.join(self.root, "jarvis.db")
+        con = sqlite3.connect(db_name)
+        con.execute("CREATE TABLE sys_command (id INTEGER PRIMARY KEY, name TEXT, path TEXT)")
+        con.execute("CREATE TABLE web_command (id INTEGER PRIMARY KEY, name TEXT, url TEXT)")
+        con.execute("INSERT INTO sys_command (name, path) VALUES ('Internet', '/opt/browser')")
+        con.execute("INSERT INTO web_command (name, url) VALUES ('youtube', 'https://www.youtube.com')")
+        con.commit()
+        con.close()
+
+        index = self.index(db_name)
+        self.assertEqual(index.resolve("internet"), {"name": "Internet", "kind": "sys", "target": "/opt/browser"})
+        self.assertEqual(index.resolve("internt")["kind"], "sys")   # a user's name is fuzzy again
+        self.assertEqual(index.resolve("you tube")["kind"], "web")
+
+    def test_rebuilds_only_when_a_source_changes(self):
+        index = self.index()
+        self.assertTrue(index.refresh())
+        self.assertFalse(index.refresh())
+
+        self.desktop("calc.desktop", "[Desktop Entry]\nName=Calculator\nExec=calc\n")
+        os.utime(self.applications, (1, 1))
+        self.assertTrue(index.refresh())
+        self.assertEqual(index.resolve("calculator")["target"], ["calc"])
+
+
+class LaunchTest(LauncherTestCase):
+    def launch(self, entry):
+        with mock.patch.object(launcher.subprocess, "Popen") as popen:
+            launch(entry)
+        return popen
+
+    def test_desktop_argv_without_shell(self):
+        popen = self.launch({"name": "Text Editor", "kind": "desktop",
+                             "target": exec_to_argv('"/opt/My Editor/edit" --new %F')})
+        argv, = popen.call_args.args
+        self.assertEqual(argv, ["/opt/My Editor/edit", "--new"])
+        kwargs = popen.call_args.kwargs
+        self.assertNotIn("shell", kwargs)
+        self.assertEqual(kwargs["stdin"], subprocess.DEVNULL)
+        if os.name == "posix":
+            self.assertTrue(kwargs["start_new_session"])
+
+    def test_path_binary(self):
+        path = self.executable("htop")
+        self.assertEqual(self.launch({"name": "htop", "kind": "path", "target": [path]}).call_args.args, ([path],))
+
+    @unittest.skipIf(sys.platform.startswith("win"), "sys commands use os.startfile on Windows")
+    def test_sys_command_path_is_one_argument(self):
+        popen = self.launch({"name": "Browser", "kind": "sys", "target": "/opt/my browser/run"})
+        self.assertEqual(popen.call_args.args, (["/opt/my browser/run"],))
+
+    def test_web_command_opens_browser(self):
+        with mock.patch.object(launcher.webbrowser, "open") as open_url:
+            popen = self.launch({"name": "youtube", "kind": "web", "target": "https://www.youtube.com"})
+        open_url.assert_called_once_with("https://www.youtube.com")
+        popen.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+# test_metrics_store.py - engine.metrics_store rollups, summaries, retention and period parsing
+#
+#   python -m pytest tests/test_metrics_store.py
+
+import math
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+try:
+    import numpy as np
+    from engine.metrics_store import RECORD, MetricsStore, Series, parse_period, rollup
+except ImportError:   # numpy not installed
+    np = None
+
+DAY = 24 * 3600
+
+
+def records(times, **columns):
+    """1 s RECORDs like MetricsStore.flush writes them"""
+    out = np.zeros(len(times), dtype=RECORD)
+    out["time"] = times
+    for name in ("cpu", "ram", "disk", "battery", "plugged"):
+        out[name] = columns.get(name, np.nan)
+    out["cpu_max"], out["ram_max"], out["battery_min"] = out["cpu"], out["ram"], out["battery"]
+    out["count"] = 1
+    return out
+
+
+@unittest.skipIf(np is None, "engine.metrics_store needs numpy")
+class RollupTest(unittest.TestCase):
+    def test_buckets_means_and_extremes(self):
+        cpu = [10.0] * 60 + [20.0] * 60
+        cpu[30] = 95.0
+        rolled = rollup(records(np.arange(120.0), cpu=cpu, battery=np.linspace(80, 79, 120)), 60)
+
+        self.assertEqual(list(rolled["time"]), [0, 60])
+        self.assertEqual(list(rolled["count"]), [60, 60])
+        self.assertAlmostEqual(float(rolled["cpu"][0]), (59 * 10 + 95) / 60, places=4)
+        self.assertEqual(list(rolled["cpu_max"]), [95, 20])
+        self.assertAlmostEqual(float(rolled["battery_min"][1]), 79, places=4)
+        self.assertTrue(np.isnan(rolled["disk"]).all())   # no disk readings stays "unknown"
+
+    def test_means_are_weighted_by_count(self):
+        minutes = records([0.0, 60.0], cpu=[10.0, 40.0])
+        minutes["count"] = [3, 1]
+        hour = rollup(minutes, 3600)
+        self.assertEqual(int(hour["count"][0]), 4)
+        self.assertAlmostEqual(float(hour["cpu"][0]), 17.5)
+
+    def test_empty(self):
+        self.assertEqual(len(rollup(np.empty(0, dtype=RECORD), 60)), 0)
+
+
+@unittest.skipIf(np is None, "engine.metrics_store needs numpy")
+class SeriesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.series = Series(os.path.join(self.directory, "health_1s.bin"), 1, retention=100)
+
+    def test_compaction_drops_only_expired_records(self):
+        self.series.append(records(np.arange(200.0), cpu=np.arange(200.0)))
+        self.series.compact(now=250)
+        kept = self.series.read()
+        self.assertEqual(float(kept["time"][0]), 150)
+        self.assertEqual(len(kept), 50)
+        self.assertEqual(os.listdir(self.directory), ["health_1s.bin"])   # temp file renamed away
+
+    def test_nothing_expired_leaves_the_file_alone(self):
+        self.series.append(records(np.arange(50.0)))
+        os.utime(self.series.path, ns=(1, 1))
+        self.series.compact(now=100)
+        self.assertEqual(os.stat(self.series.path).st_mtime_ns, 1)   # not rewritten
+
+    def test_missing_file_reads_empty(self):
+        self.assertEqual(len(self.series.read()), 0)
+
+
+@unittest.skipIf(np is None, "engine.metrics_store needs numpy")
+class MetricsStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def store(self):
+        return MetricsStore(self.directory, flush_every=10 ** 6)
+
+    def feed(self, store, start, seconds, **funcs):
+        """One sample per second; each metric is a function of seconds since `start`"""
+        for i in range(seconds):
+            sample = {"time": start + i}
+            sample.update({name: func(i) for name, func in funcs.items()})
+            store.add(sample)
+        store.flush()
+
+    def test_finished_minutes_roll_up_once(self):
+        start = (time.time() // 3600 - 2) * 3600
+        store = self.store()
+        self.feed(store, start, 150, cpu=lambda i: 10.0)
+        minutes = store.tiers[1].read()
+        self.assertEqual(list(minutes["time"] - start), [0, 60])   # the third minute isn't finished
+
+        # A restarted store picks up where the 1 min tier ends
+        store = self.store()
+        self.feed(store, start + 150, 60, cpu=lambda i: 10.0)
+        minutes = store.tiers[1].read()
+        self.assertEqual(list(minutes["time"] - start), [0, 60, 120])
+        self.assertEqual(list(minutes["count"]), [60, 60, 60])
+
+    def test_summary_uses_peak_columns_on_coarse_tiers(self):
+        # Two days ago: only the 1 min tier still covers it
+        start = (time.time() // 3600 - 48) * 3600
+        store = self.store()
+        self.feed(store, start, 660, cpu=lambda i: 100.0 if i == 90 else 10.0,
+                  battery=lambda i: 5.0 if i == 300 else 50.0)
+        self.assertIs(store._tier_for(start), store.tiers[1])
+
+        cpu = store.summary("cpu", start, start + 600)
+        self.assertEqual(cpu["max"], 100)        # the 1 s spike, not the minute's mean
+        self.assertEqual(cpu["max_at"], start + 60)
+        self.assertLess(cpu["mean"], 12)
+        self.assertEqual(cpu["samples"], 600)
+
+        battery = store.summary("battery", start, start + 600)
+        self.assertEqual(battery["min"], 5)
+        self.assertEqual(battery["min_at"], start + 300)
+
+    def test_summary_without_data(self):
+        start = time.time() - 600
+        store = self.store()
+        self.assertIsNone(store.summary("cpu", start, start + 60))
+        self.feed(store, start, 60, cpu=lambda i: 5.0)
+        self.assertIsNone(store.summary("battery", start, start + 60))   # desktop: no battery
+
+    def test_fastest_drop(self):
+        def battery(i):
+            minute = i // 60
+            if minute < 20:
+                return 100.0
+            if minute < 30:
+                return 100.0 - (minute - 20)          # 1 %/min
+            if minute < 40:
+                return 90.0 - 3 * (minute - 30)       # 3 %/min: the fastest stretch
+            return 60.0 - (minute - 40)
+
+        start = (time.time() // 3600 - 2) * 3600
+        store = self.store()
+        self.feed(store, start, 50 * 60, battery=battery)
+        drop = store.fastest_drop("battery", start, start + 50 * 60, window=600)
+        self.assertEqual(drop, {"drop": 30.0, "from": start + 30 * 60, "to": start + 40 * 60})
+
+    def test_no_drop_while_charging(self):
+        start = time.time() - 1200
+        store = self.store()
+        self.feed(store, start, 1200, battery=lambda i: 50 + i / 60)
+        self.assertIsNone(store.fastest_drop("battery", start, start + 1200))
+
+
+@unittest.skipIf(np is None, "engine.metrics_store needs numpy")
+class ParsePeriodTest(unittest.TestCase):
+    NOW = datetime(2026, 10, 19, 15, 30).timestamp()
+
+    def at(self, day, hour):
+        return datetime(2026, 10, day, hour).timestamp()
+
+    def test_today_is_the_default(self):
+        self.assertEqual(parse_period("", self.NOW), (self.at(19, 0), self.NOW))
+        self.assertEqual(parse_period("today", self.NOW), (self.at(19, 0), self.NOW))
+
+    def test_parts_of_the_day(self):
+        self.assertEqual(parse_period("this morning", self.NOW), (self.at(19, 6), self.at(19, 12)))
+        self.assertEqual(parse_period("this afternoon", self.NOW), (self.at(19, 12), self.NOW))   # not over yet
+        self.assertEqual(parse_period("yesterday evening", self.NOW), (self.at(18, 18), self.at(18, 23)))
+
+    def test_yesterday(self):
+        self.assertEqual(parse_period("yesterday", self.NOW), (self.at(18, 0), self.at(19, 0)))
+
+    def test_last_n_units(self):
+        self.assertEqual(parse_period("last 3 hours", self.NOW), (self.NOW - 3 * 3600, self.NOW))
+        self.assertEqual(parse_period("past week", self.NOW), (self.NOW - 7 * DAY, self.NOW))
+        start, end = parse_period("last 15 minutes", self.NOW)
+        self.assertTrue(math.isclose(end - start, 900))
+
+
+if __name__ == "__main__":
+    unittest.main()
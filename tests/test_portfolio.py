@@ -0,0 +1,152 @@
+# test_portfolio.py - engine.portfolio quotes and watchlist against tests/fake_api.py
+#
+#   python -m pytest tests/test_portfolio.py
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from engine import deadline as deadline_module
+from fake_api import FakeApi
+
+try:
+    from engine import portfolio
+    from engine.http_client import TokenBucket, http_client
+except ImportError:   # python-dotenv not installed
+    portfolio = None
+
+PRICES = {"AAPL": "190.10", "TSLA": "250.00", "INFY": "18.20", "MSFT": "410.00", "NVDA": "880.00", "AMZN": "180.00"}
+
+
+def alpha_vantage(query):
+    """GLOBAL_QUOTE answers for the symbols in PRICES, an empty quote otherwise"""
+    price = PRICES.get(query.get("symbol"))
+    if not price:
+        return {"Global Quote": {}}
+    return {"Global Quote": {"01. symbol": query["symbol"], "05. price": price,
+                             "09. change": "1.00", "10. change percent": "0.5%"}}
+
+
+@unittest.skipIf(portfolio is None, "engine.portfolio needs python-dotenv")
+class PortfolioTestCase(unittest.TestCase):
+    """Points the shared "stock" endpoint at a fake Alpha Vantage with a fresh cache and bucket"""
+
+    def setUp(self):
+        self.api = FakeApi(payload=alpha_vantage)
+        threading.Thread(target=self.api.serve_forever, daemon=True).start()
+        self.addCleanup(self.api.server_close)
+        self.addCleanup(self.api.shutdown)
+
+        stock = http_client.endpoints["stock"]
+        for patcher in (
+            mock.patch.object(portfolio, "ALPHA_VANTAGE_URL", self.api.url),
+            mock.patch.object(http_client.session, "trust_env", False),   # no proxies for 127.0.0.1
+            mock.patch.object(stock, "cache", {}),
+            # Same rate and burst as the real policy, but full
+            mock.patch.object(stock, "bucket", TokenBucket(stock.bucket.rate, stock.bucket.capacity)),
+            mock.patch.dict(deadline_module._breakers, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class QuotesTest(PortfolioTestCase):
+    def test_parse_symbols(self):
+        self.assertEqual(portfolio.parse_symbols("aapl, TSLA;infy  aapl"), ["AAPL", "TSLA", "INFY"])
+        self.assertEqual(portfolio.parse_symbols(["msft", " nvda "]), ["MSFT", "NVDA"])
+
+    def test_fetch_quote(self):
+        self.assertEqual(portfolio.fetch_quote("aapl"), {
+            "symbol": "AAPL", "price": "190.10", "change": "1.00", "change_percent": "0.5%"})
+        self.assertEqual(portfolio.fetch_quote("nope"), {"symbol": "NOPE", "error": "not found"})
+        self.assertEqual(self.api.queries[0]["function"], "GLOBAL_QUOTE")
+
+    def test_fetch_quotes_keeps_order_and_caches(self):
+        quotes = portfolio.fetch_quotes("TSLA, AAPL, INFY")
+        self.assertEqual([q["symbol"] for q in quotes], ["TSLA", "AAPL", "INFY"])
+        self.assertEqual(self.api.hits, 3)
+        self.assertEqual(portfolio.fetch_quotes("AAPL TSLA"), [quotes[1], quotes[0]])
+        self.assertEqual(self.api.hits, 3)
+
+    def test_sixth_symbol_is_rate_limited(self):
+        # 5 calls per minute with a burst of 5: the 6th can't get a token within max_wait
+        symbols = list(PRICES)
+        started = time.monotonic()
+        quotes = portfolio.fetch_quotes(symbols)
+        self.assertLess(time.monotonic() - started, 2)   # fails fast, doesn't sit out max_wait
+        self.assertEqual([q["symbol"] for q in quotes], symbols)
+        limited = [q for q in quotes if "error" in q]
+        self.assertEqual(len(limited), 1)
+        self.assertEqual(limited[0]["error"], "rate limited")
+        self.assertEqual(self.api.hits, 5)
+
+        # The five that made it are served from the cache without tokens
+        served = [q["symbol"] for q in quotes if "price" in q]
+        self.assertTrue(all("price" in q for q in portfolio.fetch_quotes(served)))
+        self.assertEqual(self.api.hits, 5)
+
+
+class WatchlistTest(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.db_name = os.path.join(directory, "jarvis.db")
+
+    def test_add_remove_list(self):
+        watchlist = portfolio.Watchlist(self.db_name)
+        self.assertEqual(watchlist.add("tsla, aapl"), ["TSLA", "AAPL"])
+        watchlist.add("AAPL")
+        self.assertEqual(watchlist.symbols(), ["AAPL", "TSLA"])
+        watchlist.remove("tsla")
+        self.assertEqual(watchlist.symbols(), ["AAPL"])
+
+    def test_start_refreshes_immediately(self):
+        watchlist = portfolio.Watchlist(self.db_name, refresh_interval=60)
+        watchlist.add("AAPL, INFY")
+        watchlist.start()
+        self.addCleanup(watchlist.stop)
+        self.assertTrue(wait_until(lambda: self.api.hits == 2))
+        # ...so asking for the watchlist is answered from the warm cache
+        portfolio.fetch_quotes(watchlist.symbols())
+        self.assertEqual(self.api.hits, 2)
+
+    def test_get_watchlist_creates_one(self):
+        created = []
+        Watchlist = portfolio.Watchlist
+
+        def slow_watchlist():
+            time.sleep(0.05)
+            watchlist = Watchlist(self.db_name, refresh_interval=60)
+            created.append(watchlist)
+            self.addCleanup(watchlist.stop)
+            return watchlist
+
+        with mock.patch.object(portfolio, "_watchlist", None), \
+                mock.patch.object(portfolio, "Watchlist", side_effect=slow_watchlist):
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(portfolio.get_watchlist()))
+                       for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(created), 1)
+        self.assertTrue(all(result is created[0] for result in results))
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+if __name__ == "__main__":
+    unittest.main()
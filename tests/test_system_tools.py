@@ -0,0 +1,55 @@
+# test_system_tools.py - get_system_stats / get_cpu_usage formatting over a stand-in sampler
+#
+#   python -m pytest tests/test_system_tools.py
+#
+# Needs the app dependencies (LangChain, eel ...); skipped otherwise.
+
+import math
+import unittest
+from unittest import mock
+
+try:
+    from engine import tools
+except Exception:   # missing dependencies
+    tools = None
+
+
+class FakeSampler:
+    cores = 8
+
+    def __init__(self, cpu_avg):
+        self.cpu_avg = cpu_avg
+
+    def latest(self):
+        return {"cpu": 42.0, "per_core": [10.0, 80.0], "ram": 50.0, "ram_available_gb": 7.5,
+                "disk": 60.0, "battery": math.nan, "plugged": math.nan, "temp": math.nan}
+
+    def average(self, field, seconds=60):
+        return self.cpu_avg
+
+    def sustained(self, field, threshold):
+        return 0.0
+
+    def trend(self, field, seconds=120):
+        return None
+
+
+@unittest.skipIf(tools is None, "engine.tools needs the full app dependencies")
+class CpuAverageTest(unittest.TestCase):
+    def run_tool(self, tool, cpu_avg):
+        with mock.patch.object(tools, "get_sampler", return_value=FakeSampler(cpu_avg)):
+            return tool.func()
+
+    def test_average_is_shown(self):
+        self.assertIn("⚡ CPU Usage: 42.0% (1-min avg 30.5%)", self.run_tool(tools.get_system_stats, 30.5))
+        self.assertEqual(self.run_tool(tools.get_cpu_usage, 30.5),
+                         "CPU Usage: 42.0% (Cores: 8, busiest core 80%, 1-min avg 30.5%)")
+
+    def test_no_average_yet(self):
+        self.assertIn("⚡ CPU Usage: 42.0%\n", self.run_tool(tools.get_system_stats, None))
+        self.assertEqual(self.run_tool(tools.get_cpu_usage, None),
+                         "CPU Usage: 42.0% (Cores: 8, busiest core 80%)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+# test_volume.py - engine.volume backend selection and mixer output parsing
+#
+#   python -m pytest tests/test_volume.py
+
+import os
+import unittest
+from unittest import mock
+
+from engine import volume
+from engine.volume import AlsaBackend, FakeBackend, PulseBackend, PycawBackend, VolumeError
+
+SINK_INPUTS = """Sink Input #41
+	Driver: protocol-native.c
+	Volume: front-left: 39321 /  60% / -13.31 dB,   front-right: 39321 /  60% / -13.31 dB
+	Properties:
+		application.name = "Spotify"
+Sink Input #57
+	Volume: front-left: 65536 / 100% / 0.00 dB,   front-right: 65536 / 100% / 0.00 dB
+	Properties:
+		application.name = "Google Chrome"
+"""
+
+
+class MixerSelectionTest(unittest.TestCase):
+    def setUp(self):
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("SYRA_VOLUME_BACKEND", None)
+        mixer = mock.patch.object(volume, "_mixer", None)
+        mixer.start()
+        self.addCleanup(mixer.stop)
+
+    def probe(self, *names):
+        """Only the native backends in `names` report available"""
+        for backend in (PycawBackend, PulseBackend, AlsaBackend):
+            patcher = mock.patch.object(backend, "available", return_value=backend.name in names)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_named_backend(self):
+        self.assertIsInstance(volume.create_mixer("fake"), FakeBackend)
+        os.environ["SYRA_VOLUME_BACKEND"] = "alsa"
+        self.assertIsInstance(volume.create_mixer(), AlsaBackend)
+
+    def test_first_available_backend_wins(self):
+        self.probe("pulseaudio", "alsa")
+        self.assertIsInstance(volume.create_mixer(), PulseBackend)
+
+    def test_backend_that_fails_to_start_is_skipped(self):
+        self.probe("pycaw", "alsa")
+        with mock.patch.object(PycawBackend, "__init__", side_effect=OSError("no audio endpoint")):
+            self.assertIsInstance(volume.create_mixer(), AlsaBackend)
+
+    def test_none_without_backends(self):
+        self.probe()
+        self.assertIsNone(volume.create_mixer())
+
+    def test_get_mixer_reprobes_until_found_then_caches(self):
+        with mock.patch.object(PulseBackend, "available", return_value=False), \
+                mock.patch.object(PycawBackend, "available", return_value=False), \
+                mock.patch.object(AlsaBackend, "available", return_value=False):
+            self.assertIsNone(volume.get_mixer())
+
+        # Audio came up later (e.g. PipeWire started after SYRA)
+        with mock.patch.object(PulseBackend, "available", return_value=True):
+            mixer = volume.get_mixer()
+        self.assertIsInstance(mixer, PulseBackend)
+        with mock.patch.object(PulseBackend, "available", return_value=False):
+            self.assertIs(volume.get_mixer(), mixer)
+
+
+class PulseBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.outputs = {}
+
+        def run(argv):
+            self.calls.append(argv)
+            return self.outputs.get(tuple(argv[:2]), "")
+
+        patcher = mock.patch.object(volume, "_run", side_effect=run)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mixer = PulseBackend()
+
+    def test_get_and_set(self):
+        self.outputs[("pactl", "get-sink-volume")] = "Volume: front-left: 45875 /  70% / -9.29 dB"
+        self.assertEqual(self.mixer.get(), 70)
+        self.mixer.set(140)
+        self.assertEqual(self.calls[-1], ["pactl", "set-sink-volume", "@DEFAULT_SINK@", "100%"])
+
+    def test_unreadable_volume(self):
+        with self.assertRaises(VolumeError):
+            self.mixer.get()
+
+    def test_mute(self):
+        self.outputs[("pactl", "get-sink-mute")] = "Mute: yes"
+        self.assertTrue(self.mixer.is_muted())
+        self.mixer.set_mute(False)
+        self.assertEqual(self.calls[-1], ["pactl", "set-sink-mute", "@DEFAULT_SINK@", "0"])
+
+    def test_apps(self):
+        self.outputs[("pactl", "list")] = SINK_INPUTS
+        self.assertEqual(self.mixer.list_apps(), {"Spotify": 60, "Google Chrome": 100})
+        self.assertEqual(self.mixer.set_app("chrome", 30), ["Google Chrome"])
+        self.assertEqual(self.calls[-1], ["pactl", "set-sink-input-volume", "57", "30%"])
+
+
+class AlsaBackendTest(unittest.TestCase):
+    def test_state(self):
+        out = "Simple mixer control 'Master',0\n  Mono: Playback 52 [81%] [-14.25dB] [off]"
+        with mock.patch.object(volume, "_run", return_value=out):
+            mixer = AlsaBackend()
+            self.assertEqual(mixer.get(), 81)
+            self.assertTrue(mixer.is_muted())
+
+    def test_no_per_app_volume(self):
+        with self.assertRaises(VolumeError):
+            AlsaBackend().set_app("spotify", 20)
+
+
+class FakeBackendTest(unittest.TestCase):
+    def test_round_trip(self):
+        mixer = FakeBackend(volume=40, apps={"Spotify": 80, "Firefox": 50})
+        mixer.set(-5)
+        self.assertEqual(mixer.get(), 0)
+        mixer.set_mute(True)
+        self.assertTrue(mixer.is_muted())
+        self.assertEqual(mixer.set_app("spot", 20), ["Spotify"])
+        self.assertEqual(mixer.list_apps(), {"Spotify": 20, "Firefox": 50})
+
+
+if __name__ == "__main__":
+    unittest.main()